@@ -1,27 +1,24 @@
 import streamlit as st
-import os
+from src.data.connection import configure_pragmas
 from src.data.database_utils import fill_database_from_template
+from src.data.migrations import run_migrations
 from src.auth.authentication import hide_sidebar, authenticate_user, logout
 
-# Database initialization
-if not os.path.exists("database.db"):
-    # Database doesn't exist - recreate it
-    try:
-        import init_db
-        fill_database_from_template()
-    except ImportError:
-        st.error("❌ La base de datos no pudo ser creada. Por favor, asegúrate de que todos los archivos estén correctamente cargados.")
-        st.stop()
-    except Exception as e:
-        st.warning(f"⚠️ Error al inicializar la base de datos: {str(e)}")
-        # Continue without stopping - allow app to run even with database issues
-else:
-    # Database exists, just ensure it's populated
-    try:
-        fill_database_from_template()
-    except Exception as e:
-        st.warning(f"⚠️ Error al verificar la base de datos: {str(e)}")
-        # Continue without stopping - allow app to run even with database issues
+# Optional [sqlite_pragmas] section in secrets.toml overrides the default SQLite tuning
+try:
+    configure_pragmas(dict(st.secrets.get("sqlite_pragmas", {})))
+except FileNotFoundError:
+    # No secrets file (StreamlitSecretNotFoundError subclasses this): keep the defaults
+    pass
+
+# Database initialization: create or upgrade the schema (no DDL once the
+# version is current), then make sure the lookup tables are populated
+try:
+    run_migrations()
+    fill_database_from_template()
+except Exception as e:
+    st.warning(f"⚠️ Error al inicializar la base de datos: {str(e)}")
+    # Continue without stopping - allow app to run even with database issues
 
 # Initialize session state for authentication
 if "authenticated" not in st.session_state:
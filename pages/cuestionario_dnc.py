@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import json
-from src.forms.dnc_form import gerencias_dict, get_identification_data, get_form_data
-from src.data.database_utils import fetch_all, update_respondents, update_raw_data_forms, insert_row_into_matrix
+from src.forms.dnc_form import get_identification_data, get_form_data
+from src.data.dimension_cache import get_dimension
+from src.data.database_utils import update_respondents, update_raw_data_forms, insert_row_into_matrix
 from src.services.bedrock_api import get_from_ai, process_response
 from src.auth.authentication import stay_authenticated
 
@@ -13,12 +14,11 @@ if not st.session_state.get("authenticated", False):
 
 # Global variables
 MAXNEEDS = 5
-gerencias_dict = fetch_all("gerencias")
-desafios_dict = fetch_all("desafios")
-audiencias_dict = fetch_all("audiencias")
-modalidades_dict = fetch_all("modalidades")
-fuentes_dict = fetch_all("fuentes")
-prioridades_dict = fetch_all("prioridades")
+gerencias = get_dimension("gerencias")
+desafios = get_dimension("desafios")
+audiencias = get_dimension("audiencias")
+modalidades = get_dimension("modalidades")
+prioridades = get_dimension("prioridades")
 
 # Make page use full width & set title
 st.set_page_config(layout="wide")
@@ -89,9 +89,9 @@ else:
             st.markdown(f"{i+1}. Desafío: {need['challenge']}, ¿Qué le falta a tu equipo para cumplir este desafío?: {need['whats_missing']}")
 
     # Display needs form
-    gerencia_name = next(name for name, id in gerencias_dict.items() if id == st.session_state.basic_info["gerencia"])
+    gerencia_name = gerencias.by_id.get(st.session_state.basic_info["gerencia"])
     st.subheader(f"🎯 Desafíos estratégicos de {gerencia_name}:")
-    st.markdown("\n".join([f"{i+1}. {d}" for i, d in enumerate(desafios_dict.keys())]))
+    st.markdown("\n".join([f"{i+1}. {d}" for i, d in enumerate(desafios.names)]))
 
     # Check if the user has reached the maximum number of needs   
     if st.session_state.needs_count < MAXNEEDS:
@@ -129,10 +129,10 @@ else:
                     )
 
                     # Append to list in session state and update count
-                    challenge_name = next(name for name, id in desafios_dict.items() if id == form_info["challenge"])
-                    audience_name = next(name for name, id in audiencias_dict.items() if id == form_info["audience"])
-                    modality_name = next(name for name, id in modalidades_dict.items() if id == form_info["mode"])
-                    priority_name = next(name for name, id in prioridades_dict.items() if id == form_info["priority"])
+                    challenge_name = desafios.by_id.get(form_info["challenge"])
+                    audience_name = audiencias.by_id.get(form_info["audience"])
+                    modality_name = modalidades.by_id.get(form_info["mode"])
+                    priority_name = prioridades.by_id.get(form_info["priority"])
 
                     st.session_state.needs_count += 1
                     st.session_state.needs_list.append(
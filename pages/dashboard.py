@@ -3,7 +3,7 @@ import pandas as pd
 import altair as alt
 from src.utils.dashboard_utils import create_pie_chart, create_horizontal_bar_chart, create_vertical_bar_chart
 from src.data.dashboard_queries import get_dashboard_data, get_origin_filtered_data, get_available_origins, get_summary_metrics
-from src.data.database_utils import fetch_matrix
+from src.data.matrix_queries import load_matrix_frame
 
 # Authentication check
 if not st.session_state.get("authenticated", False):
@@ -82,15 +82,14 @@ try:
 
     # Main content area with all charts
     # Get validation data for detailed tables
-    validation_data = fetch_matrix()
-    df_validation = pd.DataFrame(validation_data)
+    df_validation = load_matrix_frame()
 
     # Validation status breakdown tables
     with st.expander("📊 Estado de Validación", expanded=False):
         # By Gerencia
         st.markdown("**Por Gerencia**")
         if not df_validation.empty:
-            gerencia_validation = df_validation.groupby('Gerencia')['Validación'].value_counts().unstack().fillna(0)
+            gerencia_validation = df_validation.groupby('Gerencia', observed=True)['Validación'].value_counts().unstack().fillna(0)
             gerencia_validation['Total'] = gerencia_validation.sum(axis=1)
             gerencia_validation['% Validado'] = round((gerencia_validation.get('✅ Validado', 0) / gerencia_validation['Total']) * 100, 1)
             st.dataframe(gerencia_validation, use_container_width=True)
@@ -98,7 +97,7 @@ try:
         # By Desafío Estratégico
         st.markdown("**Por Desafío Estratégico**")
         if not df_validation.empty:
-            desafio_validation = df_validation.groupby('Desafío Estratégico')['Validación'].value_counts().unstack().fillna(0)
+            desafio_validation = df_validation.groupby('Desafío Estratégico', observed=True)['Validación'].value_counts().unstack().fillna(0)
             desafio_validation['Total'] = desafio_validation.sum(axis=1)
             desafio_validation['% Validado'] = round((desafio_validation.get('✅ Validado', 0) / desafio_validation['Total']) * 100, 1)
             st.dataframe(desafio_validation, use_container_width=True)
@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 import time
+from src.data.database_utils import fill_database_from_template, rebuild_dashboard_summaries
+from src.data.dimension_cache import invalidate_dimensions
+from src.data.result_cache import clear_result_cache
+from src.services.linkedin_api import sync_catalog
+from src.data.linkedin_cache import clear_search_cache
 
 # Authentication check
 if not st.session_state.get("authenticated", False):
@@ -33,15 +38,46 @@ if tables:
 else:
     st.warning("No hay tablas en la base de datos.")
 
+# Button to rebuild the dashboard summary tables
+with st.expander("Reconstruir resúmenes del dashboard"):
+    st.info("Los totales del dashboard y la vista de la matriz se mantienen automáticamente. Usa esta opción solo si no coinciden con los datos de las tablas.")
+    if st.button("🔄 Reconstruir resúmenes"):
+        rebuild_dashboard_summaries()
+        st.success("Resúmenes reconstruidos.")
+
+# Button to sync the local LinkedIn catalog mirror
+with st.expander("Sincronizar catálogo LinkedIn"):
+    st.info("Copia el catálogo de LinkedIn Learning a la base de datos para que las búsquedas de cursos no consulten la API. La primera sincronización descarga el catálogo completo; las siguientes solo los cambios.")
+    full_sync = st.checkbox("Descargar el catálogo completo de nuevo")
+    if st.button("🌐 Sincronizar catálogo"):
+        with st.spinner("Sincronizando catálogo de LinkedIn Learning... Por favor espera ⏳"):
+            summary = sync_catalog(full=full_sync)
+        st.success("Catálogo sincronizado: " + ", ".join(f"{asset_type} ({language}): {count}" for asset_type, language, count in summary))
+    st.info("Las búsquedas que no se responden desde el catálogo se guardan en caché por un día. Vacía la caché para consultar LinkedIn de nuevo.")
+    if st.button("🧹 Vaciar caché de búsquedas"):
+        clear_search_cache()
+        st.success("Caché de búsquedas vaciada.")
+
 # Button to clear DB
 with st.expander("Limpiar base de datos"):
     st.warning("Esta acción eliminará todos los datos de la base de datos. La información no se podrá recuperar una vez realizada esta acción.")
     confirm = st.checkbox("Quiero borrar todos los datos")
     if st.button("🗑️ Borrar todo", type="primary") and confirm:
         for table in tables:
+            # Keep the migration history so the schema is not re-applied
+            if table == "schema_version":
+                continue
+            # The LinkedIn catalog mirror is not app data, and its FTS index
+            # must only be changed through the linkedin_catalog triggers
+            if table.startswith("linkedin_catalog"):
+                continue
             cursor.execute(f"DELETE FROM {table};")
             cursor.execute(f"DELETE FROM sqlite_sequence WHERE name='{table}';") # reset autoincrement
         conn.commit()
+        # Forget cached lookups and reads, then restore the default dropdown options
+        invalidate_dimensions()
+        clear_result_cache()
+        fill_database_from_template(force=True)
         st.success("Base de datos reiniciada.")
         time.sleep(3)
         st.rerun()
@@ -1,12 +1,14 @@
 import streamlit as st
 import pandas as pd
 import time
-from src.data.database_utils import download_demo_db, import_excel_to_database, generate_excel_template, fetch_matrix, get_matrix_metrics
+from functools import partial
+from src.data.database_utils import download_demo_db, import_excel_to_database, validate_excel_import, generate_excel_template
 from src.forms.modify_matrix_form import show_edit_matrix_dialog
 from src.forms.add_matrix_form import add_initiative_form, validate_add_form_info, save_new_initiative
 from src.forms.delete_matrix_form import show_delete_matrix_dialog
-from src.utils.matrix_utils import show_filters, reload_data, format_asociacion
-from src.utils.download_utils import download_excel_button
+from src.data.matrix_queries import count_matrix_rows, get_matrix_stats, matrix_export_rows
+from src.utils.matrix_utils import show_filters, show_matrix_page, reload_data, format_asociacion
+from src.utils.download_utils import download_rows_button
 
 # Cache template generation to avoid regeneration issues
 @st.cache_data
@@ -21,10 +23,6 @@ if not st.session_state.get("authenticated", False):
 # Make page use full width & set title
 st.set_page_config(layout="wide")
 
-# Load data
-data = fetch_matrix()
-df = pd.DataFrame(data)
-
 # Main title
 st.title("Matriz de Necesidades de Aprendizaje")
 
@@ -40,67 +38,20 @@ if "dialog_active" not in st.session_state:
     st.session_state.dialog_active = False
 
 with tab1:
-    # Reload data to ensure we have the latest changes
-    df = reload_data()
-
-    # Add Asociación column based on LinkedIn course presence (positioned as third column)
-    if not df.empty:
-        df.insert(3, 'Asociación', df.apply(format_asociacion, axis=1))        
+    # Counts and rows come straight from the database, filtered and paginated in SQL
+    total_rows = count_matrix_rows()
 
     # Display only if there is data
-    if not df.empty:
+    if total_rows:
 
         # Filters section with expander
         with st.expander("🔍 Filtros", expanded=False):
-            show_filters(df)
-
-        # Apply filters to dataframe
-        filtered_df = df.copy()
-
-        # Apply each filter if selections exist
-        for column, selected_values in st.session_state.filters.items():
-            if selected_values:  # Only filter if values are selected
-                if column == "Asociaciones":
-                    # Special handling for Asociaciones filter
-                    linkedin_col = "Curso Sugerido LinkedIn"
-                    if "Con cursos asociados" in selected_values and "Sin cursos asociados" in selected_values:
-                        # Both selected - show all rows
-                        pass
-                    elif "Con cursos asociados" in selected_values:
-                        # Only show rows with LinkedIn courses
-                        filtered_df = filtered_df[filtered_df[linkedin_col].notna() & (filtered_df[linkedin_col] != "")]
-                    elif "Sin cursos asociados" in selected_values:
-                        # Only show rows without LinkedIn courses
-                        filtered_df = filtered_df[filtered_df[linkedin_col].isna() | (filtered_df[linkedin_col] == "")]
-                elif column == "Validación":
-                    # Special handling for Validación filter
-                    if "✅ Validado" in selected_values and "❌ Pendiente" in selected_values:
-                        # Both selected - show all rows
-                        pass
-                    elif "✅ Validado" in selected_values:
-                        # Only show validated rows
-                        filtered_df = filtered_df[filtered_df["Validación"].str.contains("✅ Validado", na=False)]
-                    elif "❌ Pendiente" in selected_values:
-                        # Only show unvalidated rows
-                        filtered_df = filtered_df[filtered_df["Validación"].str.contains("❌ Pendiente", na=False)]
-                else:
-                    # Normal filter logic for other columns
-                    filtered_df = filtered_df[filtered_df[column].isin(selected_values)]
+            show_filters()
 
-        # Calculate metrics based on filtered data
+        # Metrics and row count of the filtered matrix in a single query
         current_filters = st.session_state.get("filters", {})
-        metrics = get_matrix_metrics(
-            gerencia_filter=current_filters.get("Gerencia"),
-            subgerencia_filter=current_filters.get("Subgerencia"),
-            area_filter=current_filters.get("Área"),
-            desafio_filter=current_filters.get("Desafío Estratégico"),
-            audiencia_filter=current_filters.get("Audiencia"),
-            modalidad_filter=current_filters.get("Modalidad"),
-            fuente_filter=current_filters.get("Fuente"),
-            prioridad_filter=current_filters.get("Prioridad"),
-            validacion_filter=current_filters.get("Validación"),
-            asociaciones_filter=current_filters.get("Asociaciones")            
-        )
+        metrics = get_matrix_stats(current_filters)
+        filtered_count = metrics["activities"]
 
         col1, col2, col3, col4 = st.columns(4)
 
@@ -119,35 +70,45 @@ with tab1:
             st.metric("🌐 Cantidad de Cursos LinkedIn", metrics["linkedin"], border=True)
 
         # Display filtered dataframe
-        if not filtered_df.empty:
-            st.markdown(f"**Mostrando {len(filtered_df)} de {len(df)} registros**")
+        if filtered_count:
+            st.markdown(f"**Mostrando {filtered_count} de {total_rows} registros**")
                     
-            # Download button section
-            download_excel_button(
-                filtered_df,
+            # Download button section (all filtered rows, streamed from the database on click)
+            download_rows_button(
+                partial(matrix_export_rows, dict(current_filters)),
+                filtered_count,
                 filename="matriz_necesidades_filtrada.xlsx",
                 button_text_prefix="📥 Descargar"
             )
 
-            st.dataframe(
-                filtered_df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "id": None,  # Hide the id column
-                    "Curso Sugerido LinkedIn": None,  # Hide the LinkedIn course column since we show it in Asociación
-                    "Validación": st.column_config.TextColumn(
-                        "Validación",
-                        help="Estado de validación de la actividad formativa",
-                        width="small"
-                    ),
-                    "Asociación": st.column_config.TextColumn(
-                        "Asociación",
-                        help="Muestra el curso de LinkedIn asociado (🌐) o indica que no hay asociación (❌)",
-                        width="medium"
-                    ),
-                },
-                key="view_matrix_dataframe")
+            # Only the current page is loaded and sent to the browser
+            page_df = show_matrix_page(current_filters, filtered_count)
+
+            if page_df.empty:
+                st.info("No hay registros que coincidan con los filtros seleccionados.")
+            else:
+                # Add Asociación column based on LinkedIn course presence (positioned as third column)
+                page_df.insert(3, 'Asociación', page_df.apply(format_asociacion, axis=1))
+
+                st.dataframe(
+                    page_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "id": None,  # Hide the id column
+                        "Curso Sugerido LinkedIn": None,  # Hide the LinkedIn course column since we show it in Asociación
+                        "Validación": st.column_config.TextColumn(
+                            "Validación",
+                            help="Estado de validación de la actividad formativa",
+                            width="small"
+                        ),
+                        "Asociación": st.column_config.TextColumn(
+                            "Asociación",
+                            help="Muestra el curso de LinkedIn asociado (🌐) o indica que no hay asociación (❌)",
+                            width="medium"
+                        ),
+                    },
+                    key="view_matrix_dataframe")
         else:
             st.info("No hay registros que coincidan con los filtros seleccionados.")
             if st.button("↩️ Mostrar todos los registros", type="primary"):
@@ -188,8 +149,41 @@ with tab1:
             label_visibility="collapsed"
         )
         if uploaded_file is not None:
-            if st.button("📤 Importar archivo Excel", type="primary", use_container_width=True):
-                success, message, imported_count = import_excel_to_database(uploaded_file)
+            col_validate, col_import = st.columns(2)
+            with col_validate:
+                validate_clicked = st.button("🔎 Validar archivo (sin importar)", use_container_width=True)
+            with col_import:
+                import_clicked = st.button("📤 Importar archivo Excel", type="primary", use_container_width=True)
+
+            # Dry run: check every row and show what would be created, without writing
+            if validate_clicked:
+                valid, message, report = validate_excel_import(uploaded_file)
+                if valid:
+                    st.success(message)
+                else:
+                    st.error("❌ El archivo tiene errores. Corrígelos antes de importar.")
+                    with st.expander("📋 Ver detalles de errores", expanded=True):
+                        st.text(message)
+
+                if report and report["new_values"]:
+                    with st.expander("🆕 Valores nuevos que se crearán al importar", expanded=False):
+                        for table, names in report["new_values"].items():
+                            st.markdown(f"**{table.title()}:** {', '.join(names)}")
+
+            if import_clicked:
+                progress_bar = st.progress(0.0, text="Importando filas...")
+
+                def update_import_progress(processed, total):
+                    if total:
+                        progress_bar.progress(min(processed / total, 1.0), text=f"Importando filas... {processed}/{total}")
+                    else:
+                        progress_bar.progress(0.0, text=f"Importando filas... {processed}")
+
+                success, message, imported_count = import_excel_to_database(
+                    uploaded_file,
+                    progress_callback=update_import_progress
+                )
+                progress_bar.empty()
                 if success:
                     st.success(message)
                     time.sleep(3)
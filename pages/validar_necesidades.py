@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import time
-from src.data.database_utils import fetch_matrix, validate_matrix_entry, unvalidate_matrix_entry
+from src.data.database_utils import validate_matrix_entry, unvalidate_matrix_entry
 from src.utils.matrix_utils import reload_data
 from src.utils.download_utils import download_excel_button
 from src.utils.validar_utils import show_validation_filters, show_validation_dialog, show_unvalidation_dialog
@@ -14,10 +14,6 @@ if not st.session_state.get("authenticated", False):
 # Make page use full width & set title
 st.set_page_config(layout="wide")
 
-# Load data
-data = fetch_matrix()
-df = pd.DataFrame(data)
-
 # Main title
 st.title("Validación de Necesidades de Aprendizaje")
 
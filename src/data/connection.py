@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "database.db"
+
+# Maximum number of idle connections kept open between script runs
+MAX_IDLE_CONNECTIONS = 8
+
+# Compiled statements kept per connection (sqlite3 defaults to 128). Large
+# enough for the dashboard query registry, the matrix filter variants and the
+# write helpers, so long-lived pooled connections rarely re-prepare SQL.
+STATEMENT_CACHE_SIZE = 512
+
+# PRAGMAs applied once to every new connection. WAL lets readers keep working
+# while a questionnaire submission commits, and busy_timeout makes writers wait
+# for each other instead of failing with "database is locked".
+PRAGMA_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # ms
+    "foreign_keys": "ON",
+    "mmap_size": 268435456,        # 256 MB
+    "cache_size": -20000,          # negative = KiB, i.e. ~20 MB
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(conn, profile=None):
+    """Apply a PRAGMA profile (defaults to PRAGMA_PROFILE) to a connection."""
+    for name, value in (profile or PRAGMA_PROFILE).items():
+        conn.execute(f"PRAGMA {name} = {value};")
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose close() hands it back to the pool that created it
+    instead of closing it.
+
+    commit() and rollback() are only allowed to the outermost lease: a nested
+    get_connection() shares the connection, so committing there would commit
+    the caller's half-done work too. Nested code should use transaction(),
+    which runs it in a savepoint.
+    """
+
+    def _check_outermost(self, action):
+        if self._depth > 1:
+            raise sqlite3.ProgrammingError(
+                f"{action}() called from a nested lease; use transaction() instead"
+            )
+
+    def commit(self):
+        self._check_outermost("commit")
+        super().commit()
+
+    def rollback(self):
+        self._check_outermost("rollback")
+        super().rollback()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # sqlite3's own __exit__ commits/rolls back without calling the methods above
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def close(self):
+        self._pool.release(self)
+
+    def force_close(self):
+        """Really close the underlying sqlite3 connection."""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Pool of long-lived SQLite connections.
+
+    Each thread leases one connection at a time: nested get_connection() calls
+    on the same thread share it, and the last close() returns it to the idle
+    list so the next script run (Streamlit uses a new thread per rerun) reuses
+    it instead of reconnecting.
+    """
+
+    def __init__(self, db_path, max_idle=MAX_IDLE_CONNECTIONS):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._watcher = None
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            factory=PooledConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn)
+        conn._pool = self
+        conn._depth = 0
+        conn._generation = self._generation
+        return conn
+
+    def acquire(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self._connect()
+            self._local.conn = conn
+        conn._depth += 1
+        return conn
+
+    def release(self, conn):
+        if conn._depth <= 0:
+            return
+        conn._depth -= 1
+        if conn._depth > 0:
+            return
+
+        if getattr(self._local, "conn", None) is conn:
+            self._local.conn = None
+
+        # Never hand a half-finished transaction to the next caller
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = sqlite3.Row
+
+        with self._lock:
+            if conn._generation == self._generation and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.force_close()
+
+    def data_version(self):
+        """
+        Token that changes whenever any connection (this process or another)
+        commits to the database.
+
+        PRAGMA data_version only reflects commits made by *other* connections,
+        so it is read from a dedicated connection that never writes.
+        """
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(self.db_path, check_same_thread=False)
+            version = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+            return (self._generation, version)
+
+    def close_all(self):
+        """Close idle connections and retire leased ones once they are released."""
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            watcher, self._watcher = self._watcher, None
+        for conn in idle:
+            conn.force_close()
+        if watcher is not None:
+            watcher.close()
+
+
+_pool = ConnectionPool(DB_PATH)
+
+
+def get_connection():
+    """Lease the current thread's pooled connection (call close() to give it back)."""
+    return _pool.acquire()
+
+
+@contextmanager
+def transaction():
+    """
+    Run a block in a single transaction on a pooled connection.
+
+    Commits when the block succeeds and rolls back if it raises. Inside
+    another lease of the same connection the block runs in a savepoint
+    instead, so its work is committed (or discarded) with the outer caller's.
+    """
+    conn = get_connection()
+    try:
+        if conn._depth == 1:
+            with conn:
+                yield conn
+            return
+
+        savepoint = f"nested_{conn._depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            raise
+        finally:
+            conn.execute(f"RELEASE {savepoint}")
+    finally:
+        conn.close()
+
+
+def configure_pragmas(overrides):
+    """Override entries of PRAGMA_PROFILE; new settings apply to fresh connections."""
+    if not overrides or all(PRAGMA_PROFILE.get(k) == v for k, v in overrides.items()):
+        return
+    PRAGMA_PROFILE.update(overrides)
+    _pool.close_all()
+
+
+def get_data_version():
+    """Current data version of the database, see ConnectionPool.data_version()."""
+    return _pool.data_version()
+
+
+def close_all_connections():
+    """Drop every pooled connection, e.g. before the database file is replaced."""
+    _pool.close_all()
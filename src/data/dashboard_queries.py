@@ -1,269 +1,232 @@
 import pandas as pd
 from src.data.database_utils import get_connection
-
-
+from src.data.result_cache import cached_read
+
+# Matrix breakdowns shown on the dashboard: (result key, column label,
+# final_matrix column, lookup table, keep activities without a value).
+# Breakdowns that keep them behave like a LEFT JOIN grouped by name.
+MATRIX_BREAKDOWNS = [
+    ("activities_by_gerencia", "Gerencia", "gerencia_id", "gerencias", False),
+    ("activities_by_subgerencia", "Subgerencia", "subgerencia_id", "subgerencias", True),
+    ("activities_by_area", "Área", "area_id", "areas", True),
+    ("activities_by_audience", "Audiencia", "audiencia_id", "audiencias", False),
+    ("activities_by_challenge", "Desafío Estratégico", "desafio_id", "desafios", False),
+    ("activities_by_priority", "Prioridad", "prioridad_id", "prioridades", False),
+    ("activities_by_modality", "Modalidad", "modalidad_id", "modalidades", False),
+    ("activities_by_source", "Fuente", "fuente_id", "fuentes", False),
+]
+
+
+def build_breakdowns_query(by_origin=False):
+    """
+    One statement returning (dimension, value, count) rows for every matrix
+    breakdown plus origin and LinkedIn usage, read from the trigger-maintained
+    summary tables (see migration 4).
+    """
+    origin_filter = "AND origin_key = :origin_id" if by_origin else ""
+
+    # The origin distribution always covers the whole matrix
+    branches = ["""
+        SELECT 'Origen' AS dimension, d.name AS value, s.activities AS count
+        FROM summary_origin_stats s
+        JOIN origin d ON d.id = s.origin_key
+        WHERE s.activities > 0
+    """]
+
+    for _, label, column, table, keep_missing in MATRIX_BREAKDOWNS:
+        # The filtered view also lists activities without a gerencia
+        join = "LEFT JOIN" if keep_missing or (by_origin and column == "gerencia_id") else "JOIN"
+        branches.append(f"""
+        SELECT '{label}', d.name, t.n
+        FROM (
+            SELECT value_key, SUM(activities) AS n
+            FROM summary_matrix_counts
+            WHERE dimension = '{column}' {origin_filter}
+            GROUP BY value_key
+        ) t
+        {join} {table} d ON d.id = t.value_key
+        """)
+
+    # One row per course association, plus one per activity without a course
+    stats_filter = "WHERE origin_key = :origin_id" if by_origin else ""
+    branches.append(f"""
+        SELECT 'Actividades', 'Con Curso Asociado', COALESCE(SUM(course_links), 0)
+        FROM summary_origin_stats {stats_filter}
+    """)
+    branches.append(f"""
+        SELECT 'Actividades', 'Sin Curso Asociado', COALESCE(SUM(activities - linked_activities), 0)
+        FROM summary_origin_stats {stats_filter}
+    """)
+
+    return "UNION ALL".join(branches)
+
+
+# Daily and monthly submission trends from the per day/respondent summary
+TRENDS_TEMPLATE = """
+SELECT
+    'day' AS period_type,
+    NULLIF(day, '') AS period,
+    NULL AS respondents,
+    SUM(submissions) AS submissions
+FROM summary_submissions
+{where}
+GROUP BY day
+UNION ALL
+SELECT
+    'month',
+    NULLIF(substr(day, 1, 7), ''),
+    COUNT(DISTINCT submission_id),
+    SUM(submissions)
+FROM summary_submissions
+{where}
+GROUP BY substr(day, 1, 7)
+"""
+
+# Every statement the dashboard runs, as static parameterized SQL. Values
+# (origin ids, names) are always bound, never formatted into the text, so
+# switching the origin filter reuses the compiled statements held in each
+# connection's statement cache (see STATEMENT_CACHE_SIZE).
+DASHBOARD_QUERIES = {
+    "origin_id": "SELECT id FROM origin WHERE name = ?",
+    "available_origins": "SELECT name FROM origin ORDER BY name",
+    "breakdowns": build_breakdowns_query(),
+    "breakdowns_by_origin": build_breakdowns_query(by_origin=True),
+    "trends": TRENDS_TEMPLATE.format(where=""),
+    "trends_by_origin": TRENDS_TEMPLATE.format(where="WHERE origin_key = :origin_id"),
+    "submission_totals": """
+        SELECT COUNT(DISTINCT submission_id), COALESCE(SUM(submissions), 0)
+        FROM summary_submissions
+    """,
+    "matrix_totals": """
+        SELECT COALESCE(SUM(activities), 0), COALESCE(SUM(validated), 0)
+        FROM summary_origin_stats
+    """,
+    "linkedin_courses": "SELECT COUNT(*) FROM linkedin_courses",
+    "origin_totals": """
+        SELECT activities, validated, course_links
+        FROM summary_origin_stats
+        WHERE origin_key = ?
+    """,
+}
+
+
+def split_breakdown(breakdowns, dimension, label):
+    """Counts for one dimension, largest first"""
+    rows = breakdowns[breakdowns["dimension"] == dimension]
+    # Missing and dangling ids both come back without a name, so merge them
+    counts = (
+        rows.groupby("value", dropna=False, sort=False)["count"]
+        .sum()
+        .reset_index()
+        .rename(columns={"value": label})
+    )
+    return counts.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def split_trends(trends):
+    """Daily (Fecha, Envíos) and monthly (Mes, Encuestados, Envíos) trends"""
+    trends = trends.sort_values("period", na_position="first", kind="stable")
+
+    daily = trends[trends["period_type"] == "day"]
+    time_trends = pd.DataFrame({
+        "Fecha": daily["period"],
+        "Envíos": daily["submissions"].astype("int64"),
+    }).reset_index(drop=True)
+
+    monthly = trends[trends["period_type"] == "month"]
+    monthly_trends = pd.DataFrame({
+        "Mes": monthly["period"],
+        "Encuestados": monthly["respondents"].astype("int64"),
+        "Envíos": monthly["submissions"].astype("int64"),
+    }).reset_index(drop=True)
+
+    return time_trends, monthly_trends
+
+
+def build_dashboard_data(conn, origin_id=None):
+    """
+    Compute every dashboard breakdown with one statement over the matrix
+    summaries and one over the submission summary, optionally restricted to
+    an origin.
+    """
+    if origin_id is None:
+        breakdowns = pd.read_sql_query(DASHBOARD_QUERIES["breakdowns"], conn)
+        trends = pd.read_sql_query(DASHBOARD_QUERIES["trends"], conn)
+    else:
+        params = {"origin_id": origin_id}
+        breakdowns = pd.read_sql_query(DASHBOARD_QUERIES["breakdowns_by_origin"], conn, params=params)
+        trends = pd.read_sql_query(DASHBOARD_QUERIES["trends_by_origin"], conn, params=params)
+
+    data = {'origin_of_needs': split_breakdown(breakdowns, "Origen", "Origen")}
+    for key, label, _, _, _ in MATRIX_BREAKDOWNS:
+        data[key] = split_breakdown(breakdowns, label, label)
+    linkedin_usage = split_breakdown(breakdowns, "Actividades", "Actividades")
+    data['linkedin_usage'] = (
+        linkedin_usage[linkedin_usage["count"] > 0]
+        .sort_values("Actividades")
+        .reset_index(drop=True)
+    )
+    data['time_trends'], data['monthly_trends'] = split_trends(trends)
+    return data
+
+
+@cached_read
 def get_origin_filtered_data(origin_name=None):
     """Get dashboard data filtered by specific origin"""
-    conn = get_connection()
-
     # If no origin filter, return all data
     if origin_name is None or origin_name == "Todos":
         return get_dashboard_data()
 
+    conn = get_connection()
+
     try:
         # Get origin ID
-        origin_query = "SELECT id FROM origin WHERE name = ?"
-        origin_id = conn.execute(origin_query, (origin_name,)).fetchone()
+        origin_id = conn.execute(DASHBOARD_QUERIES["origin_id"], (origin_name,)).fetchone()
         if not origin_id:
             return get_dashboard_data()  # Return all data if origin not found
 
-        origin_id = origin_id[0]
-
-        # Origin distribution
-        origin_query = """
-        SELECT
-            o.name AS Origen,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN origin o ON fm.origin_id = o.id
-        GROUP BY o.name
-        ORDER BY count DESC
-        """
-        origin_of_needs = pd.read_sql_query(origin_query, conn)
-
-        # Gerencias data - filter by origin (from final_matrix)
-        gerencias_query = f"""
-        SELECT
-            g.name AS Gerencia,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        LEFT JOIN gerencias g ON fm.gerencia_id = g.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY g.name
-        ORDER BY count DESC
-        """
-        activities_by_gerencia = pd.read_sql_query(gerencias_query, conn)
-
-        # Activities by subgerencia - filter by origin (from final_matrix)
-        subgerencias_query = f"""
-        SELECT
-            sg.name AS Subgerencia,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        LEFT JOIN subgerencias sg ON fm.subgerencia_id = sg.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY sg.name
-        ORDER BY count DESC
-        """
-        activities_by_subgerencia = pd.read_sql_query(subgerencias_query, conn)
-
-        # Activities by area - filter by origin (from final_matrix)
-        areas_query = f"""
-        SELECT
-            a.name AS Área,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        LEFT JOIN areas a ON fm.area_id = a.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY a.name
-        ORDER BY count DESC
-        """
-        activities_by_area = pd.read_sql_query(areas_query, conn)
-
-        # Activities by audience - filter by origin (from final_matrix)
-        audience_query = f"""
-        SELECT
-            au.name AS Audiencia,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN audiencias au ON fm.audiencia_id = au.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY au.name
-        ORDER BY count DESC
-        """
-        activities_by_audience = pd.read_sql_query(audience_query, conn)
-
-        # Activities by strategic challenge - filter by origin (from final_matrix)
-        challenge_query = f"""
-        SELECT
-            des.name AS 'Desafío Estratégico',
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN desafios des ON fm.desafio_id = des.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY des.name
-        ORDER BY count DESC
-        """
-        activities_by_challenge = pd.read_sql_query(challenge_query, conn)
-
-        # Activities by priority - filter by origin (from final_matrix)
-        priority_query = f"""
-        SELECT
-            p.name AS Prioridad,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN prioridades p ON fm.prioridad_id = p.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY p.name
-        ORDER BY count DESC
-        """
-        activities_by_priority = pd.read_sql_query(priority_query, conn)
-
-        # Activities by modality - filter by origin (from final_matrix)
-        modality_query = f"""
-        SELECT
-            m.name AS Modalidad,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN modalidades m ON fm.modalidad_id = m.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY m.name
-        ORDER BY count DESC
-        """
-        activities_by_modality = pd.read_sql_query(modality_query, conn)
-
-        # Activities by source - filter by origin (from final_matrix)
-        source_query = f"""
-        SELECT
-            f.name AS Fuente,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        JOIN fuentes f ON fm.fuente_id = f.id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY f.name
-        ORDER BY count DESC
-        """
-        activities_by_source = pd.read_sql_query(source_query, conn)
-
-        # LinkedIn courses usage - filter by origin
-        linkedin_query = f"""
-        SELECT
-            CASE
-                WHEN mlc.course_id IS NOT NULL THEN 'Con Curso Asociado'
-                ELSE 'Sin Curso Asociado'
-            END AS Actividades,
-            COUNT(*) AS count
-        FROM final_matrix fm
-        LEFT JOIN matrix_linkedin_courses mlc ON fm.id = mlc.matrix_id
-        WHERE fm.origin_id = {origin_id}
-        GROUP BY Actividades
-        """
-        linkedin_usage = pd.read_sql_query(linkedin_query, conn)
-
-        # Time-based trends - filter by origin 
-        time_query = f"""
-        SELECT
-            DATE(created_at) AS Fecha,
-            COUNT(*) AS Envíos
-        FROM raw_data_forms
-        WHERE origin_id = {origin_id}
-        GROUP BY DATE(created_at)
-        ORDER BY Fecha
-        """
-        time_trends = pd.read_sql_query(time_query, conn)
-
-        # Monthly trends - filter by origin
-        monthly_query = f"""
-        SELECT
-            strftime('%Y-%m', created_at) as Mes,
-            COUNT(DISTINCT CASE WHEN submission_id IS NOT NULL THEN submission_id END) as Encuestados,
-            COUNT(*) as Envíos
-        FROM raw_data_forms
-        WHERE origin_id = {origin_id}
-        GROUP BY strftime('%Y-%m', created_at)
-        ORDER BY Mes
-        """
-        monthly_trends = pd.read_sql_query(monthly_query, conn)
-
-        return {
-            'origin_of_needs': origin_of_needs,
-            'activities_by_gerencia': activities_by_gerencia,
-            'activities_by_subgerencia': activities_by_subgerencia,
-            'activities_by_area': activities_by_area,
-            'activities_by_audience': activities_by_audience,
-            'activities_by_challenge': activities_by_challenge,
-            'activities_by_priority': activities_by_priority,           
-            'activities_by_modality': activities_by_modality,
-            'activities_by_source': activities_by_source,
-            'linkedin_usage': linkedin_usage,
-            'time_trends': time_trends,
-            'monthly_trends': monthly_trends
-        }
+        return build_dashboard_data(conn, origin_id[0])
 
     finally:
         conn.close()
 
 
+@cached_read
 def get_available_origins():
     """Get list of all available origins for filtering"""
     conn = get_connection()
     try:
-        result = conn.execute("SELECT name FROM origin ORDER BY name").fetchall()
+        result = conn.execute(DASHBOARD_QUERIES["available_origins"]).fetchall()
         return [row[0] for row in result]
     finally:
         conn.close()
 
 
+@cached_read
 def get_summary_metrics(origin_filter=None):
     """Get summary metrics, optionally filtered by origin"""
     conn = get_connection()
 
     try:
+        # Respondents and needs always cover every form submission
+        respondents, needs = conn.execute(DASHBOARD_QUERIES["submission_totals"]).fetchone()
+
         if origin_filter is None or origin_filter == "Todos":
-            # Get total counts (all from final_matrix for consistency)
-            activities_query = "SELECT COUNT(*) FROM final_matrix"
-            linkedin_query = "SELECT COUNT(*) FROM linkedin_courses"
-            respondents_query = "SELECT COUNT(DISTINCT submission_id) FROM raw_data_forms"
-            needs_query = "SELECT COUNT(*) FROM raw_data_forms"
+            activities, validated_count = conn.execute(DASHBOARD_QUERIES["matrix_totals"]).fetchone()
+            linkedin = conn.execute(DASHBOARD_QUERIES["linkedin_courses"]).fetchone()[0]
         else:
             # Get origin ID
-            origin_id_query = "SELECT id FROM origin WHERE name = ?"
-            origin_id = conn.execute(origin_id_query, (origin_filter,)).fetchone()
+            origin_id = conn.execute(DASHBOARD_QUERIES["origin_id"], (origin_filter,)).fetchone()
 
             if not origin_id:
                 return {"respondents": 0, "needs": 0, "activities": 0, "linkedin": 0}
 
-            origin_id = origin_id[0]
-
-            # Get filtered counts
-            activities_query = f"SELECT COUNT(*) FROM final_matrix WHERE origin_id = {origin_id}"
-            linkedin_query = f"""
-                SELECT COUNT(*)
-                FROM linkedin_courses lc
-                LEFT JOIN matrix_linkedin_courses mlc ON lc.id = mlc.course_id
-                LEFT JOIN final_matrix fm ON mlc.matrix_id = fm.id
-                WHERE fm.origin_id = {origin_id}
-            """
-            needs_query = f"SELECT COUNT(*) FROM raw_data_forms"
-            respondents_query = f"SELECT COUNT(DISTINCT submission_id) FROM raw_data_forms"
-
-        respondents = conn.execute(respondents_query).fetchone()[0]
-        needs = conn.execute(needs_query).fetchone()[0]
-        activities = conn.execute(activities_query).fetchone()[0]
-        linkedin = conn.execute(linkedin_query).fetchone()[0]
+            # Course associations of the origin's activities
+            stats = conn.execute(DASHBOARD_QUERIES["origin_totals"], (origin_id[0],)).fetchone()
+            activities, validated_count, linkedin = stats if stats else (0, 0, 0)
 
         # Get validation statistics
-        if origin_filter is None or origin_filter == "Todos":
-            validation_query = """
-                SELECT
-                    COUNT(CASE WHEN vm.validated = 1 THEN 1 END) as validated_count,
-                    COUNT(CASE WHEN vm.validated = 0 OR vm.validated IS NULL THEN 1 END) as pending_count
-                FROM final_matrix fm
-                LEFT JOIN validated_matrix vm ON fm.id = vm.matrix_id
-            """
-        else:
-            validation_query = f"""
-                SELECT
-                    COUNT(CASE WHEN vm.validated = 1 THEN 1 END) as validated_count,
-                    COUNT(CASE WHEN vm.validated = 0 OR vm.validated IS NULL THEN 1 END) as pending_count
-                FROM final_matrix fm
-                LEFT JOIN validated_matrix vm ON fm.id = vm.matrix_id
-                WHERE fm.origin_id = {origin_id}
-            """
-
-        validation_result = conn.execute(validation_query).fetchone()
-        validated_count = validation_result[0] or 0
-        pending_count = validation_result[1] or 0
+        pending_count = activities - validated_count
         total_validation_activities = validated_count + pending_count
         validation_percentage = round((validated_count / total_validation_activities * 100), 1) if total_validation_activities > 0 else 0
 
@@ -282,169 +245,11 @@ def get_summary_metrics(origin_filter=None):
         conn.close()
 
 
+@cached_read
 def get_dashboard_data():
     """Get all data needed for the dashboard"""
     conn = get_connection()
-
-    # Origin of needs in final matrix
-    origin_query = """
-    SELECT
-        o.name AS Origen,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN origin o ON fm.origin_id = o.id
-    GROUP BY o.name
-    ORDER BY count DESC
-    """
-    origin_of_needs = pd.read_sql_query(origin_query, conn)
-
-    # Activities by gerencia (from final_matrix)
-    gerencias_query = """
-    SELECT
-        g.name AS Gerencia,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    LEFT JOIN gerencias g ON fm.gerencia_id = g.id
-    WHERE g.name IS NOT NULL
-    GROUP BY g.name
-    ORDER BY count DESC
-    """
-    activities_by_gerencia = pd.read_sql_query(gerencias_query, conn)
-
-    # Activities by subgerencia (from final_matrix)
-    subgerencias_query = """
-    SELECT
-        sg.name AS Subgerencia,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    LEFT JOIN subgerencias sg ON fm.subgerencia_id = sg.id
-    GROUP BY sg.name
-    ORDER BY count DESC
-    """
-    activities_by_subgerencia = pd.read_sql_query(subgerencias_query, conn)
-
-    # Activities by area (from final_matrix)
-    areas_query = """
-    SELECT
-        a.name AS Área,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    LEFT JOIN areas a ON fm.area_id = a.id
-    GROUP BY a.name
-    ORDER BY count DESC
-    """
-    activities_by_area = pd.read_sql_query(areas_query, conn)
-
-    # Activities by audience (from final_matrix)
-    audience_query = """
-    SELECT
-        au.name AS Audiencia,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN audiencias au ON fm.audiencia_id = au.id
-    GROUP BY au.name
-    ORDER BY count DESC
-    """
-    activities_by_audience = pd.read_sql_query(audience_query, conn)
-
-    # Activities by strategic challenge (from final_matrix)
-    challenge_query = """
-    SELECT
-        des.name AS 'Desafío Estratégico',
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN desafios des ON fm.desafio_id = des.id
-    GROUP BY des.name
-    ORDER BY count DESC
-    """
-    activities_by_challenge = pd.read_sql_query(challenge_query, conn)
-
-    # Activities by priority (from final_matrix)
-    priority_query = """
-    SELECT
-        p.name AS Prioridad,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN prioridades p ON fm.prioridad_id = p.id
-    GROUP BY p.name
-    ORDER BY count DESC
-    """
-    activities_by_priority = pd.read_sql_query(priority_query, conn)
-
-    # Activities by modality (from final_matrix)
-    modality_query = """
-    SELECT
-        m.name AS Modalidad,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN modalidades m ON fm.modalidad_id = m.id
-    GROUP BY m.name
-    ORDER BY count DESC
-    """
-    activities_by_modality = pd.read_sql_query(modality_query, conn)
-
-    # Activities by source (from final_matrix)
-    source_query = """
-    SELECT
-        f.name AS Fuente,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    JOIN fuentes f ON fm.fuente_id = f.id
-    GROUP BY f.name
-    ORDER BY count DESC
-    """
-    activities_by_source = pd.read_sql_query(source_query, conn)
-
-    # LinkedIn courses usage
-    linkedin_query = """
-    SELECT
-        CASE
-            WHEN mlc.course_id IS NOT NULL THEN 'Con Curso Asociado'
-            ELSE 'Sin Curso Asociado'
-        END AS Actividades,
-        COUNT(*) AS count
-    FROM final_matrix fm
-    LEFT JOIN matrix_linkedin_courses mlc ON fm.id = mlc.matrix_id
-    GROUP BY Actividades
-    """
-    linkedin_usage = pd.read_sql_query(linkedin_query, conn)
-
-    # Time-based trends (from final_matrix)
-    time_query = """
-    SELECT
-        DATE(created_at) AS Fecha,
-        COUNT(*) AS Envíos
-    FROM raw_data_forms
-    GROUP BY DATE(created_at)
-    ORDER BY Fecha
-    """
-    time_trends = pd.read_sql_query(time_query, conn)
-    
-    # Monthly trends (from final_matrix)
-    monthly_query = """
-    SELECT
-        strftime('%Y-%m', created_at) as Mes,
-        COUNT(DISTINCT CASE WHEN submission_id IS NOT NULL THEN submission_id END) as Encuestados,
-        COUNT(*) as Envíos
-    FROM raw_data_forms
-    GROUP BY strftime('%Y-%m', created_at)
-    ORDER BY Mes
-    """
-    monthly_trends = pd.read_sql_query(monthly_query, conn)
-
-    conn.close()
-
-    return {
-        'origin_of_needs': origin_of_needs,
-        'activities_by_gerencia': activities_by_gerencia,
-        'activities_by_subgerencia': activities_by_subgerencia,
-        'activities_by_area': activities_by_area,
-        'activities_by_audience': activities_by_audience,
-        'activities_by_challenge': activities_by_challenge,
-        'activities_by_priority': activities_by_priority,       
-        'activities_by_modality': activities_by_modality,
-        'activities_by_source': activities_by_source,
-        'linkedin_usage': linkedin_usage,
-        'time_trends': time_trends,
-        'monthly_trends': monthly_trends
-    }
+    try:
+        return build_dashboard_data(conn)
+    finally:
+        conn.close()
@@ -6,9 +6,16 @@ import os
 import time
 import pandas as pd
 import io
+import json
+import hashlib
+from itertools import islice
+from contextlib import contextmanager
+from openpyxl import load_workbook
 from src.data import template_desplegables
-
-DB_PATH = "database.db"
+from src.data.connection import DB_PATH, get_connection, transaction, close_all_connections
+from src.data.migrations import run_migrations, rebuild_summary_tables, rebuild_matrix_wide
+from src.data.dimension_cache import get_dimension, invalidate_dimensions
+from src.data.result_cache import clear_result_cache
 
 
 def safe_remove_file(file_path, max_retries=3, delay=0.5):
@@ -25,26 +32,62 @@ def safe_remove_file(file_path, max_retries=3, delay=0.5):
             time.sleep(delay)
     return False
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+# Hash of the lookup template this process already knows is seeded
+_seeded_template_hash = None
 
 
-def fill_database_from_template():
-    """Populate all lookup tables from template_desplegables.py."""
-    conn = get_connection()
-    cur = conn.cursor()
+def get_template_hash():
+    """Stable hash of template_desplegables.template, used as its seed version."""
+    payload = json.dumps(template_desplegables.template, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fill_database_from_template(force=False):
+    """
+    Populate all lookup tables from template_desplegables.py.
+
+    Seeding runs once per template version: the template hash is stored in
+    app_meta and checked only once per process, so regular reruns skip the
+    write transaction entirely. Use force=True after the database was cleared
+    or replaced.
+    """
+    global _seeded_template_hash
+    template_hash = get_template_hash()
+    if _seeded_template_hash == template_hash and not force:
+        return
+
+    with transaction() as conn:
+        cur = conn.cursor()
+
+        if not force:
+            cur.execute("SELECT value FROM app_meta WHERE key = 'template_hash'")
+            row = cur.fetchone()
+            if row and row[0] == template_hash:
+                _seeded_template_hash = template_hash
+                return
 
-    try:
         for table, values in template_desplegables.template.items():
-            for item in values:
-                cur.execute(f"""INSERT OR IGNORE INTO {table} (name) VALUES (?)""", (item,))
-        conn.commit()
+            cur.executemany(f"""INSERT OR IGNORE INTO {table} (name) VALUES (?)""", [(item,) for item in values])
+        cur.execute(
+            "INSERT OR REPLACE INTO app_meta (key, value) VALUES ('template_hash', ?)",
+            (template_hash,)
+        )
 
-    finally:
-        conn.close()
+    invalidate_dimensions(*template_desplegables.template.keys())
+    _seeded_template_hash = template_hash
+
+
+def rebuild_dashboard_summaries():
+    """
+    Recompute the trigger-maintained dashboard summary tables and matrix
+    read model from scratch.
+
+    Only needed if they drifted, e.g. after editing the database outside the app.
+    """
+    with transaction() as conn:
+        cur = conn.cursor()
+        rebuild_summary_tables(cur)
+        rebuild_matrix_wide(cur)
 
 
 def validate_database_schema(db_path):
@@ -129,6 +172,39 @@ def validate_database_schema(db_path):
             conn.close()
 
 
+def replace_database_contents(source_path):
+    """
+    Overwrite database.db with the contents of another SQLite file.
+
+    Uses the SQLite backup API on a pooled connection instead of swapping the
+    file: in WAL mode, connections still open on the old file (leases, pages
+    with their own sqlite3.connect) would keep using database.db-wal/-shm,
+    and new connections to a swapped-in file would attach to that WAL and
+    corrupt it. The backup goes through SQLite's locking, so every
+    connection sees the new contents.
+    """
+    source = sqlite3.connect(source_path)
+    try:
+        conn = get_connection()
+        try:
+            # A WAL destination can only take pages of its own size
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            if source.execute("PRAGMA page_size").fetchone()[0] != page_size:
+                source.execute("PRAGMA journal_mode = DELETE")
+                source.execute(f"PRAGMA page_size = {int(page_size)}")
+                source.execute("VACUUM")
+            source.backup(conn)
+        finally:
+            conn.close()
+    finally:
+        source.close()
+
+    # Drop cached statements, the data version watcher and the read results
+    # of the old contents
+    close_all_connections()
+    clear_result_cache()
+
+
 def download_demo_db():
     FILE_ID = "1n4Hl2PX_0rKjdd8jBTS2Y4fjJ0eoc0yR"
     url = f"https://drive.google.com/uc?export=download&id={FILE_ID}"
@@ -150,10 +226,14 @@ def download_demo_db():
             safe_remove_file(temp_db_path)
             return False, f"Downloaded database validation failed: {validation_message}"
 
-        # If validation passes, replace the original database
-        if os.path.exists(DB_PATH):
-            safe_remove_file(DB_PATH)
-        os.rename(temp_db_path, DB_PATH)
+        # If validation passes, copy it over the original database
+        replace_database_contents(temp_db_path)
+        safe_remove_file(temp_db_path)
+
+        # The demo database may predate the current schema version and lookup template
+        invalidate_dimensions()
+        run_migrations(force=True)
+        fill_database_from_template(force=True)
 
         return True, "Database downloaded and validated successfully"
 
@@ -391,6 +471,7 @@ def generate_excel_template():
 
 
 def validate_excel_columns(df):
+    """Check the required template columns against a DataFrame or a list of header names."""
     # Required columns from the matrix view (excluding computed/auto-generated ones)
     required_columns = [
         "Gerencia",
@@ -414,8 +495,9 @@ def validate_excel_columns(df):
         "Fuente Interna"
     ]
     
-    # Get actual column names from DataFrame
-    actual_columns = [col.strip() for col in df.columns.tolist()]
+    # Get actual column names from the DataFrame or header row
+    columns = df.columns.tolist() if hasattr(df, "columns") else list(df)
+    actual_columns = [str(col).strip() for col in columns]
     
     # Check for required columns
     missing_required = []
@@ -457,261 +539,466 @@ def get_or_create_id(table_name, name):
             # Create new entry
             cur.execute(f"INSERT INTO {table_name} (name) VALUES (?)", (name.strip(),))
             conn.commit()
+            invalidate_dimensions(table_name)
             return cur.lastrowid
     finally:
         conn.close()
 
 
-def import_excel_to_database(uploaded_file, origin_name="Excel Import"):
+# Excel column -> (final_matrix column, lookup table or None for free text)
+IMPORT_COLUMNS = {
+    "Origen": ("origin_id", "origin"),
+    "Gerencia": ("gerencia_id", "gerencias"),
+    "Subgerencia": ("subgerencia_id", "subgerencias"),
+    "Área": ("area_id", "areas"),
+    "Desafío Estratégico": ("desafio_id", "desafios"),
+    "Actividad Formativa": ("actividad_formativa", None),
+    "Objetivo Desempeño": ("objetivo_desempeno", None),
+    "Contenidos": ("contenidos_especificos", None),
+    "Skills": ("skills", None),
+    "Keywords": ("keywords", None),
+    "Audiencia": ("audiencia_id", "audiencias"),
+    "Modalidad": ("modalidad_id", "modalidades"),
+    "Fuente": ("fuente_id", "fuentes"),
+    "Fuente Interna": ("fuente_interna", None),
+    "Prioridad": ("prioridad_id", "prioridades"),
+}
+
+# Cells that must not be empty, in the order they are reported
+IMPORT_REQUIRED_CELLS = [
+    ("Actividad Formativa", "Actividad Formativa está vacía"),
+    ("Objetivo Desempeño", "Objetivo Desempeño está vacío"),
+    ("Contenidos", "Contenidos está vacío"),
+    ("Gerencia", "Gerencia está vacía"),
+    ("Modalidad", "Modalidad está vacía"),
+    ("Fuente", "Fuente está vacía"),
+    ("Prioridad", "Prioridad está vacía"),
+]
+IMPORT_REQUIRED_MESSAGES = dict(IMPORT_REQUIRED_CELLS)
+
+# Stay well below SQLite's bound-parameter limit
+SQL_IN_CHUNK_SIZE = 500
+
+# Rows imported (and committed) per transaction when streaming an Excel upload
+IMPORT_BATCH_SIZE = 1000
+
+# Rows validated per DataFrame chunk in an import dry run; large chunks
+# amortize pandas' per-call overhead
+VALIDATION_CHUNK_SIZE = 10000
+
+
+def clean_import_frame(frame):
+    """
+    Normalize a chunk of Excel cells: every cell becomes a stripped string
+    and empty or whitespace-only cells become NA.
+    """
+    text = frame.apply(lambda column: column.astype("string").str.strip())
+    return text.mask(text.eq("").fillna(False))
+
+
+def build_import_chunk(header, frame):
+    """
+    Label a chunk of raw Excel cells with the header (the last column wins
+    when a name repeats), clean it and drop the rows whose cells are all empty.
+    """
+    frame = frame.iloc[:, :len(header)]
+    frame = frame.set_axis(header[:frame.shape[1]], axis=1)
+    frame = clean_import_frame(frame.loc[:, ~frame.columns.duplicated(keep="last")])
+    return frame[frame.notna().any(axis=1)]
+
+
+def check_import_chunk(chunk, origin_name="Excel Import"):
+    """
+    Select the import columns of a cleaned chunk and find its empty required cells.
+
+    Returns:
+        tuple: (values: DataFrame of the IMPORT_COLUMNS with "Origen" defaulted
+                to origin_name, missing: boolean DataFrame of the required
+                cells, columns in report order)
+    """
+    values = chunk.reindex(columns=list(IMPORT_COLUMNS))
+    missing = values[[column for column, _ in IMPORT_REQUIRED_CELLS]].isna()
+    values["Origen"] = values["Origen"].fillna(origin_name)
+    return values, missing
+
+
+@contextmanager
+def open_import_chunks(uploaded_file, chunk_size=IMPORT_BATCH_SIZE):
+    """
+    Open an uploaded Excel file for import as a stream of cleaned chunks.
+
+    .xlsx files are streamed with openpyxl's read-only reader; legacy .xls
+    files are read with pandas. Each chunk is a DataFrame of up to chunk_size
+    rows, indexed by Excel row number and cleaned by build_import_chunk().
+    Both the import and its dry run read through here, so they see exactly
+    the same rows and cell values.
+
+    Yields:
+        tuple: (header: list of str, chunks: iterator of DataFrame, total_rows: int or None)
+    """
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+
+    if str(getattr(uploaded_file, "name", "")).lower().endswith(".xls"):
+        df = pd.read_excel(uploaded_file)
+        header = [str(col).strip() for col in df.columns]
+        # Excel row numbers: header is row 1
+        df.index = df.index + 2
+        chunks = (
+            build_import_chunk(header, df.iloc[start:start + chunk_size])
+            for start in range(0, len(df), chunk_size)
+        )
+        yield header, chunks, len(df)
+        return
+
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        sheet_rows = worksheet.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(sheet_rows, ())]
+        total_rows = worksheet.max_row - 1 if worksheet.max_row else None
+        numbered_rows = enumerate(sheet_rows, start=2)
+
+        def read_chunks():
+            while True:
+                batch = list(islice(numbered_rows, chunk_size))
+                if not batch:
+                    return
+                # object dtype keeps cells as read (no int -> float upcasting)
+                frame = pd.DataFrame(
+                    [values for _, values in batch],
+                    index=[row_number for row_number, _ in batch],
+                    dtype=object,
+                )
+                yield build_import_chunk(header, frame)
+
+        yield header, read_chunks(), total_rows
+    finally:
+        workbook.close()
+
+
+def resolve_lookup_ids(cur, table_name, names, created_tables=None):
+    """
+    Resolve a set of names to ids for a lookup table, creating the missing ones.
+
+    Runs one SELECT per chunk of names and a single executemany for the
+    inserts, instead of one get_or_create_id() round trip per cell. When
+    names are created the table is added to created_tables; the caller
+    invalidates those dimensions once its transaction has committed.
+
+    Returns:
+        dict: {name: id} for every name in names
+    """
+    names = {name for name in names if name}
+    ids = {}
+
+    def select_ids(pending):
+        pending = list(pending)
+        for i in range(0, len(pending), SQL_IN_CHUNK_SIZE):
+            chunk = pending[i:i + SQL_IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            cur.execute(f"SELECT name, id FROM {table_name} WHERE name IN ({placeholders})", chunk)
+            ids.update({name: id for name, id in cur.fetchall()})
+
+    select_ids(names)
+    missing = names - ids.keys()
+    if missing:
+        cur.executemany(f"INSERT OR IGNORE INTO {table_name} (name) VALUES (?)", [(name,) for name in missing])
+        if created_tables is not None:
+            created_tables.add(table_name)
+        select_ids(missing)
+
+    return ids
+
+
+def import_matrix_rows(cur, chunk, origin_name="Excel Import", created_tables=None):
+    """
+    Bulk-insert a cleaned import chunk into final_matrix on an open cursor.
+
+    Invalid rows are reported and skipped; the caller owns the transaction.
+
+    Args:
+        cur: Cursor inside an open transaction
+        chunk: DataFrame from open_import_chunks(), indexed by Excel row number
+        origin_name: Origin used when a row has no "Origen" value
+        created_tables: Optional set collecting the lookup tables that got new names
+
+    Returns:
+        tuple: (imported_count: int, errors: list of str)
+    """
+    values, missing = check_import_chunk(chunk, origin_name)
+
+    # Report the first empty required cell of each invalid row
+    invalid = missing.any(axis=1)
+    first_missing = missing[invalid].idxmax(axis=1)
+    errors = [f"Fila {row_number}: {IMPORT_REQUIRED_MESSAGES[column]}" for row_number, column in first_missing.items()]
+
+    values = values[~invalid]
+    if values.empty:
+        return 0, errors
+
+    # Resolve every lookup dimension in one pass
+    for column, (_, table) in IMPORT_COLUMNS.items():
+        if table:
+            ids = resolve_lookup_ids(cur, table, set(values[column].dropna()), created_tables)
+            values[column] = values[column].map(ids).astype("Int64")
+
+    # Plain Python values for sqlite3: ints and strings, None for empty cells
+    values = values.astype(object).where(values.notna(), None)
+    params = list(values.itertuples(index=False, name=None))
+
+    db_columns = [db_column for db_column, _ in IMPORT_COLUMNS.values()]
+    insert_query = f"""
+        INSERT INTO final_matrix ({", ".join(db_columns)})
+        VALUES ({", ".join("?" for _ in db_columns)})
+    """
+
+    try:
+        cur.execute("SAVEPOINT import_batch")
+        cur.executemany(insert_query, params)
+        cur.execute("RELEASE SAVEPOINT import_batch")
+        return len(params), errors
+    except sqlite3.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT import_batch")
+        cur.execute("RELEASE SAVEPOINT import_batch")
+
+    # Some row broke the batch: insert one by one so only that row is skipped
+    imported_count = 0
+    for row_number, row_params in zip(values.index, params):
+        try:
+            cur.execute(insert_query, row_params)
+            imported_count += 1
+        except sqlite3.Error as e:
+            errors.append(f"Fila {row_number}: Error al importar - {str(e)}")
+
+    return imported_count, errors
+
+
+def validate_import_chunks(chunks, origin_name="Excel Import"):
+    """
+    Validate cleaned import chunks without writing anything.
+
+    Runs the same checks as the import (check_import_chunk), but reports
+    every empty required cell (not just the first one per row) and the
+    lookup values that importing would create.
+
+    Args:
+        chunks: Iterable of DataFrames from open_import_chunks()
+        origin_name: Origin used when a row has no "Origen" value
+
+    Returns:
+        dict: {"total_rows": int, "valid_rows": int, "errors": list of str,
+               "new_values": {table: sorted list of names}}
+    """
+    lookup_columns = {column: table for column, (_, table) in IMPORT_COLUMNS.items() if table}
+    names = {column: set() for column in lookup_columns}
+    total_rows = 0
+    valid_rows = 0
+    errors = []
+
+    for chunk in chunks:
+        values, missing = check_import_chunk(chunk, origin_name)
+        total_rows += len(values)
+
+        # stack() walks row by row, in report order within a row
+        cells = missing.stack()
+        errors.extend(
+            f"Fila {row_number}: {IMPORT_REQUIRED_MESSAGES[column]}"
+            for row_number, column in cells[cells].index
+        )
+
+        values = values[~missing.any(axis=1)]
+        valid_rows += len(values)
+        for column in lookup_columns:
+            names[column].update(values[column].dropna().unique())
+
+    new_values = {}
+    for column, table in lookup_columns.items():
+        missing_names = sorted(names[column] - fetch_all(table).keys())
+        if missing_names:
+            new_values[table] = missing_names
+
+    return {
+        "total_rows": total_rows,
+        "valid_rows": valid_rows,
+        "errors": errors,
+        "new_values": new_values
+    }
+
+
+def validate_excel_import(uploaded_file, origin_name="Excel Import"):
+    """
+    Dry-run an Excel import: validate every row and report what would change.
+
+    Returns:
+        tuple: (success: bool, message: str, report: dict or None)
+    """
+    try:
+        with open_import_chunks(uploaded_file, VALIDATION_CHUNK_SIZE) as (header, chunks, _):
+            is_valid, validation_message, missing_columns = validate_excel_columns(header)
+            if not is_valid:
+                return False, validation_message, None
+
+            report = validate_import_chunks(chunks, origin_name)
+
+        message = f"Se revisaron {report['total_rows']} fila(s): {report['valid_rows']} lista(s) para importar"
+        if report["errors"]:
+            message += f" y {len(report['errors'])} error(es) encontrados.\n\n"
+            message += "\n".join(f"{i}. {error}" for i, error in enumerate(report["errors"], 1))
+        else:
+            message += ", sin errores."
+
+        return not report["errors"], message, report
+
+    except Exception as e:
+        return False, f"Error al procesar el archivo Excel: {str(e)}", None
+
+
+def build_import_result(imported_count, errors):
+    """Build the (success, message, imported_count) tuple shown by the import UI."""
+    if errors:
+        error_msg = f"❌ Se encontraron {len(errors)} error(es) durante la importación:\n\n"
+        for i, error in enumerate(errors, 1):
+            error_msg += f"{i}. {error}\n"
+        if imported_count > 0:
+            error_msg += f"\n✅ Se importaron {imported_count} fila(s) correctamente; las filas con errores fueron omitidas."
+        else:
+            error_msg += f"\n⚠️ No se importó ninguna fila debido a los errores encontrados."
+        return False, error_msg, imported_count
+
+    message = f"✅ Se importaron {imported_count} fila(s) correctamente."
+    return True, message, imported_count
+
+
+def import_chunks(chunks, origin_name="Excel Import", progress_callback=None, total_rows=None):
+    """
+    Import cleaned chunks from open_import_chunks(), one transaction each.
+
+    Only one chunk is held in memory at a time.
+
+    Returns:
+        tuple: (imported_count: int, errors: list of str)
+    """
+    imported_count = 0
+    errors = []
+    processed = 0
+
+    for chunk in chunks:
+        created_tables = set()
+        with transaction() as conn:
+            chunk_imported, chunk_errors = import_matrix_rows(conn.cursor(), chunk, origin_name, created_tables)
+        # Only after the commit, so no session caches a snapshot without the new names
+        if created_tables:
+            invalidate_dimensions(*created_tables)
+
+        imported_count += chunk_imported
+        errors.extend(chunk_errors)
+        processed += len(chunk)
+        if progress_callback:
+            progress_callback(processed, total_rows)
+
+    return imported_count, errors
+
+
+def import_excel_to_database(uploaded_file, origin_name="Excel Import", progress_callback=None,
+                             batch_size=IMPORT_BATCH_SIZE):
     """
     Import Excel file data into the database.
     Only validates: origin, prioridades, fuentes, modalidades, gerencias (auto-creates if missing).
     All other fields (subgerencias, areas, desafios, audiencias) are auto-created if missing.
-    
+
+    .xlsx files are streamed with openpyxl's read-only reader: the header is
+    validated first, then rows are imported and committed in batches of
+    batch_size, so memory stays bounded for very large uploads. Legacy .xls
+    files are read with pandas. Rows with errors are skipped and reported.
+
     Args:
         uploaded_file: Streamlit UploadedFile object (Excel file)
         origin_name: Name to use for the origin if not provided (default: "Excel Import")
-        
+        progress_callback: Optional callable(processed_rows, total_rows) called after each batch
+        batch_size: Number of rows per transaction
+
     Returns:
         tuple: (success: bool, message: str, imported_count: int)
     """
     try:
-        # Read Excel file
-        df = pd.read_excel(uploaded_file)
-        
-        # Validate columns
-        is_valid, validation_message, missing_columns = validate_excel_columns(df)
-        if not is_valid:
-            return False, validation_message, 0
-        
-        # Import rows
-        imported_count = 0
-        errors = []
-        
-        for idx, row in df.iterrows():
-            try:
-                # Get values from row (handle missing columns gracefully)
-                origen_name = str(row.get("Origen", "")).strip() if pd.notna(row.get("Origen")) else None
-                gerencia_name = str(row.get("Gerencia", "")).strip() if pd.notna(row.get("Gerencia")) else ""
-                subgerencia_name = str(row.get("Subgerencia", "")).strip() if pd.notna(row.get("Subgerencia")) else None
-                area_name = str(row.get("Área", "")).strip() if pd.notna(row.get("Área")) else None
-                desafio_name = str(row.get("Desafío Estratégico", "")).strip() if pd.notna(row.get("Desafío Estratégico")) else ""
-                actividad_formativa = str(row.get("Actividad Formativa", "")).strip() if pd.notna(row.get("Actividad Formativa")) else ""
-                objetivo_desempeno = str(row.get("Objetivo Desempeño", "")).strip() if pd.notna(row.get("Objetivo Desempeño")) else ""
-                contenidos = str(row.get("Contenidos", "")).strip() if pd.notna(row.get("Contenidos")) else ""
-                skills = str(row.get("Skills", "")).strip() if pd.notna(row.get("Skills")) else None
-                keywords = str(row.get("Keywords", "")).strip() if pd.notna(row.get("Keywords")) else None
-                audiencia_name = str(row.get("Audiencia", "")).strip() if pd.notna(row.get("Audiencia")) else ""
-                modalidad_name = str(row.get("Modalidad", "")).strip() if pd.notna(row.get("Modalidad")) else ""
-                fuente_name = str(row.get("Fuente", "")).strip() if pd.notna(row.get("Fuente")) else ""
-                fuente_interna = str(row.get("Fuente Interna", "")).strip() if pd.notna(row.get("Fuente Interna")) else None
-                prioridad_name = str(row.get("Prioridad", "")).strip() if pd.notna(row.get("Prioridad")) else ""
-                
-                # Validate required text fields
-                if not actividad_formativa:
-                    errors.append(f"Fila {idx + 2}: Actividad Formativa está vacía")
-                    continue
-                if not objetivo_desempeno:
-                    errors.append(f"Fila {idx + 2}: Objetivo Desempeño está vacío")
-                    continue
-                if not contenidos:
-                    errors.append(f"Fila {idx + 2}: Contenidos está vacío")
-                    continue
-                
-                # Validate and auto-create IDs for validated fields (origin, prioridades, fuentes, modalidades, gerencias)
-                if not gerencia_name:
-                    errors.append(f"Fila {idx + 2}: Gerencia está vacía")
-                    continue
-                gerencia_id = get_or_create_id("gerencias", gerencia_name)
-                
-                if not modalidad_name:
-                    errors.append(f"Fila {idx + 2}: Modalidad está vacía")
-                    continue
-                modalidad_id = get_or_create_id("modalidades", modalidad_name)
-                
-                if not fuente_name:
-                    errors.append(f"Fila {idx + 2}: Fuente está vacía")
-                    continue
-                fuente_id = get_or_create_id("fuentes", fuente_name)
-                
-                if not prioridad_name:
-                    errors.append(f"Fila {idx + 2}: Prioridad está vacía")
-                    continue
-                prioridad_id = get_or_create_id("prioridades", prioridad_name)
-                
-                # Use provided origin or default
-                final_origin = origen_name if origen_name else origin_name
-                origen_id = get_or_create_id("origin", final_origin)
-                
-                # Auto-create IDs for non-validated fields (subgerencias, areas, desafios, audiencias)
-                subgerencia_id = get_or_create_id("subgerencias", subgerencia_name) if subgerencia_name else None
-                area_id = get_or_create_id("areas", area_name) if area_name else None
-                desafio_id = get_or_create_id("desafios", desafio_name) if desafio_name else None
-                audiencia_id = get_or_create_id("audiencias", audiencia_name) if audiencia_name else None
-                
-                # Prepare data for insertion
-                data = {
-                    "Actividad formativa": actividad_formativa,
-                    "Objetivo de desempeño": objetivo_desempeno,
-                    "Contenidos específicos": contenidos,
-                    "Skills": skills if skills else None,
-                    "Keywords": keywords if keywords else None
-                }
-                
-                # Insert row
-                insert_row_into_matrix(
-                    data=data,
-                    origin=final_origin,
-                    gerencia_id=gerencia_id,
-                    subgerencia_id=subgerencia_id,
-                    area_id=area_id,
-                    desafio_id=desafio_id,
-                    modalidad_id=modalidad_id,
-                    audiencia_id=audiencia_id,
-                    fuente_id=fuente_id,
-                    fuente_interna=fuente_interna if fuente_interna else None,
-                    prioridad_id=prioridad_id
-                )
-                
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Fila {idx + 2}: Error al importar - {str(e)}")
-                continue
-        
-        # Build result message
-        if errors:
-            error_msg = f"❌ Se encontraron {len(errors)} error(es) durante la importación:\n\n"
-            for i, error in enumerate(errors, 1):
-                error_msg += f"{i}. {error}\n"
-            if imported_count > 0:
-                error_msg += f"\n✅ Se importaron {imported_count} fila(s) correctamente antes de encontrar los errores."
-            else:
-                error_msg += f"\n⚠️ No se importó ninguna fila debido a los errores encontrados."
-            return False, error_msg, imported_count
-        else:
-            message = f"✅ Se importaron {imported_count} fila(s) correctamente."
-            return True, message, imported_count
-            
-    except Exception as e:
-        return False, f"Error al procesar el archivo Excel: {str(e)}", 0
+        with open_import_chunks(uploaded_file, batch_size) as (header, chunks, total_rows):
+            # Validate columns
+            is_valid, validation_message, missing_columns = validate_excel_columns(header)
+            if not is_valid:
+                return False, validation_message, 0
 
+            imported_count, errors = import_chunks(chunks, origin_name, progress_callback, total_rows)
+        return build_import_result(imported_count, errors)
 
-def fetch_matrix():
-    query = """
-    SELECT
-        fm.id,
-        o.name AS "Origen",
-        CASE WHEN vm.validated = 1 THEN '✅ Validado' ELSE '❌ Pendiente' END AS "Validación",
-        g.name AS "Gerencia",
-        sg.name AS "Subgerencia",
-        a.name AS "Área",
-        d.name AS "Desafío Estratégico",
-        fm.actividad_formativa AS "Actividad Formativa",
-        fm.objetivo_desempeno AS "Objetivo Desempeño",
-        fm.contenidos_especificos AS "Contenidos",
-        fm.skills AS "Skills",
-        fm.keywords AS "Keywords",
-        au.name AS "Audiencia",
-        m.name AS "Modalidad",
-        f.name AS "Fuente",
-        fm.fuente_interna AS "Fuente Interna",
-        p.name AS "Prioridad",
-        fm.created_at AS "Fecha Creación",
-        GROUP_CONCAT(lc.linkedin_course, ', ') AS "Curso Sugerido LinkedIn"
-    FROM final_matrix fm
-    LEFT JOIN origin o ON fm.origin_id = o.id
-    LEFT JOIN gerencias g ON fm.gerencia_id = g.id
-    LEFT JOIN subgerencias sg ON fm.subgerencia_id = sg.id
-    LEFT JOIN areas a ON fm.area_id = a.id
-    LEFT JOIN desafios d ON fm.desafio_id = d.id
-    LEFT JOIN audiencias au ON fm.audiencia_id = au.id
-    LEFT JOIN modalidades m ON fm.modalidad_id = m.id
-    LEFT JOIN fuentes f ON fm.fuente_id = f.id
-    LEFT JOIN prioridades p ON fm.prioridad_id = p.id
-    LEFT JOIN matrix_linkedin_courses mlc ON mlc.matrix_id = fm.id
-    LEFT JOIN validated_matrix vm ON vm.matrix_id = fm.id
-    LEFT JOIN linkedin_courses lc ON lc.id = mlc.course_id
-    GROUP BY fm.id
-    ORDER BY g.name;
-    """
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    except Exception as e:
+        return False, f"Error al procesar el archivo Excel: {str(e)}", 0
 
 
 def update_final_matrix(gerencia_id, subgerencia_id, area_id, desafio_id, actividad, objetivo, contenidos, skills, keywords, modalidad_id, fuente_id, fuente_interna, audiencia_id, prioridad_id, matrix_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE final_matrix
-        SET gerencia_id = ?,
-            subgerencia_id = ?,
-            area_id = ?,
-            desafio_id = ?,
-            actividad_formativa = ?,
-            objetivo_desempeno = ?,
-            contenidos_especificos = ?,
-            skills = ?,
-            keywords = ?,
-            modalidad_id = ?,
-            fuente_id = ?,
-            fuente_interna = ?,
-            audiencia_id = ?,
-            prioridad_id = ?,
-            last_updated = CURRENT_TIMESTAMP
-        WHERE id = ?
-        """,
-        (
-            gerencia_id,
-            subgerencia_id,
-            area_id,
-            desafio_id,
-            actividad,
-            objetivo,
-            contenidos,
-            skills,
-            keywords,
-            modalidad_id,
-            fuente_id,
-            fuente_interna,
-            audiencia_id,
-            prioridad_id,
-            matrix_id
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE final_matrix
+            SET gerencia_id = ?,
+                subgerencia_id = ?,
+                area_id = ?,
+                desafio_id = ?,
+                actividad_formativa = ?,
+                objetivo_desempeno = ?,
+                contenidos_especificos = ?,
+                skills = ?,
+                keywords = ?,
+                modalidad_id = ?,
+                fuente_id = ?,
+                fuente_interna = ?,
+                audiencia_id = ?,
+                prioridad_id = ?,
+                last_updated = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (
+                gerencia_id,
+                subgerencia_id,
+                area_id,
+                desafio_id,
+                actividad,
+                objetivo,
+                contenidos,
+                skills,
+                keywords,
+                modalidad_id,
+                fuente_id,
+                fuente_interna,
+                audiencia_id,
+                prioridad_id,
+                matrix_id
+            )
         )
-    )
-    conn.commit()
-    conn.close()
 
 
 def update_matrix_linkedin_courses(matrix_id, linkedin_course_name):
     """Update LinkedIn courses for a specific matrix row"""
-    conn = get_connection()
-    cur = conn.cursor()
+    with transaction() as conn:
+        cur = conn.cursor()
 
-    # First, remove existing LinkedIn course relationships for this matrix row
-    cur.execute("DELETE FROM matrix_linkedin_courses WHERE matrix_id = ?", (matrix_id,))
+        # First, remove existing LinkedIn course relationships for this matrix row
+        cur.execute("DELETE FROM matrix_linkedin_courses WHERE matrix_id = ?", (matrix_id,))
 
-    # If a LinkedIn course is specified, add the relationship
-    if linkedin_course_name and linkedin_course_name.strip():
-        # Find the LinkedIn course ID by name
-        cur.execute("SELECT id FROM linkedin_courses WHERE linkedin_course = ?", (linkedin_course_name.strip(),))
-        course_row = cur.fetchone()
+        # If a LinkedIn course is specified, add the relationship
+        if linkedin_course_name and linkedin_course_name.strip():
+            # Find the LinkedIn course ID by name
+            cur.execute("SELECT id FROM linkedin_courses WHERE linkedin_course = ?", (linkedin_course_name.strip(),))
+            course_row = cur.fetchone()
 
-        if course_row:
-            course_id = course_row[0]
-            cur.execute(
-                "INSERT INTO matrix_linkedin_courses (matrix_id, course_id) VALUES (?, ?)",
-                (matrix_id, course_id)
-            )
+            if course_row:
+                course_id = course_row[0]
+                cur.execute(
+                    "INSERT INTO matrix_linkedin_courses (matrix_id, course_id) VALUES (?, ?)",
+                    (matrix_id, course_id)
+                )
 
-    conn.commit()
-    conn.close()
 
 
 def validate_matrix_entry(matrix_id, validated_by=None, validation_notes=None):
@@ -805,194 +1092,166 @@ def delete_matrix_entry(matrix_id):
 
 
 def fetch_all(table):
-    """Fetch all rows from a table as a dict {'name': id}"""
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    if table == "linkedin_courses":
-        cur.execute(f"SELECT id, linkedin_course AS name FROM linkedin_courses")
-    else:
-        cur.execute(f"SELECT * FROM {table}")
-    rows = cur.fetchall()
-    conn.close()
-    return {name: id for id, name in rows}
+    """Fetch all rows from a table as a read-only mapping {'name': id} (served from the dimension cache)"""
+    return get_dimension(table).by_name
 
 
 def update_respondents(name, email):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO respondents (nombre, email) 
-        VALUES (?, ?)
-        """,
-        (
-            name, 
-            email
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO respondents (nombre, email) 
+            VALUES (?, ?)
+            """,
+            (
+                name, 
+                email
+            )
         )
-    )
-    conn.commit()
-    conn.close()
     return cur.lastrowid
 
 
 def update_raw_data_forms(submission_id, origin, gerencia_id, subgerencia_id, area_id, desafio_id, cambios, que_falta, aprendizajes, audiencia_id, modalidad_id, fuente_id, fuente_interna, prioridad_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM origin WHERE name = ?", (origin,))
-    origin_id = cur.fetchone()[0]
-    cur.execute(
-        """
-        INSERT INTO raw_data_forms (submission_id, origin_id, gerencia_id, subgerencia_id, area_id, desafio_id, cambios, que_falta, aprendizajes, audiencia_id, modalidad_id, fuente_id, fuente_interna, prioridad_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            submission_id,
-            origin_id,
-            gerencia_id,
-            subgerencia_id,
-            area_id,
-            desafio_id,
-            cambios,
-            que_falta,
-            aprendizajes,
-            audiencia_id,
-            modalidad_id,
-            fuente_id,
-            fuente_interna,
-            prioridad_id
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM origin WHERE name = ?", (origin,))
+        origin_id = cur.fetchone()[0]
+        cur.execute(
+            """
+            INSERT INTO raw_data_forms (submission_id, origin_id, gerencia_id, subgerencia_id, area_id, desafio_id, cambios, que_falta, aprendizajes, audiencia_id, modalidad_id, fuente_id, fuente_interna, prioridad_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                submission_id,
+                origin_id,
+                gerencia_id,
+                subgerencia_id,
+                area_id,
+                desafio_id,
+                cambios,
+                que_falta,
+                aprendizajes,
+                audiencia_id,
+                modalidad_id,
+                fuente_id,
+                fuente_interna,
+                prioridad_id
+            )
         )
-    )
-    conn.commit()
-    conn.close()
 
 
 def insert_row_into_matrix(data, origin, gerencia_id, subgerencia_id, area_id, desafio_id, modalidad_id, audiencia_id, fuente_id, fuente_interna, prioridad_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM origin WHERE name = ?", (origin,))
-    origin_id = cur.fetchone()[0]
-    cur.execute(
-        """
-        INSERT INTO final_matrix (
-            origin_id,
-            gerencia_id,
-            subgerencia_id,
-            area_id,
-            desafio_id,
-            actividad_formativa,
-            objetivo_desempeno,
-            contenidos_especificos,
-            skills,
-            keywords,
-            modalidad_id,
-            fuente_id,
-            fuente_interna,
-            audiencia_id,
-            prioridad_id
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            origin_id,
-            gerencia_id, 
-            subgerencia_id, 
-            area_id, 
-            desafio_id, 
-            data.get("Actividad formativa"),
-            data.get("Objetivo de desempeño"),
-            data.get("Contenidos específicos"),
-            data.get("Skills"),
-            data.get("Keywords"),
-            modalidad_id,
-            fuente_id,
-            fuente_interna,
-            audiencia_id, 
-            prioridad_id
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM origin WHERE name = ?", (origin,))
+        origin_id = cur.fetchone()[0]
+        cur.execute(
+            """
+            INSERT INTO final_matrix (
+                origin_id,
+                gerencia_id,
+                subgerencia_id,
+                area_id,
+                desafio_id,
+                actividad_formativa,
+                objetivo_desempeno,
+                contenidos_especificos,
+                skills,
+                keywords,
+                modalidad_id,
+                fuente_id,
+                fuente_interna,
+                audiencia_id,
+                prioridad_id
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                origin_id,
+                gerencia_id, 
+                subgerencia_id, 
+                area_id, 
+                desafio_id, 
+                data.get("Actividad formativa"),
+                data.get("Objetivo de desempeño"),
+                data.get("Contenidos específicos"),
+                data.get("Skills"),
+                data.get("Keywords"),
+                modalidad_id,
+                fuente_id,
+                fuente_interna,
+                audiencia_id, 
+                prioridad_id
+            )
         )
-    )
-    conn.commit()
-    conn.close()
 
 def get_virtual_courses():
     query = """
     SELECT 
         fm.id AS id,
-        GROUP_CONCAT(lc.linkedin_course, ', ') AS "Estado Curso",
-        g.name AS "Gerencia",
+        fm.linkedin_courses AS "Estado Curso",
+        fm.gerencia AS "Gerencia",
         fm.actividad_formativa AS "Actividad Formativa", 
         fm.objetivo_desempeno AS "Objetivo Desempeño", 
         fm.contenidos_especificos AS "Contenidos", 
         fm.skills AS "Skills", 
         fm.keywords AS "Keywords",
-        au.name AS "Audiencia", 
-        p.name AS "Prioridad"
-    FROM final_matrix fm
-    LEFT JOIN gerencias g ON fm.gerencia_id = g.id
-    LEFT JOIN audiencias au ON fm.audiencia_id = au.id
-    LEFT JOIN modalidades m ON fm.modalidad_id = m.id
-    LEFT JOIN fuentes f ON fm.fuente_id = f.id
-    LEFT JOIN prioridades p ON fm.prioridad_id = p.id
-    LEFT JOIN matrix_linkedin_courses mlc ON mlc.matrix_id = fm.id
-    LEFT JOIN linkedin_courses lc ON lc.id = mlc.course_id
-    WHERE m.name = 'Virtual' AND f.name = 'Externa'
-    GROUP BY fm.id
+        fm.audiencia AS "Audiencia", 
+        fm.prioridad AS "Prioridad"
+    FROM matrix_wide fm
+    WHERE fm.modalidad = 'Virtual' AND fm.fuente = 'Externa'
     ORDER BY fm.actividad_formativa;
     """
     conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in rows]
 
 def add_linkedin_course(selection, matrix_id):
-    conn = get_connection()
-    cur = conn.cursor()
+    with transaction() as conn:
+        cur = conn.cursor()
 
-    # First, remove any existing LinkedIn course associations for this matrix row
-    cur.execute("DELETE FROM matrix_linkedin_courses WHERE matrix_id = ?", (int(matrix_id),))
+        # First, remove any existing LinkedIn course associations for this matrix row
+        cur.execute("DELETE FROM matrix_linkedin_courses WHERE matrix_id = ?", (int(matrix_id),))
 
-    # Insert the LinkedIn course if it doesn't exist
-    cur.execute("""
-        INSERT OR IGNORE INTO linkedin_courses (
-                linkedin_urn,
-                linkedin_course,
-                linkedin_url)
-        VALUES (?, ?, ?)
-    """,
-    (selection['URN'],
-     selection['Title'],
-     selection['URL'])
-    )
-
-    conn.commit()
-
-    # Get the course ID
-    cur.execute("""
-        SELECT id FROM linkedin_courses
-        WHERE linkedin_urn = ? AND linkedin_course = ? AND linkedin_url = ?
-    """,
-    (selection['URN'],
-     selection['Title'],
-     selection['URL']))
-
-    course_id = cur.fetchone()["id"]
-
-    # Insert the association (this will now be the only one for this matrix row)
-    cur.execute("""
-        INSERT INTO matrix_linkedin_courses (
-                matrix_id,
-                course_id)
-        VALUES (?, ?)
-    """,
-    (int(matrix_id),
-     course_id)
-    )
-
-    conn.commit()
-    conn.close()
+        # Insert the LinkedIn course if it doesn't exist
+        cur.execute("""
+            INSERT OR IGNORE INTO linkedin_courses (
+                    linkedin_urn,
+                    linkedin_course,
+                    linkedin_url)
+            VALUES (?, ?, ?)
+        """,
+        (selection['URN'],
+         selection['Title'],
+         selection['URL'])
+        )
+
+        # Get the course ID
+        cur.execute("""
+            SELECT id FROM linkedin_courses
+            WHERE linkedin_urn = ? AND linkedin_course = ? AND linkedin_url = ?
+        """,
+        (selection['URN'],
+         selection['Title'],
+         selection['URL']))
+
+        course_id = cur.fetchone()["id"]
+
+        # Insert the association (this will now be the only one for this matrix row)
+        cur.execute("""
+            INSERT INTO matrix_linkedin_courses (
+                    matrix_id,
+                    course_id)
+            VALUES (?, ?)
+        """,
+        (int(matrix_id),
+         course_id)
+        )
+    invalidate_dimensions("linkedin_courses")
 
 def get_respondents():
     query = """
@@ -1011,11 +1270,10 @@ def get_respondents():
     GROUP BY r.id, r.nombre, r.email, g.name, sg.name, a.name
     """
     conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in rows]
 
 
@@ -1035,11 +1293,10 @@ def get_linkedin_courses():
     ORDER BY lc.linkedin_course
     """
     conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in rows]
 
 
@@ -1090,6 +1347,7 @@ def add_linkedin_course_manual(course_data, selected_activities=None):
                 (int(activity_id), course_id))
 
         conn.commit()
+        invalidate_dimensions("linkedin_courses")
         return {"success": True, "message": f"Course '{course_data['Title']}' added successfully", "course_id": course_id}
 
     except Exception as e:
@@ -1105,24 +1363,20 @@ def get_learning_activities_for_association():
     SELECT
         fm.id,
         fm.actividad_formativa AS "Actividad Formativa",
-        g.name AS "Gerencia",
+        fm.gerencia AS "Gerencia",
         fm.objetivo_desempeno AS "Objetivo Desempeño",
         fm.skills AS "Skills",
         fm.keywords AS "Keywords",
-        au.name AS "Audiencia",
-        p.name AS "Prioridad"
-    FROM final_matrix fm
-    LEFT JOIN gerencias g ON fm.gerencia_id = g.id
-    LEFT JOIN audiencias au ON fm.audiencia_id = au.id
-    LEFT JOIN prioridades p ON fm.prioridad_id = p.id
+        fm.audiencia AS "Audiencia",
+        fm.prioridad AS "Prioridad"
+    FROM matrix_wide fm
     ORDER BY fm.actividad_formativa
     """
     conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in rows]
 
 
@@ -1149,11 +1403,10 @@ def get_raw_data_forms():
     ORDER BY d.created_at DESC
     """
     conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(query)
-    rows = cur.fetchall()
-    conn.close()
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in rows]
 
 
@@ -1180,6 +1433,7 @@ def edit_options(selected_table, old_value, new_value):
         
         if cur.rowcount > 0:
             conn.commit()
+            invalidate_dimensions(selected_table)
             return {"success": True, "message": f"'{old_value}' ha sido cambiado a '{new_value}'"}
         else:
             return {"success": False, "message": f"'{old_value}' no fue encontrado."}
@@ -1215,6 +1469,7 @@ def add_option(selected_table, new_option):
             # Get the ID of the inserted row
             option_id = cur.lastrowid
             conn.commit()
+            invalidate_dimensions(selected_table)
             return {"success": True, "message": f"'{new_option}' fue agregada correctamente.", "id": option_id}
         else:
             # Row was not inserted (already exists)
@@ -1266,6 +1521,7 @@ def delete_option(selected_table, option_to_delete):
             # Safe deletion with parameter binding
             cur.execute(f"DELETE FROM {selected_table} WHERE name = ?", (option_to_delete,))
             conn.commit()
+            invalidate_dimensions(selected_table)
             return {"success": True, "message": f"'{option_to_delete}' fue eliminada correctamente."}
 
     except Exception as e:
@@ -1273,207 +1529,3 @@ def delete_option(selected_table, option_to_delete):
         return {"success": False, "message": f"Error en la base de datos: {str(e)}", "id": None}
     finally:
         conn.close()
-
-
-def get_matrix_metrics(origin_filter=None, gerencia_filter=None, subgerencia_filter=None,
-                     area_filter=None, desafio_filter=None, audiencia_filter=None,
-                     modalidad_filter=None, fuente_filter=None, prioridad_filter=None,
-                     asociaciones_filter=None, validacion_filter=None):
-    """Get summary metrics, optionally filtered by various criteria"""
-    conn = get_connection()
-
-    try:
-        # Build WHERE conditions for final_matrix table
-        where_conditions = []
-        params = []
-
-        # Origin filter
-        if origin_filter and origin_filter != "Todos":
-            origin_id_query = "SELECT id FROM origin WHERE name = ?"
-            origin_id = conn.execute(origin_id_query, (origin_filter,)).fetchone()
-            if origin_id:
-                where_conditions.append("fm.origin_id = ?")
-                params.append(origin_id[0])
-            else:
-                return {"activities": 0, "linkedin": 0, "validated": 0}
-
-        # Gerencia filter
-        if gerencia_filter:
-            gerencia_ids = []
-            for gerencia in gerencia_filter:
-                gerencia_id_query = "SELECT id FROM gerencias WHERE name = ?"
-                gerencia_id = conn.execute(gerencia_id_query, (gerencia,)).fetchone()
-                if gerencia_id:
-                    gerencia_ids.append(str(gerencia_id[0]))
-            if gerencia_ids:
-                where_conditions.append(f"fm.gerencia_id IN ({', '.join(gerencia_ids)})")
-
-        # Subgerencia filter
-        if subgerencia_filter:
-            subgerencia_ids = []
-            for subgerencia in subgerencia_filter:
-                subgerencia_id_query = "SELECT id FROM subgerencias WHERE name = ?"
-                subgerencia_id = conn.execute(subgerencia_id_query, (subgerencia,)).fetchone()
-                if subgerencia_id:
-                    subgerencia_ids.append(str(subgerencia_id[0]))
-            if subgerencia_ids:
-                where_conditions.append(f"fm.subgerencia_id IN ({', '.join(subgerencia_ids)})")
-
-        # Área filter
-        if area_filter:
-            area_ids = []
-            for area in area_filter:
-                area_id_query = "SELECT id FROM areas WHERE name = ?"
-                area_id = conn.execute(area_id_query, (area,)).fetchone()
-                if area_id:
-                    area_ids.append(str(area_id[0]))
-            if area_ids:
-                where_conditions.append(f"fm.area_id IN ({', '.join(area_ids)})")
-
-        # Desafío filter
-        if desafio_filter:
-            desafio_ids = []
-            for desafio in desafio_filter:
-                desafio_id_query = "SELECT id FROM desafios WHERE name = ?"
-                desafio_id = conn.execute(desafio_id_query, (desafio,)).fetchone()
-                if desafio_id:
-                    desafio_ids.append(str(desafio_id[0]))
-            if desafio_ids:
-                where_conditions.append(f"fm.desafio_id IN ({', '.join(desafio_ids)})")
-
-        # Audiencia filter
-        if audiencia_filter:
-            audiencia_ids = []
-            for audiencia in audiencia_filter:
-                audiencia_id_query = "SELECT id FROM audiencias WHERE name = ?"
-                audiencia_id = conn.execute(audiencia_id_query, (audiencia,)).fetchone()
-                if audiencia_id:
-                    audiencia_ids.append(str(audiencia_id[0]))
-            if audiencia_ids:
-                where_conditions.append(f"fm.audiencia_id IN ({', '.join(audiencia_ids)})")
-
-        # Modalidad filter
-        if modalidad_filter:
-            modalidad_ids = []
-            for modalidad in modalidad_filter:
-                modalidad_id_query = "SELECT id FROM modalidades WHERE name = ?"
-                modalidad_id = conn.execute(modalidad_id_query, (modalidad,)).fetchone()
-                if modalidad_id:
-                    modalidad_ids.append(str(modalidad_id[0]))
-            if modalidad_ids:
-                where_conditions.append(f"fm.modalidad_id IN ({', '.join(modalidad_ids)})")
-
-        # Fuente filter
-        if fuente_filter:
-            fuente_ids = []
-            for fuente in fuente_filter:
-                fuente_id_query = "SELECT id FROM fuentes WHERE name = ?"
-                fuente_id = conn.execute(fuente_id_query, (fuente,)).fetchone()
-                if fuente_id:
-                    fuente_ids.append(str(fuente_id[0]))
-            if fuente_ids:
-                where_conditions.append(f"fm.fuente_id IN ({', '.join(fuente_ids)})")
-
-        # Prioridad filter
-        if prioridad_filter:
-            prioridad_ids = []
-            for prioridad in prioridad_filter:
-                prioridad_id_query = "SELECT id FROM prioridades WHERE name = ?"
-                prioridad_id = conn.execute(prioridad_id_query, (prioridad,)).fetchone()
-                if prioridad_id:
-                    prioridad_ids.append(str(prioridad_id[0]))
-            if prioridad_ids:
-                where_conditions.append(f"fm.prioridad_id IN ({', '.join(prioridad_ids)})")
-
-        # Build WHERE clause
-        where_clause = " AND ".join(where_conditions) if where_conditions else ""
-
-        # Build activities query with asociaciones filter (LinkedIn courses only - update when other sources are added)
-        activities_where = where_clause
-        if asociaciones_filter:
-            if "Con cursos asociados" in asociaciones_filter and "Sin cursos asociados" in asociaciones_filter:
-                # Both selected - no additional filter
-                pass
-            elif "Con cursos asociados" in asociaciones_filter:
-                # Only activities with LinkedIn courses
-                if activities_where:
-                    activities_where = f"{activities_where} AND fm.id IN (SELECT DISTINCT mlc.matrix_id FROM matrix_linkedin_courses mlc)"
-                else:
-                    activities_where = "fm.id IN (SELECT DISTINCT mlc.matrix_id FROM matrix_linkedin_courses mlc)"
-            elif "Sin cursos asociados" in asociaciones_filter:
-                # Only activities without LinkedIn courses
-                if activities_where:
-                    activities_where = f"{activities_where} AND fm.id NOT IN (SELECT DISTINCT mlc.matrix_id FROM matrix_linkedin_courses mlc)"
-                else:
-                    activities_where = "fm.id NOT IN (SELECT DISTINCT mlc.matrix_id FROM matrix_linkedin_courses mlc)"
-
-        # Validación filter
-        if validacion_filter:
-            if "✅ Validado" in validacion_filter and "❌ Pendiente" in validacion_filter:
-                # Both selected - no additional filter
-                pass
-            elif "✅ Validado" in validacion_filter:
-                # Only validated activities
-                if activities_where:
-                    activities_where = f"{activities_where} AND fm.id IN (SELECT vm.matrix_id FROM validated_matrix vm WHERE vm.validated = 1)"
-                else:
-                    activities_where = "fm.id IN (SELECT vm.matrix_id FROM validated_matrix vm WHERE vm.validated = 1)"
-            elif "❌ Pendiente" in validacion_filter:
-                # Only unvalidated activities (not in validated_matrix)
-                if activities_where:
-                    activities_where = f"{activities_where} AND fm.id NOT IN (SELECT vm.matrix_id FROM validated_matrix vm)"
-                else:
-                    activities_where = "fm.id NOT IN (SELECT vm.matrix_id FROM validated_matrix vm)"
-
-        if activities_where:
-            activities_query = f"SELECT COUNT(*) FROM final_matrix fm WHERE {activities_where}"
-        else:
-            activities_query = "SELECT COUNT(*) FROM final_matrix"
-
-        # Build LinkedIn courses query - count courses associated with filtered activities
-        linkedin_where = where_clause
-
-        if linkedin_where:
-            linkedin_query = f"""
-                SELECT COUNT(DISTINCT lc.id)
-                FROM linkedin_courses lc
-                INNER JOIN matrix_linkedin_courses mlc ON lc.id = mlc.course_id
-                INNER JOIN final_matrix fm ON mlc.matrix_id = fm.id
-                WHERE {linkedin_where}
-            """
-        else:
-            linkedin_query = """
-                SELECT COUNT(DISTINCT lc.id)
-                FROM linkedin_courses lc
-                INNER JOIN matrix_linkedin_courses mlc ON lc.id = mlc.course_id
-            """
-
-        # Build validated activities query
-        validated_where = where_clause
-        if validated_where:
-            validated_query = f"""
-                SELECT COUNT(*)
-                FROM final_matrix fm
-                INNER JOIN validated_matrix vm ON fm.id = vm.matrix_id AND vm.validated = 1
-                WHERE {validated_where}
-            """
-        else:
-            validated_query = """
-                SELECT COUNT(*)
-                FROM final_matrix fm
-                INNER JOIN validated_matrix vm ON fm.id = vm.matrix_id AND vm.validated = 1
-            """
-
-        # Execute queries
-        activities = conn.execute(activities_query, params).fetchone()[0] if params else conn.execute(activities_query).fetchone()[0]
-        linkedin = conn.execute(linkedin_query, params).fetchone()[0] if params and linkedin_where else conn.execute(linkedin_query).fetchone()[0]
-        validated = conn.execute(validated_query, params).fetchone()[0] if params and validated_where else conn.execute(validated_query).fetchone()[0]
-
-        return {
-            "activities": activities,
-            "linkedin": linkedin,
-            "validated": validated
-        }
-
-    finally:
-        conn.close()
@@ -0,0 +1,96 @@
+import threading
+from types import MappingProxyType
+from src.data.connection import get_connection
+
+
+class Dimension:
+    """
+    Read-only snapshot of a lookup table.
+
+    Holds name -> id and id -> name maps plus precomputed selectbox options
+    and positions, so forms can render and resolve selections without
+    rebuilding lists or scanning them on every rerun.
+    """
+
+    def __init__(self, rows):
+        self.by_name = MappingProxyType({name: id for id, name in rows})
+        self.by_id = MappingProxyType({id: name for id, name in rows})
+
+        # Selectbox data in table order
+        self.options = tuple((id, name) for id, name in rows)
+        self.names = tuple(self.by_name)
+        self.position_by_id = MappingProxyType({id: i for i, (id, _) in enumerate(rows)})
+        self.position_by_name = MappingProxyType({name: i for i, name in enumerate(self.names)})
+        self._prefixed = {}
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def options_with(self, *placeholders):
+        """(id, name) options preceded by placeholder entries, built once per placeholder set."""
+        key = ("options", placeholders)
+        if key not in self._prefixed:
+            self._prefixed[key] = placeholders + self.options
+        return self._prefixed[key]
+
+    def names_with(self, *placeholders):
+        """Names preceded by placeholder entries, built once per placeholder set."""
+        key = ("names", placeholders)
+        if key not in self._prefixed:
+            self._prefixed[key] = placeholders + self.names
+        return self._prefixed[key]
+
+    def id_index(self, id, offset=0):
+        """Selectbox index of an id in options_with() (0 if it is not in the table)."""
+        position = self.position_by_id.get(id)
+        return 0 if position is None else offset + position
+
+    def name_index(self, name, offset=0):
+        """Selectbox index of a name in names_with() (0 if it is not in the table)."""
+        position = self.position_by_name.get(name)
+        return 0 if position is None else offset + position
+
+
+# Process-wide cache shared by every session: {table: Dimension}
+_dimensions = {}
+_lock = threading.Lock()
+_generation = 0
+
+
+def _load_dimension(table):
+    conn = get_connection()
+    try:
+        if table == "linkedin_courses":
+            rows = conn.execute("SELECT id, linkedin_course AS name FROM linkedin_courses ORDER BY id").fetchall()
+        else:
+            rows = conn.execute(f"SELECT id, name FROM {table} ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    return Dimension([(row[0], row[1]) for row in rows])
+
+
+def get_dimension(table):
+    """Return the cached Dimension for a lookup table, loading it on first use."""
+    dimension = _dimensions.get(table)
+    if dimension is not None:
+        return dimension
+
+    generation = _generation
+    dimension = _load_dimension(table)
+    with _lock:
+        # Don't store a snapshot that an invalidation raced with
+        if generation == _generation:
+            _dimensions[table] = dimension
+    return dimension
+
+
+def invalidate_dimensions(*tables):
+    """Drop cached lookups for the given tables (all tables when none are given)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        if tables:
+            for table in tables:
+                _dimensions.pop(table, None)
+        else:
+            _dimensions.clear()
@@ -0,0 +1,129 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from src.data.connection import apply_pragmas
+
+# LinkedIn search responses live in their own file, so cached API data is not
+# shipped with database.db downloads and cache writes don't bump the app
+# database's data version (which would flush the read result cache).
+CACHE_PATH = "linkedin_cache.db"
+
+# How long a cached search is served before LinkedIn is queried again
+CACHE_TTL = 24 * 3600              # seconds
+
+# Searches kept; the least recently used ones are evicted beyond this
+CACHE_MAX_ENTRIES = 500
+
+CACHE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # ms
+}
+
+CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS search_cache (
+        query_key TEXT PRIMARY KEY,
+        courses TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        last_used_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache(last_used_at)",
+]
+
+# One long-lived connection per cache file, shared by every session. The lock
+# serializes its transactions, which are single-row reads and writes.
+_connections = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def _transaction(path):
+    """Run a block in a transaction on the shared connection to a cache file."""
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            try:
+                apply_pragmas(conn, CACHE_PRAGMAS)
+                with conn:
+                    for statement in CACHE_SCHEMA:
+                        conn.execute(statement)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            _connections[path] = conn
+        with conn:
+            yield conn
+
+
+def make_query_key(keywords, asset_type, count_per_page, results_spanish, level, options_level):
+    """
+    Cache key of a search: the normalized query tuple as JSON.
+
+    Keywords are compared case-insensitively with whitespace collapsed, since
+    LinkedIn matches them the same way.
+    """
+    normalized = " ".join(str(keywords or "").casefold().split())
+    return json.dumps(
+        [normalized, asset_type, count_per_page, bool(results_spanish), level, [list(option) for option in options_level]],
+        ensure_ascii=False,
+    )
+
+
+def get_cached_search(query_key, ttl=CACHE_TTL, path=CACHE_PATH):
+    """
+    Cached (courses, total) of a search, or None when it is missing or older
+    than ttl. A hit marks the entry as recently used.
+    """
+    now = time.time()
+    try:
+        with _transaction(path) as conn:
+            row = conn.execute(
+                "SELECT courses, total FROM search_cache WHERE query_key = ? AND fetched_at > ?",
+                (query_key, now - ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE search_cache SET last_used_at = ? WHERE query_key = ?", (now, query_key))
+        return json.loads(row[0]), row[1]
+    except (sqlite3.Error, ValueError):
+        # The cache is optional; fall back to LinkedIn
+        return None
+
+
+def store_search(query_key, courses, total, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, path=CACHE_PATH):
+    """Save a search result, then drop expired and least recently used entries."""
+    now = time.time()
+    try:
+        with _transaction(path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO search_cache (query_key, courses, total, fetched_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (query_key, json.dumps(courses, ensure_ascii=False), total, now, now),
+            )
+            conn.execute("DELETE FROM search_cache WHERE fetched_at <= ?", (now - ttl,))
+            conn.execute(
+                """
+                DELETE FROM search_cache WHERE query_key IN (
+                    SELECT query_key FROM search_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (max_entries,),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def clear_search_cache(path=CACHE_PATH):
+    """Drop every cached search."""
+    with _transaction(path) as conn:
+        conn.execute("DELETE FROM search_cache")
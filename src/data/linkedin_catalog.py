@@ -0,0 +1,136 @@
+import re
+import time
+from src.data.connection import get_connection, transaction
+
+# Synced asset types/locales older than this are searched on the API again
+CATALOG_MAX_AGE = 7 * 24 * 3600    # seconds
+
+# Title matches weigh more than description matches when ranking results
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+CATALOG_UPSERT = """
+INSERT INTO linkedin_catalog (
+    urn, asset_type, language, title, description, level,
+    duration_seconds, url, retired, last_modified_at, synced_at
+)
+VALUES (
+    :urn, :asset_type, :language, :title, :description, :level,
+    :duration_seconds, :url, :retired, :last_modified_at, :synced_at
+)
+ON CONFLICT (urn) DO UPDATE SET
+    asset_type = excluded.asset_type,
+    language = excluded.language,
+    title = excluded.title,
+    description = excluded.description,
+    level = excluded.level,
+    duration_seconds = excluded.duration_seconds,
+    url = excluded.url,
+    retired = excluded.retired,
+    last_modified_at = excluded.last_modified_at,
+    synced_at = excluded.synced_at
+"""
+
+CATALOG_COURSE_SELECT = """
+SELECT c.urn, c.title, c.description, c.level, c.duration_seconds, c.url
+FROM linkedin_catalog c
+"""
+
+
+def get_sync_state(asset_type, language):
+    """Delta watermark (LinkedIn epoch ms) of an asset type and locale, or None if never synced"""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT last_modified_after FROM linkedin_catalog_sync WHERE asset_type = ? AND language = ?",
+            (asset_type, language),
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def save_catalog_sync(asset_type, language, assets, watermark, full=False):
+    """
+    Store one sync of an asset type and locale in a single transaction:
+    upsert the fetched assets, drop the ones a full sync no longer returned,
+    and move the delta watermark.
+    """
+    synced_at = int(time.time())
+    with transaction() as conn:
+        conn.executemany(CATALOG_UPSERT, [{**asset, "synced_at": synced_at} for asset in assets])
+        # An empty listing is more likely an API hiccup than an empty catalog
+        if full and assets:
+            conn.execute(
+                "DELETE FROM linkedin_catalog WHERE asset_type = ? AND language = ? AND synced_at < ?",
+                (asset_type, language, synced_at),
+            )
+        conn.execute("""
+            INSERT INTO linkedin_catalog_sync (asset_type, language, last_modified_after, synced_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (asset_type, language) DO UPDATE SET
+                last_modified_after = excluded.last_modified_after,
+                synced_at = excluded.synced_at
+        """, (asset_type, language, watermark, synced_at))
+
+
+def catalog_covers(asset_type, language, max_age=CATALOG_MAX_AGE):
+    """Whether searches of an asset type in a language can be served from the mirror (synced recently)"""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT synced_at FROM linkedin_catalog_sync WHERE asset_type = ? AND language = ?",
+            (asset_type, language),
+        ).fetchone()
+    finally:
+        conn.close()
+    return row is not None and row[0] >= time.time() - max_age
+
+
+def build_match_query(keywords):
+    """
+    FTS5 query for a Keywords cell: comma/semicolon separated terms are
+    alternatives, the words of one term must all match. Words are quoted so
+    user text never reaches the FTS5 query syntax.
+    """
+    terms = []
+    for term in re.split(r"[,;\n]", str(keywords or "")):
+        words = re.findall(r"\w+", term)
+        if words:
+            terms.append("(" + " ".join(f'"{word}"' for word in words) + ")")
+    return " OR ".join(terms)
+
+
+def search_catalog(keywords, asset_type, language, level=None):
+    """Active mirrored assets matching the keywords, best matches first"""
+    match = build_match_query(keywords)
+    if not match:
+        return []
+
+    conditions = ["linkedin_catalog_fts MATCH ?", "c.asset_type = ?", "c.language = ?", "c.retired = 0"]
+    params = [match, asset_type, language]
+    if level:
+        conditions.append("c.level = ?")
+        params.append(level)
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(f"""
+            {CATALOG_COURSE_SELECT}
+            JOIN linkedin_catalog_fts ON linkedin_catalog_fts.rowid = c.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY bm25(linkedin_catalog_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})
+        """, params).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_catalog_course(urn):
+    """Mirrored asset with this URN, or None"""
+    conn = get_connection()
+    try:
+        row = conn.execute(f"{CATALOG_COURSE_SELECT} WHERE c.urn = ?", (urn,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
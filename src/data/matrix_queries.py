@@ -0,0 +1,310 @@
+from contextlib import contextmanager
+import pandas as pd
+from src.data.connection import get_connection
+from src.data.result_cache import cached_read
+
+# Rows shown per page in the "Ver Matriz" tab
+MATRIX_PAGE_SIZE = 100
+
+# Columns of a matrix row as shown in the app (one row per activity), read
+# from the trigger-maintained matrix_wide table (see migration 5)
+MATRIX_SELECT = """
+SELECT
+    fm.id,
+    fm.origen AS "Origen",
+    CASE WHEN fm.validated = 1 THEN '✅ Validado' ELSE '❌ Pendiente' END AS "Validación",
+    fm.gerencia AS "Gerencia",
+    fm.subgerencia AS "Subgerencia",
+    fm.area AS "Área",
+    fm.desafio AS "Desafío Estratégico",
+    fm.actividad_formativa AS "Actividad Formativa",
+    fm.objetivo_desempeno AS "Objetivo Desempeño",
+    fm.contenidos_especificos AS "Contenidos",
+    fm.skills AS "Skills",
+    fm.keywords AS "Keywords",
+    fm.audiencia AS "Audiencia",
+    fm.modalidad AS "Modalidad",
+    fm.fuente AS "Fuente",
+    fm.fuente_interna AS "Fuente Interna",
+    fm.prioridad AS "Prioridad",
+    fm.created_at AS "Fecha Creación",
+    fm.linkedin_courses AS "Curso Sugerido LinkedIn"
+FROM matrix_wide fm
+"""
+
+# Same columns as MATRIX_SELECT, but lookup ids in place of names and the raw
+# validation flag, so load_matrix_frame() can build categoricals from codes
+MATRIX_FRAME_SELECT = """
+SELECT
+    fm.id,
+    fm.origin_id AS "Origen",
+    fm.validated AS "Validación",
+    fm.gerencia_id AS "Gerencia",
+    fm.subgerencia_id AS "Subgerencia",
+    fm.area_id AS "Área",
+    fm.desafio_id AS "Desafío Estratégico",
+    fm.actividad_formativa AS "Actividad Formativa",
+    fm.objetivo_desempeno AS "Objetivo Desempeño",
+    fm.contenidos_especificos AS "Contenidos",
+    fm.skills AS "Skills",
+    fm.keywords AS "Keywords",
+    fm.audiencia_id AS "Audiencia",
+    fm.modalidad_id AS "Modalidad",
+    fm.fuente_id AS "Fuente",
+    fm.fuente_interna AS "Fuente Interna",
+    fm.prioridad_id AS "Prioridad",
+    fm.created_at AS "Fecha Creación",
+    fm.linkedin_courses AS "Curso Sugerido LinkedIn"
+FROM matrix_wide fm
+"""
+
+# Download layout of the matrix view: the displayed columns plus Asociación,
+# without the hidden id
+MATRIX_EXPORT_SELECT = """
+SELECT
+    fm.origen AS "Origen",
+    CASE WHEN fm.validated = 1 THEN '✅ Validado' ELSE '❌ Pendiente' END AS "Validación",
+    CASE
+        WHEN TRIM(COALESCE(fm.linkedin_courses, '')) <> '' THEN '🌐 ' || fm.linkedin_courses
+        ELSE '❌ Sin curso asociado'
+    END AS "Asociación",
+    fm.gerencia AS "Gerencia",
+    fm.subgerencia AS "Subgerencia",
+    fm.area AS "Área",
+    fm.desafio AS "Desafío Estratégico",
+    fm.actividad_formativa AS "Actividad Formativa",
+    fm.objetivo_desempeno AS "Objetivo Desempeño",
+    fm.contenidos_especificos AS "Contenidos",
+    fm.skills AS "Skills",
+    fm.keywords AS "Keywords",
+    fm.audiencia AS "Audiencia",
+    fm.modalidad AS "Modalidad",
+    fm.fuente AS "Fuente",
+    fm.fuente_interna AS "Fuente Interna",
+    fm.prioridad AS "Prioridad",
+    fm.created_at AS "Fecha Creación",
+    fm.linkedin_courses AS "Curso Sugerido LinkedIn"
+FROM matrix_wide fm
+"""
+
+# Categories of the "Validación" column, in sorted order (code 0 is validated)
+VALIDATION_LABELS = ["✅ Validado", "❌ Pendiente"]
+
+# Multiselect filters on lookup values: filter label -> (final_matrix column, lookup table)
+MATRIX_FILTER_COLUMNS = {
+    "Origen": ("origin_id", "origin"),
+    "Gerencia": ("gerencia_id", "gerencias"),
+    "Subgerencia": ("subgerencia_id", "subgerencias"),
+    "Área": ("area_id", "areas"),
+    "Desafío Estratégico": ("desafio_id", "desafios"),
+    "Audiencia": ("audiencia_id", "audiencias"),
+    "Modalidad": ("modalidad_id", "modalidades"),
+    "Fuente": ("fuente_id", "fuentes"),
+    "Prioridad": ("prioridad_id", "prioridades"),
+}
+
+HAS_COURSE = "fm.course_links > 0"
+IS_VALIDATED = "fm.validated = 1"
+
+# Two-state filters: filter label -> {option: condition}. Selecting both options means no filter.
+MATRIX_STATE_FILTERS = {
+    "Asociaciones": {
+        "Con cursos asociados": HAS_COURSE,
+        "Sin cursos asociados": f"NOT {HAS_COURSE}",
+    },
+    "Validación": {
+        "✅ Validado": IS_VALIDATED,
+        "❌ Pendiente": f"NOT {IS_VALIDATED}",
+    },
+}
+
+# Sort key of the matrix view; fm.id breaks ties so the keyset is unique.
+# Matches the idx_matrix_wide_gerencia_sort expression index.
+MATRIX_SORT_KEY = "COALESCE(fm.gerencia, '')"
+
+
+def build_matrix_filter(filters=None):
+    """
+    Compile the "Ver Matriz" filter dict ({label: [selected values]}) into a
+    parameterized condition on matrix_wide fm.
+
+    Returns:
+        tuple: (where_sql, params)
+    """
+    conditions = []
+    params = []
+
+    for label, (column, table) in MATRIX_FILTER_COLUMNS.items():
+        selected = (filters or {}).get(label)
+        if selected:
+            placeholders = ", ".join("?" * len(selected))
+            conditions.append(f"fm.{column} IN (SELECT id FROM {table} WHERE name IN ({placeholders}))")
+            params.extend(selected)
+
+    for label, options in MATRIX_STATE_FILTERS.items():
+        selected = [option for option in (filters or {}).get(label) or [] if option in options]
+        if len(selected) == 1:
+            conditions.append(options[selected[0]])
+
+    return " AND ".join(conditions) or "1", params
+
+
+@cached_read
+def count_matrix_rows(filters=None):
+    """Number of matrix activities matching the filters"""
+    where_sql, params = build_matrix_filter(filters)
+    conn = get_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM matrix_wide fm WHERE {where_sql}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@cached_read
+def get_matrix_stats(filters=None):
+    """
+    Activities, validated activities and distinct LinkedIn courses of the
+    matrix rows matching the filters, in one query.
+
+    Returns:
+        dict: {"activities", "validated", "linkedin"}
+    """
+    where_sql, params = build_matrix_filter(filters)
+    conn = get_connection()
+    try:
+        activities, validated, linkedin = conn.execute(f"""
+            WITH filtered AS (
+                SELECT fm.id, fm.validated
+                FROM matrix_wide fm
+                WHERE {where_sql}
+            )
+            SELECT
+                (SELECT COUNT(*) FROM filtered),
+                (SELECT COALESCE(SUM(validated), 0) FROM filtered),
+                (
+                    SELECT COUNT(DISTINCT mlc.course_id)
+                    FROM filtered
+                    JOIN matrix_linkedin_courses mlc ON mlc.matrix_id = filtered.id
+                    JOIN linkedin_courses lc ON lc.id = mlc.course_id
+                )
+        """, params).fetchone()
+    finally:
+        conn.close()
+
+    return {"activities": activities, "validated": validated, "linkedin": linkedin}
+
+
+def build_matrix_page_query(filters=None, after=None, page_size=MATRIX_PAGE_SIZE):
+    """
+    SQL and parameters of one keyset page of the matrix view (see
+    fetch_matrix_page). One row more than page_size is requested to tell
+    whether a next page exists.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    where_sql, params = build_matrix_filter(filters)
+    if after is not None:
+        # The plain bound on the sort key lets SQLite seek the sort index; the
+        # row-value comparison alone makes it scan from the first row
+        where_sql += f" AND {MATRIX_SORT_KEY} >= ? AND ({MATRIX_SORT_KEY}, fm.id) > (?, ?)"
+        params = params + [after[0]] + list(after)
+
+    sql = f"""
+        {MATRIX_SELECT}
+        WHERE {where_sql}
+        ORDER BY {MATRIX_SORT_KEY}, fm.id
+        LIMIT ?
+    """
+    return sql, params + [page_size + 1]
+
+
+@cached_read
+def fetch_matrix_page(filters=None, after=None, page_size=MATRIX_PAGE_SIZE):
+    """
+    One page of matrix rows matching the filters, ordered by gerencia.
+
+    Uses keyset pagination: pass the cursor returned for the previous page
+    as `after` to get the next one.
+
+    Returns:
+        tuple: (rows as list of dicts, cursor of the next page or None on the last page)
+    """
+    sql, params = build_matrix_page_query(filters, after, page_size)
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    rows = [dict(row) for row in rows]
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]["Gerencia"] or "", rows[-1]["id"])
+    return rows, next_cursor
+
+
+@contextmanager
+def matrix_export_rows(filters=None):
+    """
+    Open a cursor over the matrix rows matching the filters, in download
+    layout and page order. Yields (columns, rows); rows are plain tuples
+    read lazily from the cursor.
+    """
+    where_sql, params = build_matrix_filter(filters)
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(f"""
+            {MATRIX_EXPORT_SELECT}
+            WHERE {where_sql}
+            ORDER BY {MATRIX_SORT_KEY}, fm.id
+        """, params)
+        yield [column[0] for column in cur.description], cur
+    finally:
+        conn.close()
+
+
+def _lookup_categorical(ids, rows):
+    """Categorical of lookup names whose codes come from an id column (missing or dangling ids -> NaN)"""
+    code_by_id = {id: code for code, (id, _) in enumerate(rows)}
+    codes = ids.map(code_by_id).fillna(-1).astype("int64")
+    return pd.Categorical.from_codes(codes, categories=[name for _, name in rows])
+
+
+@cached_read
+def load_matrix_frame(filters=None):
+    """
+    Matrix rows matching the filters as a DataFrame, in page order.
+
+    Built from the cursor's tuples; lookup and validation columns are
+    Categoricals backed by the ids, so names are stored once per column and
+    .isin()/groupby work on integer codes. Use observed=True when grouping.
+    """
+    where_sql, params = build_matrix_filter(filters)
+    conn = get_connection()
+    try:
+        # Categories sorted by name so categorical ordering matches plain strings
+        lookups = {
+            label: conn.execute(f"SELECT id, name FROM {table} ORDER BY name").fetchall()
+            for label, (_, table) in MATRIX_FILTER_COLUMNS.items()
+        }
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(f"""
+            {MATRIX_FRAME_SELECT}
+            WHERE {where_sql}
+            ORDER BY {MATRIX_SORT_KEY}, fm.id
+        """, params)
+        df = pd.DataFrame.from_records(cur, columns=[column[0] for column in cur.description])
+    finally:
+        conn.close()
+
+    for label, rows in lookups.items():
+        df[label] = _lookup_categorical(df[label], rows)
+    pending = 1 - df["Validación"].fillna(0).astype("int64")
+    df["Validación"] = pd.Categorical.from_codes(pending, categories=VALIDATION_LABELS)
+    return df
@@ -0,0 +1,942 @@
+import sqlite3
+from src.data.connection import DB_PATH, apply_pragmas
+
+# =========================
+# Migration 1 - base schema
+# =========================
+
+BASE_SCHEMA = [
+    # =========================
+    # Selectbox tables
+    # =========================
+
+    # Gerencias
+    """
+    CREATE TABLE IF NOT EXISTS gerencias (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Subgerencias
+    """
+    CREATE TABLE IF NOT EXISTS subgerencias (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Areas
+    """
+    CREATE TABLE IF NOT EXISTS areas (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Desafios
+    """
+    CREATE TABLE IF NOT EXISTS desafios (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Audiencias
+    """
+    CREATE TABLE IF NOT EXISTS audiencias (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Modalidades
+    """
+    CREATE TABLE IF NOT EXISTS modalidades (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Fuentes
+    """
+    CREATE TABLE IF NOT EXISTS fuentes (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # Prioridad
+    """
+    CREATE TABLE IF NOT EXISTS prioridades (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # =========================
+    # Special tables
+    # =========================
+
+    """
+    CREATE TABLE IF NOT EXISTS origin (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+
+    # =========================
+    # Main tables - DNC
+    # =========================
+
+    # User information
+    """
+    CREATE TABLE IF NOT EXISTS respondents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT,
+        email TEXT
+    )
+    """,
+
+    # Raw form submissions
+    """
+    CREATE TABLE IF NOT EXISTS raw_data_forms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        submission_id INTEGER NOT NULL,
+        origin_id INTEGER,
+        gerencia_id INTEGER,
+        subgerencia_id INTEGER,
+        area_id INTEGER,
+        desafio_id INTEGER,
+        cambios TEXT,
+        que_falta TEXT,
+        aprendizajes TEXT,
+        audiencia_id INTEGER,
+        modalidad_id INTEGER,
+        fuente_id INTEGER,
+        fuente_interna TEXT,
+        prioridad_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (submission_id) REFERENCES respondents(id),
+        FOREIGN KEY (origin_id) REFERENCES origin(id),
+        FOREIGN KEY (gerencia_id) REFERENCES gerencias(id),
+        FOREIGN KEY (subgerencia_id) REFERENCES subgerencias(id),
+        FOREIGN KEY (area_id) REFERENCES areas(id),
+        FOREIGN KEY (desafio_id) REFERENCES desafios(id),
+        FOREIGN KEY (audiencia_id) REFERENCES audiencias(id),
+        FOREIGN KEY (modalidad_id) REFERENCES modalidades(id),
+        FOREIGN KEY (prioridad_id) REFERENCES prioridades(id)
+    )
+    """,
+
+    # Output from AI (matrix)
+    """
+    CREATE TABLE IF NOT EXISTS final_matrix (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        origin_id INTEGER,
+        gerencia_id INTEGER,
+        subgerencia_id INTEGER,
+        area_id INTEGER,
+        desafio_id INTEGER,
+        actividad_formativa TEXT,
+        objetivo_desempeno TEXT,
+        contenidos_especificos TEXT,
+        skills TEXT,
+        keywords TEXT,
+        modalidad_id INTEGER,
+        fuente_id INTEGER,
+        fuente_interna TEXT,
+        audiencia_id INTEGER,
+        prioridad_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (origin_id) REFERENCES origin(id),
+        FOREIGN KEY (gerencia_id) REFERENCES gerencias(id),
+        FOREIGN KEY (subgerencia_id) REFERENCES subgerencias(id),
+        FOREIGN KEY (area_id) REFERENCES areas(id),
+        FOREIGN KEY (desafio_id) REFERENCES desafios(id),
+        FOREIGN KEY (modalidad_id) REFERENCES modalidades(id),
+        FOREIGN KEY (audiencia_id) REFERENCES audiencias(id),
+        FOREIGN KEY (prioridad_id) REFERENCES prioridades(id)
+    )
+    """,
+
+    # Validated matrix
+    """
+    CREATE TABLE IF NOT EXISTS validated_matrix (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        matrix_id INTEGER NOT NULL UNIQUE,
+        validated INTEGER NOT NULL DEFAULT 0 CHECK (validated IN (0, 1)),
+        validated_by TEXT,
+        validated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        validation_notes TEXT,
+        FOREIGN KEY (matrix_id) REFERENCES final_matrix(id)
+    )
+    """,
+
+    # Linkedin courses
+    """
+    CREATE TABLE IF NOT EXISTS linkedin_courses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        linkedin_urn TEXT,
+        linkedin_course TEXT,
+        linkedin_url TEXT,
+        UNIQUE(linkedin_urn, linkedin_course, linkedin_url)
+    )
+    """,
+
+    # Join table for final_matrix and LinkedIn courses
+    """
+    CREATE TABLE IF NOT EXISTS matrix_linkedin_courses (
+        matrix_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL,
+        PRIMARY KEY (matrix_id, course_id),
+        FOREIGN KEY (matrix_id) REFERENCES final_matrix(id),
+        FOREIGN KEY (course_id) REFERENCES linkedin_courses(id)
+    )
+    """,
+]
+
+# =========================
+# Migration 2 - indexes
+# =========================
+
+# Secondary indexes for every foreign-key and filter column. Foreign keys need
+# them so deleting a lookup value does not scan the child tables, and the
+# dashboard/matrix queries filter and group on the same columns.
+INDEXES = [
+    # final_matrix
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_origin_gerencia ON final_matrix(origin_id, gerencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_gerencia ON final_matrix(gerencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_subgerencia ON final_matrix(subgerencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_area ON final_matrix(area_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_desafio ON final_matrix(desafio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_audiencia ON final_matrix(audiencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_modalidad ON final_matrix(modalidad_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_fuente ON final_matrix(fuente_id)",
+    "CREATE INDEX IF NOT EXISTS idx_final_matrix_prioridad ON final_matrix(prioridad_id)",
+
+    # raw_data_forms
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_submission_created ON raw_data_forms(submission_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_origin_created ON raw_data_forms(origin_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_gerencia ON raw_data_forms(gerencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_subgerencia ON raw_data_forms(subgerencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_area ON raw_data_forms(area_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_desafio ON raw_data_forms(desafio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_audiencia ON raw_data_forms(audiencia_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_modalidad ON raw_data_forms(modalidad_id)",
+    "CREATE INDEX IF NOT EXISTS idx_raw_data_forms_prioridad ON raw_data_forms(prioridad_id)",
+
+    # matrix_linkedin_courses (matrix_id is covered by the primary key)
+    "CREATE INDEX IF NOT EXISTS idx_matrix_linkedin_courses_course ON matrix_linkedin_courses(course_id)",
+]
+
+
+# =========================
+# Migration 3 - app metadata
+# =========================
+
+# Key/value store for application state that must survive restarts
+# (e.g. the hash of the lookup template that was last seeded)
+APP_META = [
+    """
+    CREATE TABLE IF NOT EXISTS app_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+]
+
+
+# =========================
+# Migration 4 - dashboard summaries
+# =========================
+
+# Pre-aggregated dashboard counters kept current by triggers, so the dashboard
+# reads O(dimensions) rows instead of scanning the matrix. Missing ids are
+# stored as 0 so they can be part of the primary key.
+SUMMARY_DIMENSIONS = [
+    "gerencia_id", "subgerencia_id", "area_id", "audiencia_id",
+    "desafio_id", "prioridad_id", "modalidad_id", "fuente_id",
+]
+
+
+def _matrix_count_keys(row):
+    """(dimension, value_key) row values of one final_matrix row for an IN (VALUES ...) list"""
+    return ", ".join(f"('{column}', COALESCE({row}.{column}, 0))" for column in SUMMARY_DIMENSIONS)
+
+
+def _add_matrix_counts(row):
+    values = ", ".join(
+        f"(COALESCE({row}.origin_id, 0), '{column}', COALESCE({row}.{column}, 0), 1)"
+        for column in SUMMARY_DIMENSIONS
+    )
+    return f"""
+        INSERT INTO summary_matrix_counts (origin_key, dimension, value_key, activities)
+        VALUES {values}
+        ON CONFLICT (origin_key, dimension, value_key) DO UPDATE SET activities = activities + 1;
+    """
+
+
+def _remove_matrix_counts(row):
+    where = f"origin_key = COALESCE({row}.origin_id, 0) AND (dimension, value_key) IN (VALUES {_matrix_count_keys(row)})"
+    return f"""
+        UPDATE summary_matrix_counts SET activities = activities - 1 WHERE {where};
+        DELETE FROM summary_matrix_counts WHERE {where} AND activities <= 0;
+    """
+
+
+def _add_origin_stats(row):
+    return f"""
+        INSERT INTO summary_origin_stats (origin_key, activities, validated, linked_activities, course_links)
+        VALUES (
+            COALESCE({row}.origin_id, 0),
+            1,
+            (SELECT COUNT(*) FROM validated_matrix WHERE matrix_id = {row}.id AND validated = 1),
+            EXISTS (SELECT 1 FROM matrix_linkedin_courses WHERE matrix_id = {row}.id),
+            (SELECT COUNT(*) FROM matrix_linkedin_courses WHERE matrix_id = {row}.id)
+        )
+        ON CONFLICT (origin_key) DO UPDATE SET
+            activities = activities + excluded.activities,
+            validated = validated + excluded.validated,
+            linked_activities = linked_activities + excluded.linked_activities,
+            course_links = course_links + excluded.course_links;
+    """
+
+
+def _remove_origin_stats(row):
+    return f"""
+        UPDATE summary_origin_stats SET
+            activities = activities - 1,
+            validated = validated - (SELECT COUNT(*) FROM validated_matrix WHERE matrix_id = {row}.id AND validated = 1),
+            linked_activities = linked_activities - EXISTS (SELECT 1 FROM matrix_linkedin_courses WHERE matrix_id = {row}.id),
+            course_links = course_links - (SELECT COUNT(*) FROM matrix_linkedin_courses WHERE matrix_id = {row}.id)
+        WHERE origin_key = COALESCE({row}.origin_id, 0);
+    """
+
+
+def _matrix_origin(matrix_id):
+    """Summary key of the origin of a final_matrix row (NULL if the row does not exist)"""
+    return f"(SELECT COALESCE(origin_id, 0) FROM final_matrix WHERE id = {matrix_id})"
+
+
+def _add_submission(row):
+    return f"""
+        INSERT INTO summary_submissions (origin_key, day, submission_id, submissions)
+        VALUES (COALESCE({row}.origin_id, 0), COALESCE(DATE({row}.created_at), ''), {row}.submission_id, 1)
+        ON CONFLICT (origin_key, day, submission_id) DO UPDATE SET submissions = submissions + 1;
+    """
+
+
+def _remove_submission(row):
+    where = (
+        f"origin_key = COALESCE({row}.origin_id, 0) AND day = COALESCE(DATE({row}.created_at), '') "
+        f"AND submission_id = {row}.submission_id"
+    )
+    return f"""
+        UPDATE summary_submissions SET submissions = submissions - 1 WHERE {where};
+        DELETE FROM summary_submissions WHERE {where} AND submissions <= 0;
+    """
+
+
+def rebuild_summary_tables(cur):
+    """Recompute every dashboard summary table from the source tables."""
+    cur.execute("DELETE FROM summary_matrix_counts")
+    cur.execute("DELETE FROM summary_origin_stats")
+    cur.execute("DELETE FROM summary_submissions")
+
+    cur.execute(
+        "INSERT INTO summary_matrix_counts (origin_key, dimension, value_key, activities)\n"
+        + "\nUNION ALL\n".join(
+            f"SELECT COALESCE(origin_id, 0), '{column}', COALESCE({column}, 0), COUNT(*) "
+            f"FROM final_matrix GROUP BY 1, 3"
+            for column in SUMMARY_DIMENSIONS
+        )
+    )
+
+    cur.execute("""
+        INSERT INTO summary_origin_stats (origin_key, activities, validated, linked_activities, course_links)
+        SELECT
+            COALESCE(fm.origin_id, 0),
+            COUNT(*),
+            COUNT(CASE WHEN vm.validated = 1 THEN 1 END),
+            COUNT(lc.matrix_id),
+            COALESCE(SUM(lc.links), 0)
+        FROM final_matrix fm
+        LEFT JOIN validated_matrix vm ON vm.matrix_id = fm.id
+        LEFT JOIN (
+            SELECT matrix_id, COUNT(*) AS links
+            FROM matrix_linkedin_courses
+            GROUP BY matrix_id
+        ) lc ON lc.matrix_id = fm.id
+        GROUP BY 1
+    """)
+
+    cur.execute("""
+        INSERT INTO summary_submissions (origin_key, day, submission_id, submissions)
+        SELECT COALESCE(origin_id, 0), COALESCE(DATE(created_at), ''), submission_id, COUNT(*)
+        FROM raw_data_forms
+        GROUP BY 1, 2, 3
+    """)
+
+
+_SUMMARY_COLUMNS = ", ".join(["origin_id"] + SUMMARY_DIMENSIONS)
+
+SUMMARY_TABLES = [
+    # Activities per origin and dimension value
+    """
+    CREATE TABLE IF NOT EXISTS summary_matrix_counts (
+        origin_key INTEGER NOT NULL,
+        dimension TEXT NOT NULL,
+        value_key INTEGER NOT NULL,
+        activities INTEGER NOT NULL,
+        PRIMARY KEY (origin_key, dimension, value_key)
+    ) WITHOUT ROWID
+    """,
+
+    # Activity, validation and LinkedIn counters per origin
+    """
+    CREATE TABLE IF NOT EXISTS summary_origin_stats (
+        origin_key INTEGER PRIMARY KEY,
+        activities INTEGER NOT NULL DEFAULT 0,
+        validated INTEGER NOT NULL DEFAULT 0,
+        linked_activities INTEGER NOT NULL DEFAULT 0,
+        course_links INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+
+    # Form submissions per origin, day and respondent (monthly trends need distinct respondents)
+    """
+    CREATE TABLE IF NOT EXISTS summary_submissions (
+        origin_key INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        submission_id INTEGER NOT NULL,
+        submissions INTEGER NOT NULL,
+        PRIMARY KEY (origin_key, day, submission_id)
+    ) WITHOUT ROWID
+    """,
+
+    # final_matrix
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_final_matrix_insert
+    AFTER INSERT ON final_matrix
+    BEGIN
+        {_add_matrix_counts("NEW")}
+        {_add_origin_stats("NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_final_matrix_delete
+    AFTER DELETE ON final_matrix
+    BEGIN
+        {_remove_matrix_counts("OLD")}
+        {_remove_origin_stats("OLD")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_final_matrix_update
+    AFTER UPDATE OF {_SUMMARY_COLUMNS} ON final_matrix
+    BEGIN
+        {_remove_matrix_counts("OLD")}
+        {_add_matrix_counts("NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_final_matrix_update_origin
+    AFTER UPDATE OF origin_id ON final_matrix
+    WHEN OLD.origin_id IS NOT NEW.origin_id
+    BEGIN
+        {_remove_origin_stats("OLD")}
+        {_add_origin_stats("NEW")}
+    END
+    """,
+
+    # validated_matrix
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_validated_matrix_insert
+    AFTER INSERT ON validated_matrix
+    WHEN NEW.validated = 1
+    BEGIN
+        UPDATE summary_origin_stats SET validated = validated + 1
+        WHERE origin_key = {_matrix_origin("NEW.matrix_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_validated_matrix_delete
+    AFTER DELETE ON validated_matrix
+    WHEN OLD.validated = 1
+    BEGIN
+        UPDATE summary_origin_stats SET validated = validated - 1
+        WHERE origin_key = {_matrix_origin("OLD.matrix_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_validated_matrix_update
+    AFTER UPDATE OF validated, matrix_id ON validated_matrix
+    BEGIN
+        UPDATE summary_origin_stats SET validated = validated - (OLD.validated = 1)
+        WHERE origin_key = {_matrix_origin("OLD.matrix_id")};
+        UPDATE summary_origin_stats SET validated = validated + (NEW.validated = 1)
+        WHERE origin_key = {_matrix_origin("NEW.matrix_id")};
+    END
+    """,
+
+    # matrix_linkedin_courses
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_matrix_linkedin_courses_insert
+    AFTER INSERT ON matrix_linkedin_courses
+    BEGIN
+        UPDATE summary_origin_stats SET
+            course_links = course_links + 1,
+            linked_activities = linked_activities
+                + ((SELECT COUNT(*) FROM matrix_linkedin_courses WHERE matrix_id = NEW.matrix_id) = 1)
+        WHERE origin_key = {_matrix_origin("NEW.matrix_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_matrix_linkedin_courses_delete
+    AFTER DELETE ON matrix_linkedin_courses
+    BEGIN
+        UPDATE summary_origin_stats SET
+            course_links = course_links - 1,
+            linked_activities = linked_activities
+                - NOT EXISTS (SELECT 1 FROM matrix_linkedin_courses WHERE matrix_id = OLD.matrix_id)
+        WHERE origin_key = {_matrix_origin("OLD.matrix_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_matrix_linkedin_courses_update
+    AFTER UPDATE OF matrix_id ON matrix_linkedin_courses
+    WHEN OLD.matrix_id IS NOT NEW.matrix_id
+    BEGIN
+        UPDATE summary_origin_stats SET
+            course_links = course_links - 1,
+            linked_activities = linked_activities
+                - NOT EXISTS (SELECT 1 FROM matrix_linkedin_courses WHERE matrix_id = OLD.matrix_id)
+        WHERE origin_key = {_matrix_origin("OLD.matrix_id")};
+        UPDATE summary_origin_stats SET
+            course_links = course_links + 1,
+            linked_activities = linked_activities
+                + ((SELECT COUNT(*) FROM matrix_linkedin_courses WHERE matrix_id = NEW.matrix_id) = 1)
+        WHERE origin_key = {_matrix_origin("NEW.matrix_id")};
+    END
+    """,
+
+    # raw_data_forms
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_raw_data_forms_insert
+    AFTER INSERT ON raw_data_forms
+    BEGIN
+        {_add_submission("NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_raw_data_forms_delete
+    AFTER DELETE ON raw_data_forms
+    BEGIN
+        {_remove_submission("OLD")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_summary_raw_data_forms_update
+    AFTER UPDATE OF origin_id, created_at, submission_id ON raw_data_forms
+    BEGIN
+        {_remove_submission("OLD")}
+        {_add_submission("NEW")}
+    END
+    """,
+
+    # Populate from the existing data
+    rebuild_summary_tables,
+]
+
+# =========================
+# Migration 5 - matrix read model
+# =========================
+
+# Denormalized copy of final_matrix with lookup names, validation and LinkedIn
+# courses inlined, kept current by triggers so list pages read one table
+# instead of repeating the joins: name column -> (id column, lookup table)
+MATRIX_WIDE_LOOKUPS = {
+    "origen": ("origin_id", "origin"),
+    "gerencia": ("gerencia_id", "gerencias"),
+    "subgerencia": ("subgerencia_id", "subgerencias"),
+    "area": ("area_id", "areas"),
+    "desafio": ("desafio_id", "desafios"),
+    "audiencia": ("audiencia_id", "audiencias"),
+    "modalidad": ("modalidad_id", "modalidades"),
+    "fuente": ("fuente_id", "fuentes"),
+    "prioridad": ("prioridad_id", "prioridades"),
+}
+
+_MATRIX_WIDE_TEXT = [
+    "actividad_formativa", "objetivo_desempeno", "contenidos_especificos",
+    "skills", "keywords", "fuente_interna", "created_at",
+]
+
+_MATRIX_WIDE_COLUMNS = ", ".join(
+    ["id"]
+    + [column for column, _ in MATRIX_WIDE_LOOKUPS.values()]
+    + list(MATRIX_WIDE_LOOKUPS)
+    + _MATRIX_WIDE_TEXT
+    + ["validated", "course_links", "linkedin_courses"]
+)
+
+
+def _select_matrix_wide(where):
+    """SELECT producing matrix_wide rows for the final_matrix rows matching `where`"""
+    lookups = ", ".join(
+        f"(SELECT name FROM {table} WHERE id = fm.{column})"
+        for column, table in MATRIX_WIDE_LOOKUPS.values()
+    )
+    return f"""
+        SELECT
+            fm.id,
+            {", ".join(f"fm.{column}" for column, _ in MATRIX_WIDE_LOOKUPS.values())},
+            {lookups},
+            {", ".join(f"fm.{column}" for column in _MATRIX_WIDE_TEXT)},
+            EXISTS (SELECT 1 FROM validated_matrix WHERE matrix_id = fm.id AND validated = 1),
+            (SELECT COUNT(*) FROM matrix_linkedin_courses WHERE matrix_id = fm.id),
+            (
+                SELECT GROUP_CONCAT(linkedin_course, ', ')
+                FROM (
+                    SELECT lc.linkedin_course
+                    FROM matrix_linkedin_courses mlc
+                    JOIN linkedin_courses lc ON lc.id = mlc.course_id
+                    WHERE mlc.matrix_id = fm.id
+                    ORDER BY mlc.course_id
+                )
+            )
+        FROM final_matrix fm
+        WHERE {where}
+    """
+
+
+def _refresh_matrix_wide(ids):
+    # Delete + insert rather than INSERT OR REPLACE: a conflict clause on the
+    # statement firing the trigger (e.g. INSERT OR IGNORE) would override it
+    return f"""
+        DELETE FROM matrix_wide WHERE id IN ({ids});
+        INSERT INTO matrix_wide ({_MATRIX_WIDE_COLUMNS}) {_select_matrix_wide(f"fm.id IN ({ids})")};
+    """
+
+
+def rebuild_matrix_wide(cur):
+    """Recompute the matrix read model from the source tables."""
+    cur.execute("DELETE FROM matrix_wide")
+    cur.execute(f"INSERT INTO matrix_wide ({_MATRIX_WIDE_COLUMNS}) {_select_matrix_wide('1')}")
+
+
+def _lookup_triggers(name_column, id_column, table):
+    """Keep a matrix_wide name column in sync with its lookup table"""
+    refresh = (
+        f"UPDATE matrix_wide SET {name_column} = (SELECT name FROM {table} WHERE id = matrix_wide.{id_column})"
+    )
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_{table}_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {refresh} WHERE {id_column} = NEW.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_{table}_update
+        AFTER UPDATE OF id, name ON {table}
+        BEGIN
+            {refresh} WHERE {id_column} IN (OLD.id, NEW.id);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_{table}_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            UPDATE matrix_wide SET {name_column} = NULL WHERE {id_column} = OLD.id;
+        END
+        """,
+    ]
+
+
+def _refresh_triggers(table, events):
+    """Triggers on `table` refreshing matrix_wide rows: events is [(event, final_matrix ids)]"""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_{table}_{event.split()[0].lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            {_refresh_matrix_wide(ids)}
+        END
+        """
+        for event, ids in events
+    ]
+
+
+_COURSE_MATRIX_IDS = "SELECT matrix_id FROM matrix_linkedin_courses WHERE course_id IN ({ids})"
+
+MATRIX_WIDE = [
+    """
+    CREATE TABLE IF NOT EXISTS matrix_wide (
+        id INTEGER PRIMARY KEY,
+        origin_id INTEGER,
+        gerencia_id INTEGER,
+        subgerencia_id INTEGER,
+        area_id INTEGER,
+        desafio_id INTEGER,
+        audiencia_id INTEGER,
+        modalidad_id INTEGER,
+        fuente_id INTEGER,
+        prioridad_id INTEGER,
+        origen TEXT,
+        gerencia TEXT,
+        subgerencia TEXT,
+        area TEXT,
+        desafio TEXT,
+        audiencia TEXT,
+        modalidad TEXT,
+        fuente TEXT,
+        prioridad TEXT,
+        actividad_formativa TEXT,
+        objetivo_desempeno TEXT,
+        contenidos_especificos TEXT,
+        skills TEXT,
+        keywords TEXT,
+        fuente_interna TEXT,
+        created_at TIMESTAMP,
+        validated INTEGER NOT NULL DEFAULT 0,
+        course_links INTEGER NOT NULL DEFAULT 0,
+        linkedin_courses TEXT
+    )
+    """,
+
+    # Sort orders of the list pages, plus the lookup ids the triggers update by
+    "CREATE INDEX IF NOT EXISTS idx_matrix_wide_gerencia_sort ON matrix_wide(COALESCE(gerencia, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_matrix_wide_actividad ON matrix_wide(actividad_formativa)",
+    "CREATE INDEX IF NOT EXISTS idx_matrix_wide_modalidad_fuente ON matrix_wide(modalidad, fuente, actividad_formativa)",
+    *(
+        f"CREATE INDEX IF NOT EXISTS idx_matrix_wide_{column[:-3]} ON matrix_wide({column})"
+        for column, _ in MATRIX_WIDE_LOOKUPS.values()
+    ),
+
+    # final_matrix
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_final_matrix_insert
+    AFTER INSERT ON final_matrix
+    BEGIN
+        {_refresh_matrix_wide("NEW.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_final_matrix_update
+    AFTER UPDATE ON final_matrix
+    BEGIN
+        {_refresh_matrix_wide("OLD.id, NEW.id")}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_matrix_wide_final_matrix_delete
+    AFTER DELETE ON final_matrix
+    BEGIN
+        DELETE FROM matrix_wide WHERE id = OLD.id;
+    END
+    """,
+
+    # validated_matrix and matrix_linkedin_courses
+    *(
+        trigger
+        for table in ("validated_matrix", "matrix_linkedin_courses")
+        for trigger in _refresh_triggers(table, [
+            ("INSERT", "NEW.matrix_id"),
+            ("UPDATE", "OLD.matrix_id, NEW.matrix_id"),
+            ("DELETE", "OLD.matrix_id"),
+        ])
+    ),
+
+    # linkedin_courses (titles are inlined in the linked activities)
+    *_refresh_triggers("linkedin_courses", [
+        ("INSERT", _COURSE_MATRIX_IDS.format(ids="NEW.id")),
+        ("UPDATE OF id, linkedin_course", _COURSE_MATRIX_IDS.format(ids="OLD.id, NEW.id")),
+        ("DELETE", _COURSE_MATRIX_IDS.format(ids="OLD.id")),
+    ]),
+
+    # Lookup names
+    *(
+        trigger
+        for name_column, (id_column, table) in MATRIX_WIDE_LOOKUPS.items()
+        for trigger in _lookup_triggers(name_column, id_column, table)
+    ),
+
+    # Populate from the existing data
+    rebuild_matrix_wide,
+]
+
+
+# =========================
+# Migration 6 - LinkedIn catalog mirror
+# =========================
+
+# Local copy of the LinkedIn Learning catalog for the configured asset types
+# and locales, filled by sync_catalog() (src/services/linkedin_api.py). The
+# external-content FTS5 index over title and description is kept in step by
+# triggers; fetch_courses() searches it instead of the API once a type and
+# locale have been synced. Saved linkedin_courses rows link to it by URN
+# (their UNIQUE (linkedin_urn, ...) index already covers that lookup).
+LINKEDIN_CATALOG = [
+    """
+    CREATE TABLE IF NOT EXISTS linkedin_catalog (
+        id INTEGER PRIMARY KEY,
+        urn TEXT UNIQUE NOT NULL,
+        asset_type TEXT NOT NULL,
+        language TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        level TEXT,
+        duration_seconds INTEGER,
+        url TEXT,
+        retired INTEGER NOT NULL DEFAULT 0,
+        last_modified_at INTEGER,
+        synced_at INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_linkedin_catalog_type_language ON linkedin_catalog(asset_type, language, level)",
+
+    # Accents are folded so "gestion" matches "Gestión"
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS linkedin_catalog_fts USING fts5(
+        title, description,
+        content='linkedin_catalog', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linkedin_catalog_fts_insert
+    AFTER INSERT ON linkedin_catalog
+    BEGIN
+        INSERT INTO linkedin_catalog_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linkedin_catalog_fts_delete
+    AFTER DELETE ON linkedin_catalog
+    BEGIN
+        INSERT INTO linkedin_catalog_fts (linkedin_catalog_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linkedin_catalog_fts_update
+    AFTER UPDATE OF id, title, description ON linkedin_catalog
+    BEGIN
+        INSERT INTO linkedin_catalog_fts (linkedin_catalog_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        INSERT INTO linkedin_catalog_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+
+    # Last successful sync of each asset type and locale; last_modified_after
+    # is the LinkedIn-side watermark the next delta refresh starts from
+    """
+    CREATE TABLE IF NOT EXISTS linkedin_catalog_sync (
+        asset_type TEXT NOT NULL,
+        language TEXT NOT NULL,
+        last_modified_after INTEGER NOT NULL,
+        synced_at INTEGER NOT NULL,
+        PRIMARY KEY (asset_type, language)
+    )
+    """,
+]
+
+# Numbered migrations: (version, description, steps). A step is either a SQL
+# statement or a callable receiving the cursor. Append new migrations at the
+# end; never edit one that has already shipped.
+MIGRATIONS = [
+    (1, "Base schema", BASE_SCHEMA),
+    (2, "Foreign-key and filter indexes", INDEXES),
+    (3, "Application metadata", APP_META),
+    (4, "Dashboard summary tables", SUMMARY_TABLES),
+    (5, "Matrix read model", MATRIX_WIDE),
+    (6, "LinkedIn catalog mirror", LINKEDIN_CATALOG),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+_schema_checked = False
+
+
+def get_schema_version(cur):
+    """Return the highest applied migration version (0 for an unversioned database)."""
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'")
+    if not cur.fetchone():
+        return 0
+    cur.execute("SELECT MAX(version) FROM schema_version")
+    return cur.fetchone()[0] or 0
+
+
+def run_migrations(db_path=DB_PATH, force=False):
+    """
+    Bring the database up to LATEST_VERSION.
+
+    Each pending migration runs in its own transaction together with its
+    schema_version row, so a failed step leaves the previous version intact.
+    Checked once per process; pass force=True after replacing the database file.
+
+    Returns:
+        list: Versions applied during this call
+    """
+    global _schema_checked
+    if _schema_checked and not force:
+        return []
+
+    # A dedicated connection keeps DDL out of the pooled connections' statement caches
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    applied = []
+
+    try:
+        apply_pragmas(conn)
+        cur = conn.cursor()
+        current_version = get_schema_version(cur)
+
+        if current_version < LATEST_VERSION:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+        for version, description, steps in MIGRATIONS:
+            if version <= current_version:
+                continue
+
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have migrated while we waited for the lock
+                cur.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,))
+                if cur.fetchone():
+                    cur.execute("COMMIT")
+                    continue
+
+                for step in steps:
+                    if callable(step):
+                        step(cur)
+                    else:
+                        cur.execute(step)
+                cur.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            applied.append(version)
+
+        if applied:
+            # Let the query planner pick up statistics for new indexes
+            cur.execute("PRAGMA optimize")
+
+    finally:
+        conn.close()
+
+    _schema_checked = True
+    return applied
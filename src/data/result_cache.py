@@ -0,0 +1,69 @@
+import threading
+from functools import wraps
+import pandas as pd
+from src.data.connection import get_data_version
+
+# Process-wide cache of read results shared by every session:
+# {(function, args, kwargs): result}, valid for _version only
+_results = {}
+_lock = threading.Lock()
+_version = None
+
+
+def _copy_result(value):
+    """Copy containers so callers can modify what they get back without touching the cache."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        # Row dicts are copied too, not shared with the cached list
+        return [_copy_result(item) for item in value]
+    return value
+
+
+def _freeze(value):
+    """Hashable form of an argument (filter dicts and lists of selected values)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def cached_read(func):
+    """
+    Cache a read-only query function until the database changes.
+
+    Results are keyed on the function and its arguments and dropped as soon
+    as the database data version moves, so any committed write (from any
+    page, session or process) invalidates them.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        global _version
+        version = get_data_version()
+        key = (func.__module__, func.__qualname__, _freeze(args), _freeze(kwargs))
+
+        with _lock:
+            if version != _version:
+                _results.clear()
+                _version = version
+            elif key in _results:
+                return _copy_result(_results[key])
+
+        result = func(*args, **kwargs)
+
+        with _lock:
+            # Don't store a result that a newer write already made stale
+            if version == _version:
+                _results[key] = result
+        return _copy_result(result)
+
+    return wrapper
+
+
+def clear_result_cache():
+    """Drop every cached result."""
+    with _lock:
+        _results.clear()
@@ -1,16 +1,6 @@
 import streamlit as st
-from src.data.database_utils import fetch_all, insert_row_into_matrix
-
-# Fetch lookup tables from DB
-gerencias = fetch_all("gerencias")
-subgerencias = fetch_all("subgerencias")
-areas = fetch_all("areas")
-desafios = fetch_all("desafios")
-audiencias = fetch_all("audiencias")
-modalidades = fetch_all("modalidades")
-fuentes = fetch_all("fuentes")
-prioridades = fetch_all("prioridades")
-linkedin = fetch_all("linkedin_courses")
+from src.data.dimension_cache import get_dimension
+from src.data.database_utils import insert_row_into_matrix
 
 
 def add_initiative_form():
@@ -18,10 +8,21 @@ def add_initiative_form():
     Display form for adding new training initiative
     Returns: (submitted, form_data) tuple
     """
+    # Fetch lookup tables (served from the shared dimension cache, so always current)
+    gerencias = get_dimension("gerencias")
+    subgerencias = get_dimension("subgerencias")
+    areas = get_dimension("areas")
+    desafios = get_dimension("desafios")
+    audiencias = get_dimension("audiencias")
+    modalidades = get_dimension("modalidades")
+    fuentes = get_dimension("fuentes")
+    prioridades = get_dimension("prioridades")
+    linkedin = get_dimension("linkedin_courses")
+
     with st.form("add_initiative_form", clear_on_submit=True):
 
         # Gerencia dropdown
-        gerencia_options = [None] + [name for name, id in gerencias.items()]
+        gerencia_options = gerencias.names_with(None)
         gerencia_selected = st.selectbox(
             "Gerencia (*)",
             options=gerencia_options,
@@ -30,7 +31,7 @@ def add_initiative_form():
         )
 
         # Subgerencia dropdown
-        subgerencia_options = [None, "N/A"] + [name for name, id in subgerencias.items()]
+        subgerencia_options = subgerencias.names_with(None, "N/A")
         subgerencia_selected = st.selectbox(
             "Subgerencia",
             options=subgerencia_options,
@@ -39,7 +40,7 @@ def add_initiative_form():
         )
 
         # Área dropdown
-        area_options = [None, "N/A"] + [name for name, id in areas.items()]
+        area_options = areas.names_with(None, "N/A")
         area_selected = st.selectbox(
             "Área",
             options=area_options,
@@ -48,7 +49,7 @@ def add_initiative_form():
         )
 
         # Desafío Estratégico dropdown
-        desafio_options = [None] + [name for name, id in desafios.items()]
+        desafio_options = desafios.names_with(None)
         desafio_selected = st.selectbox(
             "Desafío Estratégico (*)",
             options=desafio_options,
@@ -95,7 +96,7 @@ def add_initiative_form():
         )
 
         # Audiencia dropdown
-        audiencia_options = [None] + [name for name, id in audiencias.items()]
+        audiencia_options = audiencias.names_with(None)
         audiencia_selected = st.selectbox(
             "Audiencia (*)",
             options=audiencia_options,
@@ -104,7 +105,7 @@ def add_initiative_form():
         )
 
         # Modalidad dropdown
-        modalidad_options = [None] + [name for name, id in modalidades.items()]
+        modalidad_options = modalidades.names_with(None)
         modalidad_selected = st.selectbox(
             "Modalidad (*)",
             options=modalidad_options,
@@ -113,7 +114,7 @@ def add_initiative_form():
         )
 
         # Fuente dropdown
-        fuente_options = [None] + [name for name, id in fuentes.items()]
+        fuente_options = fuentes.names_with(None)
         fuente_selected = st.selectbox(
             "Fuente (*)",
             options=fuente_options,
@@ -129,7 +130,7 @@ def add_initiative_form():
         )
 
         # Prioridad dropdown
-        prioridad_options = [None] + [name for name, id in prioridades.items()]
+        prioridad_options = prioridades.names_with(None)
         prioridad_selected = st.selectbox(
             "Prioridad (*)",
             options=prioridad_options,
@@ -138,7 +139,7 @@ def add_initiative_form():
         )
 
         # LinkedIn course dropdown (optional)
-        linkedin_options = [None] + [name for name, id in linkedin.items()]
+        linkedin_options = linkedin.names_with(None)
         linkedin_selected = st.selectbox(
             "Curso Sugerido LinkedIn",
             options=linkedin_options,
@@ -213,16 +214,26 @@ def save_new_initiative(form_data):
     Save new initiative to database
     Returns: Boolean indicating success
     """
+    # Fetch lookup tables (served from the shared dimension cache, so always current)
+    gerencias = get_dimension("gerencias")
+    subgerencias = get_dimension("subgerencias")
+    areas = get_dimension("areas")
+    desafios = get_dimension("desafios")
+    audiencias = get_dimension("audiencias")
+    modalidades = get_dimension("modalidades")
+    fuentes = get_dimension("fuentes")
+    prioridades = get_dimension("prioridades")
+
     try:
         # Convert names to IDs
-        gerencia_id = get_id_from_name(gerencias, form_data['gerencia'])
-        subgerencia_id = get_id_from_name(subgerencias, form_data['subgerencia']) if form_data['subgerencia'] and form_data['subgerencia'] != "N/A" else None
-        area_id = get_id_from_name(areas, form_data['area']) if form_data['area'] and form_data['area'] != "N/A" else None
-        desafio_id = get_id_from_name(desafios, form_data['desafio'])
-        audiencia_id = get_id_from_name(audiencias, form_data['audiencia'])
-        modalidad_id = get_id_from_name(modalidades, form_data['modalidad'])
-        fuente_id = get_id_from_name(fuentes, form_data['fuente'])
-        prioridad_id = get_id_from_name(prioridades, form_data['prioridad'])
+        gerencia_id = get_id_from_name(gerencias.by_name, form_data['gerencia'])
+        subgerencia_id = get_id_from_name(subgerencias.by_name, form_data['subgerencia']) if form_data['subgerencia'] and form_data['subgerencia'] != "N/A" else None
+        area_id = get_id_from_name(areas.by_name, form_data['area']) if form_data['area'] and form_data['area'] != "N/A" else None
+        desafio_id = get_id_from_name(desafios.by_name, form_data['desafio'])
+        audiencia_id = get_id_from_name(audiencias.by_name, form_data['audiencia'])
+        modalidad_id = get_id_from_name(modalidades.by_name, form_data['modalidad'])
+        fuente_id = get_id_from_name(fuentes.by_name, form_data['fuente'])
+        prioridad_id = get_id_from_name(prioridades.by_name, form_data['prioridad'])
 
         # Prepare data for insertion
         initiative_data = {
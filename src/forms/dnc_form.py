@@ -1,18 +1,11 @@
 import streamlit as st
-from src.data.database_utils import fetch_all
-
-# Lookup values
-gerencias_dict = fetch_all("gerencias")
-subgerencias_dict = fetch_all("subgerencias")
-areas_dict = fetch_all("areas")
-desafios_dict = fetch_all("desafios")
-audiencias_dict = fetch_all("audiencias")
-modalidades_dict = fetch_all("modalidades")
-fuentes_dict = fetch_all("fuentes")
-prioridades_dict = fetch_all("prioridades")
-
+from src.data.dimension_cache import get_dimension
 
 def get_identification_data():
+    # Lookup values (served from the shared dimension cache, so always current)
+    gerencias = get_dimension("gerencias")
+    subgerencias = get_dimension("subgerencias")
+    areas = get_dimension("areas")
 
     # Instructions box
     st.subheader("📝 Instrucciones")
@@ -27,42 +20,26 @@ def get_identification_data():
         email = st.text_input("Correo Electrónico", value=st.session_state.basic_info["email"])
         
         # Gerencia selectbox
-        gerencia_options = [(None, "Selecciona una Gerencia...")] + [(id, name) for name, id in gerencias_dict.items()]
         gerencia_selected, _ = st.selectbox(
             "Gerencia",
-            options=gerencia_options,
-            index=next(
-                (i for i, g in enumerate(gerencia_options) if g[0] == st.session_state.basic_info["gerencia"]), 
-                0
-            ),
+            options=gerencias.options_with((None, "Selecciona una Gerencia...")),
+            index=gerencias.id_index(st.session_state.basic_info["gerencia"], offset=1),
             format_func=lambda x: x[1]
         )
 
         # Subgerencia selectbox 
-        subgerencia_options = [(None, "Selecciona una Subgerencia..."), (None, "N/A")] + [
-            (id, name) for name, id in subgerencias_dict.items()
-        ]
         subgerencia_selected, _ = st.selectbox(
             "Subgerencia",
-            options=subgerencia_options,
-            index=next(
-                (i for i, g in enumerate(subgerencia_options) if g[0] == st.session_state.basic_info["subgerencia"]), 
-                0
-            ),
+            options=subgerencias.options_with((None, "Selecciona una Subgerencia..."), (None, "N/A")),
+            index=subgerencias.id_index(st.session_state.basic_info["subgerencia"], offset=2),
             format_func=lambda x: x[1]
         )
 
         # Área selectbox
-        area_options = [(None, "Selecciona un Área..."), (None, "N/A")] + [
-            (id, name) for name, id in areas_dict.items()
-        ]
         area_selected, _ = st.selectbox(
             "Área",
-            options=area_options,
-            index=next(
-                (i for i, g in enumerate(area_options) if g[0] == st.session_state.basic_info["area"]), 
-                0
-            ),
+            options=areas.options_with((None, "Selecciona un Área..."), (None, "N/A")),
+            index=areas.id_index(st.session_state.basic_info["area"], offset=2),
             format_func=lambda x: x[1]
         )
 
@@ -78,14 +55,20 @@ def get_identification_data():
 
 
 def get_form_data():
-    
+    # Lookup values (served from the shared dimension cache, so always current)
+    desafios = get_dimension("desafios")
+    audiencias = get_dimension("audiencias")
+    modalidades = get_dimension("modalidades")
+    fuentes = get_dimension("fuentes")
+    prioridades = get_dimension("prioridades")
+
     with st.form("add_need_form", clear_on_submit=True):
         st.markdown("""
         Si no sabes cómo responder alguna pregunta, revisa el signo de pregunta (?) al lado derecho de cada campo para ver un ejemplo.
         """)
         challenge, _ = st.selectbox(
             "Desafío estratégico (*)", 
-            [(None, "Selecciona un desafío...")] + [(id, name) for name, id in desafios_dict.items()],
+            desafios.options_with((None, "Selecciona un desafío...")),
             index=0,
             format_func=lambda x: x[1]
         )
@@ -106,19 +89,19 @@ def get_form_data():
         )
         audience, _ = st.selectbox(
             "¿A quién debe ir dirigida la actividad formativa? (*)",
-            [(None, "Selecciona una audiencia...")] + [(id, name) for name, id in audiencias_dict.items()],
+            audiencias.options_with((None, "Selecciona una audiencia...")),
             index=0, 
             format_func=lambda x: x[1]
         )
         mode, _ = st.selectbox(
             "¿Qué modalidad debe tener la actividad formativa? (*)",
-            [(None, "Selecciona una modalidad...")] + [(id, name) for name, id in modalidades_dict.items()],
+            modalidades.options_with((None, "Selecciona una modalidad...")),
             index=0,
             format_func=lambda x: x[1]
         )
         source, _ = st.selectbox(
             "De acuerdo a lo que comentaste que el equipo debe aprender, ¿es un conocimiento que está dentro de la organización o debe ser impartido por una persona externa a la compañía? (*)",
-            [(None, "Selecciona una fuente...")] + [(id, name) for name, id in fuentes_dict.items()],
+            fuentes.options_with((None, "Selecciona una fuente...")),
             index=0,
             format_func=lambda x: x[1]
         )
@@ -130,7 +113,7 @@ def get_form_data():
         )
         priority, _ = st.selectbox(
             "Prioriza estas en función de la urgencia/importancia para el logro de los desafíos y/o posibilidad de la ejecución de la actividad formativa según los tiempos del equipo (*)",
-            [(None, "Selecciona una prioridad...")] + [(id, name) for name, id in prioridades_dict.items()],
+            prioridades.options_with((None, "Selecciona una prioridad...")),
             index=0,
             format_func=lambda x: x[1]
         )
@@ -1,18 +1,8 @@
 import streamlit as st
-from src.data.database_utils import fetch_all, update_final_matrix, update_matrix_linkedin_courses, delete_matrix_entry
+from src.data.dimension_cache import get_dimension
+from src.data.database_utils import update_final_matrix, update_matrix_linkedin_courses, delete_matrix_entry
 import time
 
-# Fetch lookup tables from DB
-gerencias = fetch_all("gerencias")
-subgerencias = fetch_all("subgerencias")
-areas = fetch_all("areas")
-desafios = fetch_all("desafios")
-audiencias = fetch_all("audiencias")
-modalidades = fetch_all("modalidades")
-fuentes = fetch_all("fuentes")
-prioridades = fetch_all("prioridades")
-linkedin = fetch_all("linkedin_courses")
-
 
 def get_id_from_name(lookup_dict, name):
     """Convert name to ID using lookup dictionary"""
@@ -24,6 +14,20 @@ def get_id_from_name(lookup_dict, name):
 @st.dialog("✏️ Editar Fila Seleccionada", width="large")
 def show_edit_matrix_dialog(row_data):
     """Display edit dialog for matrix row"""
+    # Fetch lookup tables (served from the shared dimension cache, so always current)
+    gerencias = get_dimension("gerencias")
+    subgerencias = get_dimension("subgerencias")
+    areas = get_dimension("areas")
+    desafios = get_dimension("desafios")
+    audiencias = get_dimension("audiencias")
+    modalidades = get_dimension("modalidades")
+    fuentes = get_dimension("fuentes")
+    prioridades = get_dimension("prioridades")
+    linkedin = get_dimension("linkedin_courses")
+
+    # Categorical columns give NaN for missing names; compare against None like the form does
+    row_data = row_data.astype(object).where(row_data.notna(), None)
+
     # Store original row data for comparison
     original_row = row_data.to_dict()
 
@@ -31,9 +35,9 @@ def show_edit_matrix_dialog(row_data):
     with st.form("edit_row_form"):
 
         # Gerencia dropdown
-        gerencia_options = [name for name, id in gerencias.items()]
+        gerencia_options = gerencias.names
         current_gerencia = row_data.get("Gerencia")
-        gerencia_index = next((i for i, name in enumerate(gerencia_options) if name == current_gerencia), 0)
+        gerencia_index = gerencias.name_index(current_gerencia)
         gerencia_selected = st.selectbox(
             "Gerencia (*)",
             options=gerencia_options,
@@ -41,9 +45,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Subgerencia dropdown
-        subgerencia_options = [None, "N/A"] + [name for name, id in subgerencias.items()]
+        subgerencia_options = subgerencias.names_with(None, "N/A")
         current_subgerencia = row_data.get("Subgerencia")
-        subgerencia_index = next((i for i, name in enumerate(subgerencia_options) if name == current_subgerencia), 0)
+        subgerencia_index = subgerencias.name_index(current_subgerencia, offset=2)
         subgerencia_selected = st.selectbox(
             "Subgerencia",
             options=subgerencia_options,
@@ -52,9 +56,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Área dropdown
-        area_options = [None, "N/A"] + [name for name, id in areas.items()]
+        area_options = areas.names_with(None, "N/A")
         current_area = row_data.get("Área")
-        area_index = next((i for i, name in enumerate(area_options) if name == current_area), 0)
+        area_index = areas.name_index(current_area, offset=2)
         area_selected = st.selectbox(
             "Área",
             options=area_options,
@@ -63,9 +67,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Desafío Estratégico dropdown
-        desafio_options = [name for name, id in desafios.items()]
+        desafio_options = desafios.names
         current_desafio = row_data.get("Desafío Estratégico")
-        desafio_index = next((i for i, name in enumerate(desafio_options) if name == current_desafio), 0)
+        desafio_index = desafios.name_index(current_desafio)
         desafio_selected = st.selectbox(
             "Desafío Estratégico (*)",
             options=desafio_options,
@@ -108,9 +112,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Audiencia dropdown
-        audiencia_options = [name for name, id in audiencias.items()]
+        audiencia_options = audiencias.names
         current_audiencia = row_data.get("Audiencia")
-        audiencia_index = next((i for i, name in enumerate(audiencia_options) if name == current_audiencia), 0)
+        audiencia_index = audiencias.name_index(current_audiencia)
         audiencia_selected = st.selectbox(
             "Audiencia (*)",
             options=audiencia_options,
@@ -118,9 +122,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Modalidad dropdown
-        modalidad_options = [name for name, id in modalidades.items()]
+        modalidad_options = modalidades.names
         current_modalidad = row_data.get("Modalidad")
-        modalidad_index = next((i for i, name in enumerate(modalidad_options) if name == current_modalidad), 0)
+        modalidad_index = modalidades.name_index(current_modalidad)
         modalidad_selected = st.selectbox(
             "Modalidad (*)",
             options=modalidad_options,
@@ -128,9 +132,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Fuente dropdown
-        fuente_options = [name for name, id in fuentes.items()]
+        fuente_options = fuentes.names
         current_fuente = row_data.get("Fuente")
-        fuente_index = next((i for i, name in enumerate(fuente_options) if name == current_fuente), 0)
+        fuente_index = fuentes.name_index(current_fuente)
         fuente_selected = st.selectbox(
             "Fuente (*)",
             options=fuente_options,
@@ -145,9 +149,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # Prioridad dropdown
-        prioridad_options = [name for name, id in prioridades.items()]
+        prioridad_options = prioridades.names
         current_prioridad = row_data.get("Prioridad")
-        prioridad_index = next((i for i, name in enumerate(prioridad_options) if name == current_prioridad), 0)
+        prioridad_index = prioridades.name_index(current_prioridad)
         prioridad_selected = st.selectbox(
             "Prioridad (*)",
             options=prioridad_options,
@@ -155,9 +159,9 @@ def show_edit_matrix_dialog(row_data):
         )
 
         # LinkedIn course dropdown
-        linkedin_options = [None] + [name for name, id in linkedin.items()]
+        linkedin_options = linkedin.names_with(None)
         current_linkedin = row_data.get("Curso Sugerido LinkedIn")
-        linkedin_index = next((i for i, name in enumerate(linkedin_options) if name == current_linkedin), 0)
+        linkedin_index = linkedin.name_index(current_linkedin, offset=1)
         linkedin_selected = st.selectbox(
             "Curso Sugerido LinkedIn",
             options=linkedin_options,
@@ -235,14 +239,14 @@ def show_edit_matrix_dialog(row_data):
         # Save changes
         try:
             # Convert form data to database IDs
-            gerencia_id = get_id_from_name(gerencias, form_info['gerencia'])
-            subgerencia_id = get_id_from_name(subgerencias, form_info['subgerencia'])
-            area_id = get_id_from_name(areas, form_info['area'])
-            desafio_id = get_id_from_name(desafios, form_info['desafio'])
-            audiencia_id = get_id_from_name(audiencias, form_info['audiencia'])
-            modalidad_id = get_id_from_name(modalidades, form_info['modalidad'])
-            fuente_id = get_id_from_name(fuentes, form_info['fuente'])
-            prioridad_id = get_id_from_name(prioridades, form_info['prioridad'])
+            gerencia_id = get_id_from_name(gerencias.by_name, form_info['gerencia'])
+            subgerencia_id = get_id_from_name(subgerencias.by_name, form_info['subgerencia'])
+            area_id = get_id_from_name(areas.by_name, form_info['area'])
+            desafio_id = get_id_from_name(desafios.by_name, form_info['desafio'])
+            audiencia_id = get_id_from_name(audiencias.by_name, form_info['audiencia'])
+            modalidad_id = get_id_from_name(modalidades.by_name, form_info['modalidad'])
+            fuente_id = get_id_from_name(fuentes.by_name, form_info['fuente'])
+            prioridad_id = get_id_from_name(prioridades.by_name, form_info['prioridad'])
 
             # Update the database
             update_final_matrix(
@@ -1,7 +1,10 @@
 import streamlit as st
-import requests
 import json
 import re
+from src.services import http_client
+
+# Model responses can take minutes; only the connect timeout stays short
+AI_TIMEOUT = (10, 300)
 
 def get_from_ai(prompt, contents):
     print("Sending request to AI...") # DEBUG
@@ -27,7 +30,7 @@ def get_from_ai(prompt, contents):
     }
 
     # Make the request
-    response = requests.post(url, headers=headers, json=payload) # data=json.dumps(payload)
+    response = http_client.post(url, headers=headers, json=payload, timeout=AI_TIMEOUT) # data=json.dumps(payload)
     print("Response status code:", response.status_code)  # DEBUG
     return response
 
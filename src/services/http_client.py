@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# (connect, read) timeout in seconds for calls that don't pass their own
+DEFAULT_TIMEOUT = (5, 30)
+
+# Keep-alive connections per host; matches the concurrent LinkedIn page fetches
+POOL_SIZE = 16
+
+# Retries after the first attempt, with jittered exponential backoff
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8
+
+# Longest Retry-After we are willing to wait for inside a page render
+RETRY_AFTER_MAX = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Methods that are safe to send twice. Others (POST) are only retried when the
+# request never reached the server, or the server asked for a retry with
+# Retry-After on one of NON_IDEMPOTENT_RETRY_STATUSES.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+NON_IDEMPOTENT_RETRY_STATUSES = {429, 503}
+
+# Consecutive failed calls before a host is skipped, and for how long
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 30
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without calling the host while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after BREAKER_THRESHOLD consecutive failed calls,
+    rejects calls for BREAKER_RESET seconds, then lets one trial call through.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_after=BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self, host):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_after or self._trial_running:
+                raise CircuitOpenError(f"{host} no está respondiendo; se reintentará en unos segundos.")
+            # Half-open: this call is the trial
+            self._trial_running = True
+
+    def record(self, success):
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+            else:
+                self._failures += 1
+                if self._failures >= self.threshold:
+                    self._opened_at = time.monotonic()
+
+
+_sessions = {}
+_breakers = {}
+_lock = threading.Lock()
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url):
+    """Shared keep-alive session for the URL's host."""
+    host = _host(url)
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount(host, adapter)
+                _sessions[host] = session
+                _breakers[host] = CircuitBreaker()
+    return session
+
+
+def _retry_after(response):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _never_sent(error):
+    """Whether a connection error happened before any of the request reached the server"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # Connection refused, DNS failure...: requests wraps urllib3's error
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _backoff(attempt):
+    # Full jitter spreads out retries from concurrent sessions
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, **kwargs):
+    """
+    Send a request through the host's pooled session.
+
+    Retries connection errors and 429/5xx responses with jittered exponential
+    backoff, honoring Retry-After. Non-idempotent methods (POST) are only
+    retried when the connection could not be opened, or on a 429/503 that
+    carries Retry-After, since the server may already have acted on them;
+    any other failure is surfaced at once. The last response is returned
+    once retries run out, so callers keep using raise_for_status() and
+    status_code as before.
+
+    Raises:
+        CircuitOpenError: The host failed repeatedly and is being skipped
+        requests.RequestException: The request could not be completed
+    """
+    session = get_session(url)
+    host = _host(url)
+    breaker = _breakers[host]
+    breaker.before_call(host)
+
+    try:
+        return _send_with_retries(session, breaker, method, url, timeout, retries, **kwargs)
+    except (requests.ConnectionError, requests.Timeout):
+        # Already recorded by _send_with_retries
+        raise
+    except BaseException:
+        # Redirect loops, invalid URLs, decoding errors...: record them too, or
+        # a half-open trial would never finish and the host stays blocked
+        breaker.record(success=False)
+        raise
+
+
+def _send_with_retries(session, breaker, method, url, timeout, retries, **kwargs):
+    """Retry loop of request(); records every outcome it returns or raises from the session."""
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            retryable = idempotent or _never_sent(e)
+            if not retryable or attempt >= retries:
+                breaker.record(success=False)
+                raise
+            time.sleep(_backoff(attempt))
+            attempt += 1
+            continue
+
+        if response.status_code not in RETRY_STATUSES:
+            breaker.record(success=True)
+            return response
+
+        delay = _retry_after(response)
+        retryable = idempotent or (
+            response.status_code in NON_IDEMPOTENT_RETRY_STATUSES and delay is not None
+        )
+        if not retryable or attempt >= retries:
+            breaker.record(success=False)
+            return response
+
+        if delay is None:
+            delay = _backoff(attempt)
+        elif delay > RETRY_AFTER_MAX:
+            # Don't hold the page for minutes; let the caller report it
+            breaker.record(success=False)
+            return response
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -1,30 +1,285 @@
 import streamlit as st
 import requests
 import math
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.services import http_client
+from src.data.linkedin_cache import make_query_key, get_cached_search, store_search
+from src.data.linkedin_catalog import get_sync_state, save_catalog_sync, catalog_covers, search_catalog, get_catalog_course
+
+TOKEN_URL = "https://www.linkedin.com/oauth/v2/accessToken"
+LEARNING_ASSETS_URL = "https://api.linkedin.com/v2/learningAssets"
+
+# Concurrent page requests per search; keeps bursts well under the API rate limits
+PAGE_WORKERS = 8
+
+# Refresh the token this many seconds before LinkedIn says it expires
+TOKEN_REFRESH_MARGIN = 300
+
+# What sync_catalog() mirrors: asset types and (language, country) locales.
+# Only Spanish-only searches are served from the mirror; the others cover
+# every language and always go to the API, so no other locale is synced.
+CATALOG_ASSET_TYPES = ["COURSE", "VIDEO", "LEARNING_PATH"]
+CATALOG_LOCALES = [("es", "ES")]
+CATALOG_PAGE_SIZE = 100
+
+# Delta refreshes re-read assets modified this long before the last watermark,
+# so changes published while a sync was running are not missed
+CATALOG_DELTA_OVERLAP = 3600 * 1000    # ms
+
+
+class TokenProvider:
+    """
+    Process-wide cache of the client-credentials access token.
+
+    Every session shares one token until TOKEN_REFRESH_MARGIN seconds before
+    its expires_in, and only one thread refreshes it. When cache_path is set
+    the token is also kept on disk, so restarts and other processes reuse it.
+    """
+
+    def __init__(self, cache_path=None, margin=TOKEN_REFRESH_MARGIN):
+        self.cache_path = cache_path
+        self.margin = margin
+        self._token = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def _valid(self, expires_at):
+        return time.time() < expires_at - self.margin
+
+    def get(self):
+        """Return a valid access token, requesting a new one only when needed."""
+        token, expires_at = self._token, self._expires_at
+        if token and self._valid(expires_at):
+            return token
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if self._token and self._valid(self._expires_at):
+                return self._token
+
+            cached = self._load()
+            if cached and self._valid(cached[1]):
+                self._token, self._expires_at = cached
+            else:
+                self._token, self._expires_at = self._request()
+                self._save()
+            return self._token
+
+    def invalidate(self):
+        """Drop the cached token, e.g. after the API rejected it with a 401."""
+        with self._lock:
+            self._token, self._expires_at = None, 0
+            if self.cache_path:
+                try:
+                    os.remove(self.cache_path)
+                except OSError:
+                    pass
+
+    def _request(self):
+        payload = {
+            "grant_type": "client_credentials",
+            "client_id": st.secrets["CLIENT_ID_LINKEDIN"],
+            "client_secret": st.secrets["CLIENT_SECRET_LINKEDIN"]
+        }
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        requested_at = time.time()
+        response = http_client.post(TOKEN_URL, data=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data["access_token"], requested_at + int(data.get("expires_in", 0))
+
+    def _load(self):
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data["access_token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        # Write to a private temp file and swap it in, so readers never see a partial token
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"access_token": self._token, "expires_at": self._expires_at}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # The disk cache is optional; keep the in-process token
+            pass
+
+
+def _token_cache_path():
+    """Optional on-disk token cache, set as LINKEDIN_TOKEN_CACHE in the secrets"""
+    try:
+        return st.secrets.get("LINKEDIN_TOKEN_CACHE")
+    except FileNotFoundError:
+        # No secrets file yet; requesting a token will report it
+        return None
+
+
+# Shared by every session
+token_provider = TokenProvider(cache_path=_token_cache_path())
+
 
 def get_access_token():
-    url = "https://www.linkedin.com/oauth/v2/accessToken"
-    payload = {
-        "grant_type": "client_credentials",
-        "client_id": st.secrets["CLIENT_ID_LINKEDIN"],
-        "client_secret": st.secrets["CLIENT_SECRET_LINKEDIN"]
+    return token_provider.get()
+
+
+def linkedin_get(url, params=None):
+    """GET a LinkedIn API endpoint with the cached token, refreshing it once if it was rejected."""
+    for attempt in range(2):
+        headers = {"Authorization": f"Bearer {get_access_token()}"}
+        response = http_client.get(url, headers=headers, params=params)
+        if response.status_code != 401 or attempt:
+            return response
+        token_provider.invalidate()
+
+
+def build_course(title, level_label, duration_seconds, description, url, urn):
+    """Course dict in the shape the search results table expects."""
+    return {
+        "Title": title,
+        "Level": level_label,
+        'Duration (min)': round(duration_seconds / 60) if duration_seconds else "Información no disponible",
+        "Description": description if description else "Descripción no disponible",
+        #"Short Description": short_description if short_description else "Descripción corta no disponible",
+        "URL": url,
+        "URN": urn
     }
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(url, data=payload, headers=headers)
+
+
+def parse_courses(data, level_map):
+    """Clean course dicts from one page of learningAssets results."""
+    courses = []
+    for element in data.get("elements", []):
+        urn = element.get("urn")
+        title = element.get("title", {}).get("value")
+        details = element.get("details", {})
+        level = details.get("level")
+        duration_seconds = details.get('timeToComplete', {}).get('duration')
+        description = details.get('description', {}).get('value')
+        #short_description = details.get('shortDescription', {}).get('value')
+
+        # Map level with fallback
+        level_label = level_map.get(level, "Nivel no especificado")
+
+        courses.append(build_course(title, level_label, duration_seconds, description, details.get("urls", {}).get("webLaunch"), urn))
+    return courses
+
+
+def parse_catalog_assets(data, asset_type, language):
+    """linkedin_catalog rows from one page of learningAssets results."""
+    assets = []
+    for element in data.get("elements", []):
+        title = element.get("title", {}).get("value")
+        if not element.get("urn") or not title:
+            continue
+        details = element.get("details", {})
+        assets.append({
+            "urn": element["urn"],
+            "asset_type": asset_type,
+            "language": language,
+            "title": title,
+            "description": details.get("description", {}).get("value"),
+            "level": details.get("level"),
+            "duration_seconds": details.get("timeToComplete", {}).get("duration"),
+            "url": details.get("urls", {}).get("webLaunch"),
+            "retired": int(details.get("availability") == "RETIRED"),
+            "last_modified_at": details.get("lastUpdatedAt"),
+        })
+    return assets
+
+
+def fetch_page(params, start):
+    """Fetch one page of learningAssets results starting at `start`."""
+    response = linkedin_get(LEARNING_ASSETS_URL, params={**params, "start": start})
     response.raise_for_status()
-    return response.json()["access_token"]
+    return response.json()
 
 
-def fetch_courses(keywords, asset_type, count_per_page, results_spanish, level, options_level):
-    """Fetch all courses with pagination and return clean data."""
-    
-    # Build the request URL
-    base_url = "https://api.linkedin.com/v2/learningAssets"
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
+def fetch_all_pages(params, count_per_page):
+    """
+    Every page of a learningAssets query, in order. The first page tells how
+    many results there are; the rest are fetched concurrently.
+
+    Returns:
+        tuple: (list of page dicts, total results)
+    """
+    first_page = fetch_page(params, 0)
+    total = first_page.get("paging", {}).get("total", 0)
+    if total == 0:
+        return [], 0
 
+    # Calculate how many pages
+    pages = math.ceil(total / count_per_page)
+
+    print(f"Fetching LinkedIn Learning assets ({pages} pages)...") # DEBUG
+
+    # Fetch the remaining pages concurrently; map() keeps them in page order
+    starts = [page * count_per_page for page in range(1, pages)]
+    with ThreadPoolExecutor(max_workers=max(1, min(PAGE_WORKERS, len(starts)))) as executor:
+        remaining_pages = list(executor.map(lambda start: fetch_page(params, start), starts))
+
+    return [first_page] + remaining_pages, total
+
+
+def search_mirror(keywords, asset_type, language, level=None):
+    """
+    Catalog mirror rows matching a search, or None when the mirror can't
+    answer it: the asset type and language were not synced recently, or the
+    mirror tables are missing (SQLite without FTS5, or a database that has
+    not been migrated yet).
+    """
+    try:
+        if not catalog_covers(asset_type, language):
+            return None
+        return search_catalog(keywords, asset_type, language, level)
+    except sqlite3.OperationalError as e:
+        print(f"LinkedIn catalog mirror unavailable, searching the API: {e}") # DEBUG
+        return None
+
+
+def fetch_courses(keywords, asset_type, count_per_page, results_spanish, level, options_level, use_cache=True):
+    """
+    Fetch all courses with pagination and return clean data.
+
+    Spanish-only searches are served from the local catalog mirror when
+    sync_catalog() has covered the asset type; searches in any language go
+    to the API, since the mirror only holds Spanish assets. Repeated
+    API searches come from the persistent search cache (see
+    src/data/linkedin_cache.py). Pass use_cache=False to query LinkedIn anyway.
+    """
+    level_map = dict(options_level)
+
+    if use_cache and results_spanish:
+        rows = search_mirror(keywords, asset_type, "es", None if level == "ALL" else level)
+        if rows is not None:
+            courses = [
+                build_course(
+                    row["title"], level_map.get(row["level"], "Nivel no especificado"),
+                    row["duration_seconds"], row["description"], row["url"], row["urn"],
+                )
+                for row in rows
+            ]
+            return courses, len(courses)
+
+    query_key = make_query_key(keywords, asset_type, count_per_page, results_spanish, level, options_level)
+    if use_cache:
+        cached = get_cached_search(query_key)
+        if cached is not None:
+            return cached
+
+    # Build the request parameters
     params = {
         "q": "criteria",
         "assetFilteringCriteria.keyword": keywords,
@@ -40,80 +295,78 @@ def fetch_courses(keywords, asset_type, count_per_page, results_spanish, level,
     if level != "ALL":
         params["assetFilteringCriteria.difficultyLevels[0]"] = level    
 
-    # Make the request
-    response = requests.get(base_url, headers=headers, params=params)
-    response.raise_for_status()
-    data = response.json()
-
-    # Check if there are any courses found
-    total = data.get("paging", {}).get("total", 0)
+    pages, total = fetch_all_pages(params, count_per_page)
 
-    if total == 0:
-        return [], 0
-
-    # Prepare to collect all courses
     all_courses = []
+    for data in pages:
+        all_courses.extend(parse_courses(data, level_map))
 
-    # Calculate how many pages
-    pages = math.ceil(total / count_per_page)
-
-    print("Fetching LinkedIn Learning courses...") # DEBUG
-
-    for page in range(pages):
-        start = page * count_per_page
-        params["start"] = start
-
-        print(f"Fetching page {page+1}/{pages} (start={start})...") # DEBUG
-        response = requests.get(base_url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+    if total:
+        print(f"{total} LinkedIn Learning courses fetched successfully.") # DEBUG
+    store_search(query_key, all_courses, total)
+    return all_courses, total
 
-        # Create a dict mapping for fast lookup
-        level_map = dict(options_level)
 
-        for element in data.get("elements", []):
-            urn = element.get("urn")
-            title = element.get("title", {}).get("value")
-            details = element.get("details", {})
-            level = details.get("level")
-            duration_seconds = details.get('timeToComplete', {}).get('duration')
-            description = details.get('description', {}).get('value')
-            #short_description = details.get('shortDescription', {}).get('value')
+def sync_catalog(asset_types=CATALOG_ASSET_TYPES, locales=CATALOG_LOCALES, full=False):
+    """
+    Mirror the LinkedIn Learning catalog into linkedin_catalog.
 
-            # Map level with fallback
-            level_label = level_map.get(level, "Nivel no especificado")
+    Each asset type and locale is synced fully the first time (or with
+    full=True, which also drops assets LinkedIn no longer lists) and then
+    refreshed with only the assets modified since the last sync, retired
+    ones included so they stop showing up in searches.
 
-            course = {
-                "Title": title,
-                "Level": level_label,
-                'Duration (min)': round(duration_seconds / 60) if duration_seconds else "Información no disponible",
-                "Description": description if description else "Descripción no disponible",
-                #"Short Description": short_description if short_description else "Descripción corta no disponible",
-                "URL": details.get("urls", {}).get("webLaunch"),
-                "URN": urn
+    Returns:
+        list: (asset_type, language, assets stored) per synced locale
+    """
+    summary = []
+    for asset_type in asset_types:
+        for language, country in locales:
+            watermark = None if full else get_sync_state(asset_type, language)
+            params = {
+                "q": "localeAndType",
+                "assetType": asset_type,
+                "sourceLocale.language": language,
+                "sourceLocale.country": country,
+                "includeRetired": "false" if watermark is None else "true",
+                "fields": "urn,title,details",
+                "count": CATALOG_PAGE_SIZE
             }
-            all_courses.append(course)
+            if watermark is not None:
+                params["lastModifiedAfter"] = watermark
 
-    print(f"{total} LinkedIn Learning courses fetched successfully.") # DEBUG
-    return all_courses, total
+            started_at = int(time.time() * 1000)
+            pages, _ = fetch_all_pages(params, CATALOG_PAGE_SIZE)
+            assets = [asset for data in pages for asset in parse_catalog_assets(data, asset_type, language)]
+
+            save_catalog_sync(asset_type, language, assets, started_at - CATALOG_DELTA_OVERLAP, full=watermark is None)
+            summary.append((asset_type, language, len(assets)))
+    return summary
 
 
 def search_course_by_identifier(identifier):
     """Search for a specific LinkedIn course by URN using the correct API endpoints."""
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
 
     try:
         if identifier.startswith("urn:li:"):
-            url = f"https://api.linkedin.com/v2/learningAssets/{identifier}"
+            # Courses in the catalog mirror don't need an API call
+            try:
+                mirrored = get_catalog_course(identifier)
+            except sqlite3.OperationalError:
+                mirrored = None
+            if mirrored:
+                return build_course(
+                    mirrored["title"], mirrored["level"], mirrored["duration_seconds"],
+                    mirrored["description"], mirrored["url"], mirrored["urn"],
+                ), None
+
+            url = f"{LEARNING_ASSETS_URL}/{identifier}"
             params = {
                 "fields": "urn,title,details",
                 "expandDepth": 2  # Include full details
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            response = linkedin_get(url, params=params)
             response.raise_for_status()
             course_data = response.json()
 
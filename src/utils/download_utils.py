@@ -1,112 +1,234 @@
 import streamlit as st
-import io
+import os
+import tempfile
 import pandas as pd
 import re
+import xlsxwriter
+
+
+# Emojis and various Unicode symbols, compiled once at import
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U00002700-\U000027BF"  # dingbats
+    "\U0001f926-\U0001f937"  # gestures
+    "\U00010000-\U0010ffff"  # other unicode
+    "\u2640-\u2642"  # gender symbols
+    "\u2600-\u2B55"  # misc symbols
+    "\u200d"  # zero width joiner
+    "\u23cf"  # eject symbol
+    "\u23e9"  # fast forward
+    "\u231a"  # watch
+    "\ufe0f"  # variation selector
+    "\u3030"  # wavy dash
+    "]+",
+    flags=re.UNICODE
+)
 
 
 def remove_emojis(text):
     """Remove emojis and other unwanted Unicode characters from text."""
     if not isinstance(text, str):
         return text
+    return EMOJI_PATTERN.sub('', text).strip()
 
-    # Remove emojis and various Unicode symbols
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002700-\U000027BF"  # dingbats
-        "\U0001f926-\U0001f937"  # gestures
-        "\U00010000-\U0010ffff"  # other unicode
-        "\u2640-\u2642"  # gender symbols
-        "\u2600-\u2B55"  # misc symbols
-        "\u200d"  # zero width joiner
-        "\u23cf"  # eject symbol
-        "\u23e9"  # fast forward
-        "\u231a"  # watch
-        "\ufe0f"  # variation selector
-        "\u3030"  # wavy dash
-        "]+",
-        flags=re.UNICODE
-    )
-    return emoji_pattern.sub('', text).strip()
+
+def strip_emojis(values):
+    """Vectorized remove_emojis for a Series; non-string values are kept as they are."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Clean each distinct name once instead of every cell
+        categories = values.cat.categories
+        return values.map(dict(zip(categories, strip_emojis(pd.Series(categories)))))
+
+    try:
+        # The pattern source rather than the compiled object, so Arrow-backed
+        # string columns use the native regex kernel instead of a Python loop
+        cleaned = values.str.replace(EMOJI_PATTERN.pattern, '', regex=True).str.strip()
+    except AttributeError:
+        # No string values to clean
+        return values
+    return cleaned.where(cleaned.notna(), values)
+
+
+def strip_emojis_frame(df):
+    """Remove emojis from every string and categorical column of a DataFrame."""
+    df = df.copy()
+    for col in df.select_dtypes(include=['object', 'string', 'category']).columns:
+        df[col] = strip_emojis(df[col])
+    return df
+
+
+def column_widths(df, padding=2, max_width=50):
+    """Excel column widths from the longest value or header of each column."""
+    widths = []
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Only the distinct names need measuring
+            values = pd.Series(values.cat.categories)
+        longest = values.astype(str).str.len().max()
+        longest = 0 if pd.isna(longest) else longest
+        widths.append(min(max(longest, len(col)) + padding, max_width))
+    return widths
+
+
+def _excel_value(value, clean):
+    """Cell value for xlsxwriter: emojis removed from text, missing values as blanks"""
+    if isinstance(value, str):
+        return remove_emojis(value) if clean else value
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def write_excel_file(path, columns, rows, widths=None, clean=True, max_width=50):
+    """
+    Stream rows into an .xlsx file with xlsxwriter's constant_memory mode.
+
+    Rows are written one at a time and flushed to disk, so memory stays flat
+    however many rows the iterable (e.g. a DB cursor) yields. Column widths
+    are measured on the fly unless given.
+
+    Returns:
+        int: Number of data rows written
+    """
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'tmpdir': os.path.dirname(path),
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    try:
+        worksheet = workbook.add_worksheet('Datos')
+        header_format = workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'fg_color': '#D7E4BC',
+            'border': 1
+        })
+        worksheet.write_row(0, 0, columns, header_format)
+
+        measure = widths is None
+        if measure:
+            widths = [len(str(column)) + 2 for column in columns]
+
+        row_count = 0
+        for row_count, row in enumerate(rows, start=1):
+            values = [_excel_value(value, clean) for value in row]
+            worksheet.write_row(row_count, 0, values)
+            if measure:
+                for i, value in enumerate(values):
+                    if value is not None:
+                        widths[i] = max(widths[i], len(str(value)) + 2)
+
+        # Column widths can be set after the rows, even in constant_memory mode
+        for i, width in enumerate(widths):
+            worksheet.set_column(i, i, min(width, max_width))
+    finally:
+        workbook.close()
+    return row_count
+
+
+def build_excel_file(write):
+    """
+    Run write(path) against a temporary .xlsx file and return its bytes.
+
+    The workbook is assembled on disk, so only the finished file is held in memory.
+
+    Returns:
+        tuple: (file bytes, value returned by write)
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'export.xlsx')
+        result = write(path)
+        with open(path, 'rb') as f:
+            return f.read(), result
 
 
 def download_excel_data(df):
     excel_data, _ = generate_excel_data(df)
     return excel_data
 
-    
+
+def build_excel_from_frame(df):
+    """
+    Build an .xlsx file from a DataFrame, without the hidden id column and
+    with emojis removed. Raises if the file can't be generated.
+
+    Returns:
+        tuple: (file bytes, row count)
+    """
+    # Remove 'id' column if it exists (typically hidden in display)
+    export_df = df.drop('id', axis=1) if 'id' in df.columns else df
+
+    # Remove emojis from all string columns (categoricals hold the matrix lookup names)
+    export_df = strip_emojis_frame(export_df)
+
+    return build_excel_file(lambda path: write_excel_file(
+        path,
+        list(export_df.columns),
+        export_df.itertuples(index=False, name=None),
+        widths=column_widths(export_df),
+        clean=False
+    ))
+
+
+def build_excel_from_rows(open_rows):
+    """
+    Build an .xlsx file from a row source such as a DB cursor. Raises if the
+    file can't be generated.
+
+    open_rows() must return a context manager yielding (columns, rows); the
+    source stays open only while the file is being written.
+
+    Returns:
+        tuple: (file bytes, row count)
+    """
+    def write(path):
+        with open_rows() as (columns, rows):
+            return write_excel_file(path, columns, rows)
+
+    return build_excel_file(write)
+
+
 def generate_excel_data(df):
     try:
-        # Create Excel file in memory
-        buffer = io.BytesIO()
-
-        # Prepare dataframe for export (remove hidden columns if they exist)
-        export_df = df.copy()
-
-        # Remove 'id' column if it exists (typically hidden in display)
-        if 'id' in export_df.columns:
-            export_df = export_df.drop('id', axis=1)
-
-        # Remove emojis from all string columns
-        for col in export_df.select_dtypes(include=['object', 'string']).columns:
-            export_df[col] = export_df[col].apply(lambda x: remove_emojis(x) if pd.notna(x) else x)
-
-        # Try to use xlsxwriter first, fallback to openpyxl
-        try:
-            # Create Excel writer with xlsxwriter engine
-            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                export_df.to_excel(writer, sheet_name='Datos', index=False)
-
-                # Get workbook and worksheet objects
-                workbook = writer.book
-                worksheet = writer.sheets['Datos']
-
-                # Add some formatting
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#D7E4BC',
-                    'border': 1
-                })
-
-                # Write headers with formatting
-                for col_num, value in enumerate(export_df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-
-                # Auto-adjust column widths
-                for i, col in enumerate(export_df.columns):
-                    column_len = max(export_df[col].astype(str).str.len().max(),
-                                     len(col)) + 2
-                    worksheet.set_column(i, i, min(column_len, 50))  # Max width 50
-
-        except ImportError:
-            # Fallback to openpyxl if xlsxwriter is not available
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                export_df.to_excel(writer, sheet_name='Datos', index=False)
-
-        buffer.seek(0)
-        row_count = len(df)
-        return buffer.getvalue(), row_count
-
+        return build_excel_from_frame(df)
     except Exception as e:
         st.error(f"❌ Error al generar el archivo Excel: {str(e)}")
         return None, 0
 
 
+def _lazy_download_button(build, row_count, filename, button_text_prefix):
+    """
+    Download button whose file is only generated when it is clicked.
+
+    build() runs on click, in a separate thread from the rerun it triggers, so
+    st.error would not reach the user there. Its exceptions are left to
+    propagate: Streamlit then reports the download as failed instead of
+    serving an empty file.
+    """
+    button_text = f"{button_text_prefix} ({row_count} fila{'s' if row_count != 1 else ''})"
+
+    st.download_button(
+        label=button_text,
+        data=lambda: build()[0],
+        file_name=filename,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        type="primary"
+    )
+
+
 def download_excel_button(df, filename="datos.xlsx", button_text_prefix="📥 Descargar"):
-    excel_data, row_count = generate_excel_data(df)
-
-    if excel_data:
-        button_text = f"{button_text_prefix} ({row_count} fila{'s' if row_count != 1 else ''})"
-
-        st.download_button(
-            label=button_text,
-            data=excel_data,
-            file_name=filename,
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            type="primary"
-        )
\ No newline at end of file
+    _lazy_download_button(lambda: build_excel_from_frame(df), len(df), filename, button_text_prefix)
+
+
+def download_rows_button(open_rows, row_count, filename="datos.xlsx", button_text_prefix="📥 Descargar"):
+    """
+    Download button streaming an .xlsx file straight from a row source (see
+    build_excel_from_rows), generated only when the user clicks it.
+    """
+    _lazy_download_button(lambda: build_excel_from_rows(open_rows), row_count, filename, button_text_prefix)
@@ -1,14 +1,16 @@
+import math
 import streamlit as st
 import pandas as pd
-from src.data.database_utils import fetch_matrix
+from src.data.dimension_cache import get_dimension
+from src.data.matrix_queries import MATRIX_PAGE_SIZE, fetch_matrix_page, load_matrix_frame
 
-def show_filters(df):
+def show_filters():
     # Create filter columns
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         # Gerencia filter
-        gerencias = sorted(df["Gerencia"].dropna().unique())
+        gerencias = sorted(get_dimension("gerencias").names)
         selected_gerencias = st.multiselect(
             "Gerencia",
             options=gerencias,
@@ -19,7 +21,7 @@ def show_filters(df):
         st.session_state.filters["Gerencia"] = selected_gerencias
 
         # Audiencia filter
-        audiencias = sorted(df["Audiencia"].dropna().unique())
+        audiencias = sorted(get_dimension("audiencias").names)
         selected_audiencias = st.multiselect(
             "Audiencia",
             options=audiencias,
@@ -42,7 +44,7 @@ def show_filters(df):
 
     with col2:
         # Subgerencia filter
-        subgerencias = sorted(df["Subgerencia"].dropna().unique())
+        subgerencias = sorted(get_dimension("subgerencias").names)
         selected_subgerencias = st.multiselect(
             "Subgerencia",
             options=subgerencias,
@@ -53,7 +55,7 @@ def show_filters(df):
         st.session_state.filters["Subgerencia"] = selected_subgerencias
 
         # Modalidad filter
-        modalidades = sorted(df["Modalidad"].dropna().unique())
+        modalidades = sorted(get_dimension("modalidades").names)
         selected_modalidades = st.multiselect(
             "Modalidad",
             options=modalidades,
@@ -76,7 +78,7 @@ def show_filters(df):
 
     with col3:
         # Área filter
-        areas = sorted(df["Área"].dropna().unique())
+        areas = sorted(get_dimension("areas").names)
         selected_areas = st.multiselect(
             "Área",
             options=areas,
@@ -87,7 +89,7 @@ def show_filters(df):
         st.session_state.filters["Área"] = selected_areas
 
         # Fuente filter
-        fuentes = sorted(df["Fuente"].dropna().unique())
+        fuentes = sorted(get_dimension("fuentes").names)
         selected_fuentes = st.multiselect(
             "Fuente",
             options=fuentes,
@@ -99,7 +101,7 @@ def show_filters(df):
 
     with col4:
         # Desafío Estratégico filter
-        desafios = sorted(df["Desafío Estratégico"].dropna().unique())
+        desafios = sorted(get_dimension("desafios").names)
         selected_desafios = st.multiselect(
             "Desafío Estratégico",
             options=desafios,
@@ -110,7 +112,7 @@ def show_filters(df):
         st.session_state.filters["Desafío Estratégico"] = selected_desafios
 
         # Prioridad filter
-        prioridades = sorted(df["Prioridad"].dropna().unique())
+        prioridades = sorted(get_dimension("prioridades").names)
         selected_prioridades = st.multiselect(
             "Prioridad",
             options=prioridades,
@@ -131,13 +133,49 @@ def show_filters(df):
 def reload_data():
     """
     Reload the matrix data from database and return as DataFrame
-    Returns: pandas.DataFrame - Fresh data from the database
+    Returns: pandas.DataFrame - Fresh data from the database, with categorical lookup columns
     """
-    data = fetch_matrix()
-    df = pd.DataFrame(data)
-    # Ensure the dataframe has a proper integer index starting from 0
-    df.reset_index(drop=True, inplace=True)
-    return df
+    return load_matrix_frame()
+
+
+def show_matrix_page(filters, filtered_count, page_size=MATRIX_PAGE_SIZE):
+    """
+    Page through the filtered matrix with Anterior/Siguiente buttons.
+
+    Keeps the keyset cursor of every visited page in session state and starts
+    over whenever the filters change. The page may come back empty if every
+    matching row was deleted since filtered_count was read.
+    Returns: pandas.DataFrame - Rows of the current page
+    """
+    filters_key = repr(sorted((label, list(values)) for label, values in filters.items() if values))
+    if st.session_state.get("matrix_page_filters") != filters_key:
+        st.session_state.matrix_page_filters = filters_key
+        st.session_state.matrix_page_cursors = [None]
+
+    cursors = st.session_state.matrix_page_cursors
+    rows, next_cursor = fetch_matrix_page(filters, after=cursors[-1], page_size=page_size)
+    # Rows deleted or edited since the cursor was stored can leave it past the
+    # end: step back to the last page that still has rows
+    while not rows and len(cursors) > 1:
+        cursors.pop()
+        rows, next_cursor = fetch_matrix_page(filters, after=cursors[-1], page_size=page_size)
+    page_df = pd.DataFrame(rows)
+
+    total_pages = max(1, math.ceil(filtered_count / page_size))
+    if total_pages > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Anterior", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col_page:
+            st.markdown(f"<div style='text-align: center'>Página {len(cursors)} de {total_pages}</div>", unsafe_allow_html=True)
+        with col_next:
+            if st.button("Siguiente ➡️", disabled=next_cursor is None, use_container_width=True):
+                cursors.append(next_cursor)
+                st.rerun()
+
+    return page_df
 
 
 def format_asociacion(row):
@@ -0,0 +1,10 @@
+import sys
+from src.data.migrations import run_migrations
+from src.services.linkedin_api import sync_catalog
+
+# Mirror the LinkedIn Learning catalog into database.db (delta refresh after the first run).
+# Usage: python sync_linkedin_catalog.py [--full]
+if __name__ == "__main__":
+    run_migrations()
+    for asset_type, language, count in sync_catalog(full="--full" in sys.argv):
+        print(f"{asset_type} ({language}): {count} assets stored")
@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+import pytest
+from src.data import connection
+from src.data.connection import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    # transaction() leases from the module pool
+    monkeypatch.setattr(connection, "_pool", pool)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (name TEXT)")
+    conn.commit()
+    conn.close()
+    yield pool
+    pool.close_all()
+
+
+def names(pool):
+    conn = pool.acquire()
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM items ORDER BY name")]
+    finally:
+        conn.close()
+
+
+def test_nested_leases_share_the_connection(pool):
+    outer = pool.acquire()
+    inner = pool.acquire()
+    assert inner is outer
+    assert outer._depth == 2
+    inner.close()
+    assert outer._depth == 1
+    outer.close()
+    assert outer._depth == 0
+
+
+def test_nested_commit_and_rollback_fail_loudly(pool):
+    outer = pool.acquire()
+    outer.execute("INSERT INTO items VALUES ('outer')")
+    inner = pool.acquire()
+    with pytest.raises(sqlite3.ProgrammingError):
+        inner.commit()
+    with pytest.raises(sqlite3.ProgrammingError):
+        inner.rollback()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with inner:
+            pass
+    inner.close()
+    outer.commit()
+    outer.close()
+    assert names(pool) == ["outer"]
+
+
+def test_nested_transaction_is_a_savepoint(pool):
+    outer = pool.acquire()
+    outer.execute("INSERT INTO items VALUES ('outer')")
+    with connection.transaction() as inner:
+        inner.execute("INSERT INTO items VALUES ('inner')")
+    with pytest.raises(ValueError):
+        with connection.transaction() as inner:
+            inner.execute("INSERT INTO items VALUES ('failed')")
+            raise ValueError
+    # Nothing was committed on the outer caller's behalf
+    assert outer.in_transaction
+    outer.rollback()
+    outer.close()
+    assert names(pool) == []
+
+    with connection.transaction() as outer:
+        outer.execute("INSERT INTO items VALUES ('outer')")
+        with connection.transaction() as inner:
+            inner.execute("INSERT INTO items VALUES ('inner')")
+    assert names(pool) == ["inner", "outer"]
+
+
+def test_release_rolls_back_and_returns_to_idle(pool):
+    conn = pool.acquire()
+    conn.execute("INSERT INTO items VALUES ('pending')")
+    assert conn.in_transaction
+    conn.close()
+    assert not conn.in_transaction
+    assert pool._idle == [conn]
+    assert names(pool) == []
+    # The next lease reuses the idle connection
+    assert pool.acquire() is conn
+
+
+def test_release_resets_row_factory(pool):
+    conn = pool.acquire()
+    conn.row_factory = None
+    conn.close()
+    conn = pool.acquire()
+    assert conn.row_factory is sqlite3.Row
+    conn.close()
+
+
+def test_close_returns_to_the_owning_pool(pool, tmp_path):
+    other = ConnectionPool(str(tmp_path / "other.db"))
+    conn = other.acquire()
+    conn.close()
+    assert other._idle == [conn]
+    assert conn not in pool._idle
+    other.close_all()
+
+
+def test_threads_lease_separate_connections(pool):
+    leased = []
+
+    def lease():
+        conn = pool.acquire()
+        leased.append(conn)
+        conn.close()
+
+    conn = pool.acquire()
+    thread = threading.Thread(target=lease)
+    thread.start()
+    thread.join()
+    assert leased[0] is not conn
+    conn.close()
+
+
+def pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_connections_get_the_pragma_profile(pool):
+    conn = pool.acquire()
+    try:
+        assert pragma(conn, "journal_mode") == "wal"
+        assert pragma(conn, "busy_timeout") == connection.PRAGMA_PROFILE["busy_timeout"]
+        assert pragma(conn, "synchronous") == 1        # NORMAL
+        assert pragma(conn, "foreign_keys") == 1
+    finally:
+        conn.close()
+
+
+def test_configure_pragmas_applies_to_fresh_connections(pool, monkeypatch):
+    monkeypatch.setattr(connection, "PRAGMA_PROFILE", dict(connection.PRAGMA_PROFILE))
+    old = pool.acquire()
+    old.close()
+
+    connection.configure_pragmas({"busy_timeout": 1234, "synchronous": "FULL"})
+    conn = pool.acquire()
+    try:
+        # The idle connection was retired along with its old settings
+        assert conn is not old
+        assert pragma(conn, "busy_timeout") == 1234
+        assert pragma(conn, "synchronous") == 2        # FULL
+    finally:
+        conn.close()
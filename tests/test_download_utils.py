@@ -0,0 +1,102 @@
+import datetime
+import re
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.download_utils import build_excel_from_frame, column_widths, strip_emojis
+
+BENCHMARK_ROWS = 100000
+BENCHMARK_BUDGET = 30      # seconds, generous so slow CI machines don't flake
+
+
+def old_remove_emojis(text):
+    """The per-cell cleaner the export used before it was vectorized, kept as the reference."""
+    if not isinstance(text, str):
+        return text
+    emoji_pattern = re.compile(
+        "["
+        "\U0001F600-\U0001F64F"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F1E0-\U0001F1FF"
+        "\U00002700-\U000027BF"
+        "\U0001f926-\U0001f937"
+        "\U00010000-\U0010ffff"
+        "\u2640-\u2642"
+        "\u2600-\u2B55"
+        "\u200d"
+        "\u23cf"
+        "\u23e9"
+        "\u231a"
+        "\ufe0f"
+        "\u3030"
+        "]+",
+        flags=re.UNICODE
+    )
+    return emoji_pattern.sub('', text).strip()
+
+
+def old_strip(values):
+    return values.apply(lambda x: old_remove_emojis(x) if pd.notna(x) else x)
+
+
+def old_width(values, name):
+    # astype(str) keeps missing cells missing (pandas 3), so they measure as empty
+    longest = values.astype(str).str.len().max()
+    return min(max(0 if pd.isna(longest) else longest, len(name)) + 2, 50)
+
+
+def cells(values):
+    """Plain Python values with every missing marker as None, to compare across dtypes."""
+    return [None if pd.isna(value) else value for value in values.astype(object)]
+
+
+TEXTS = ["✅ Validado", "  Curso 🚀 de Python  ", "sin emojis", "👍", "Gestión ⚠️ riesgos", "", "日本語 テキスト"]
+
+COLUMNS = {
+    "object": pd.Series(TEXTS + [None], dtype=object),
+    "mixed": pd.Series(TEXTS[:3] + [1, 2.5, np.nan, None, datetime.date(2024, 1, 2), True], dtype=object),
+    "category": pd.Series(TEXTS * 2 + [None], dtype="category"),
+    "string": pd.Series(TEXTS + [None], dtype="string"),
+    "arrow": pd.Series(TEXTS + [None], dtype="string[pyarrow]"),
+    "only missing": pd.Series([None, np.nan], dtype=object),
+    "numbers": pd.Series([1, 22, 333], dtype=object),
+}
+
+
+@pytest.mark.parametrize("name", list(COLUMNS))
+def test_strip_emojis_matches_per_cell_cleaning(name):
+    values = COLUMNS[name]
+    assert cells(strip_emojis(values)) == cells(old_strip(values))
+
+
+@pytest.mark.parametrize("name", list(COLUMNS))
+def test_column_widths_match_old_widths(name):
+    values = COLUMNS[name]
+    df = pd.DataFrame({name: values})
+    assert column_widths(df) == [old_width(values, name)]
+
+
+def test_column_widths_cap_long_values():
+    df = pd.DataFrame({"Actividad": ["x" * 200], "id": [1]})
+    assert column_widths(df) == [50, 4]
+
+
+def test_exports_100k_rows():
+    names = pd.Categorical([f"Gerencia ✅ {i % 30}" for i in range(BENCHMARK_ROWS)])
+    df = pd.DataFrame({
+        "id": range(BENCHMARK_ROWS),
+        "Gerencia": names,
+        "Actividad Formativa": [f"Actividad 🚀 {i}" for i in range(BENCHMARK_ROWS)],
+        "Objetivo Desempeño": pd.Series([f"Objetivo {i}" for i in range(BENCHMARK_ROWS)], dtype="string"),
+        "Validado": [i % 2 == 0 for i in range(BENCHMARK_ROWS)],
+    })
+
+    start = time.perf_counter()
+    data, row_count = build_excel_from_frame(df)
+    elapsed = time.perf_counter() - start
+
+    assert row_count == BENCHMARK_ROWS
+    assert data[:2] == b"PK"
+    assert elapsed < BENCHMARK_BUDGET, f"100k-row export took {elapsed:.1f} s"
@@ -0,0 +1,114 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from src.services import http_client
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, headers) of the server's script."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.calls += 1
+        step = self.server.script.pop(0) if self.server.script else (200, {})
+        if step == "hang":
+            time.sleep(1)
+            return
+        if step == "drop":
+            # The server read the request, then the connection dies
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        status, headers = step
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = respond
+    do_POST = respond
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.daemon_threads = True
+    server.calls = 0
+    server.script = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_get_retries_server_errors(server):
+    server.script = [(500, {}), (502, {})]
+    response = http_client.get(server.url)
+    assert response.status_code == 200
+    assert server.calls == 3
+
+
+def test_post_does_not_retry_server_errors(server):
+    server.script = [(500, {})]
+    response = http_client.post(server.url, json={"a": 1})
+    assert response.status_code == 500
+    assert server.calls == 1
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_post_retries_when_asked_with_retry_after(server, no_sleep, status):
+    server.script = [(status, {"Retry-After": "2"})]
+    response = http_client.post(server.url, json={"a": 1})
+    assert response.status_code == 200
+    assert server.calls == 2
+    assert no_sleep == [2.0]
+
+
+def test_post_does_not_retry_503_without_retry_after(server):
+    server.script = [(503, {})]
+    assert http_client.post(server.url).status_code == 503
+    assert server.calls == 1
+
+
+def test_post_does_not_retry_read_timeouts(server):
+    server.script = ["hang"]
+    with pytest.raises(requests.ReadTimeout):
+        http_client.post(server.url, timeout=(1, 0.2))
+    assert server.calls == 1
+
+
+def test_post_does_not_retry_dropped_connections(server):
+    server.script = ["drop"]
+    with pytest.raises(requests.ConnectionError):
+        http_client.post(server.url)
+    assert server.calls == 1
+
+
+def test_post_retries_refused_connections(no_sleep):
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    url = f"http://127.0.0.1:{sock.getsockname()[1]}/api"
+    sock.close()
+
+    with pytest.raises(requests.ConnectionError):
+        http_client.post(url, retries=2)
+    # Nothing reached a server, so every retry was taken
+    assert len(no_sleep) == 2
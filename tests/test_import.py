@@ -0,0 +1,92 @@
+import time
+import pandas as pd
+import pytest
+from src.data import connection
+from src.data.connection import ConnectionPool, transaction
+from src.data.database_utils import IMPORT_COLUMNS, build_import_chunk, import_matrix_rows
+from src.data.migrations import run_migrations
+
+BENCHMARK_ROWS = 50000
+BENCHMARK_BUDGET = 30      # seconds, generous so slow CI machines don't flake
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "database.db")
+    run_migrations(db_path, force=True)
+    pool = ConnectionPool(db_path)
+    monkeypatch.setattr(connection, "_pool", pool)
+    yield pool
+    pool.close_all()
+
+
+def generated_chunk(rows, first_row=2):
+    """Cleaned import chunk of generated rows, indexed from Excel row first_row."""
+    header = list(IMPORT_COLUMNS)
+    raw = pd.DataFrame(
+        [[f"{column} {i % 20}" for column in header] for i in range(rows)],
+        index=range(first_row, first_row + rows),
+        columns=header,
+        dtype=object,
+    )
+    raw["Actividad Formativa"] = [f"Actividad {i}" for i in range(rows)]
+    return build_import_chunk(header, raw)
+
+
+def count_rows(table):
+    conn = connection.get_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_imports_50k_rows_in_one_transaction(db):
+    chunk = generated_chunk(BENCHMARK_ROWS)
+
+    start = time.perf_counter()
+    with transaction() as conn:
+        imported_count, errors = import_matrix_rows(conn.cursor(), chunk)
+    elapsed = time.perf_counter() - start
+
+    assert (imported_count, errors) == (BENCHMARK_ROWS, [])
+    assert count_rows("final_matrix") == BENCHMARK_ROWS
+    # Lookup names are created once per dimension, not once per row
+    assert count_rows("gerencias") == 20
+    assert elapsed < BENCHMARK_BUDGET, f"50k-row import took {elapsed:.1f} s"
+
+
+def test_bad_row_falls_back_to_row_by_row(db):
+    with transaction() as conn:
+        conn.execute("""
+            CREATE TRIGGER reject_bad_activity BEFORE INSERT ON final_matrix
+            WHEN NEW.actividad_formativa = 'Actividad 3'
+            BEGIN SELECT RAISE(ABORT, 'fila rechazada'); END
+        """)
+
+    with transaction() as conn:
+        # Work done earlier in the same transaction survives the fallback
+        conn.execute("INSERT INTO origin (name) VALUES ('Previa')")
+        imported_count, errors = import_matrix_rows(conn.cursor(), generated_chunk(10))
+
+    assert imported_count == 9
+    assert errors == ["Fila 5: Error al importar - fila rechazada"]
+    assert count_rows("final_matrix") == 9
+    conn = connection.get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM origin WHERE name = 'Previa'").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_rows_missing_required_cells_are_reported(db):
+    chunk = generated_chunk(3)
+    chunk.loc[3, "Contenidos"] = None
+    chunk.loc[4, "Gerencia"] = None
+    chunk.loc[4, "Prioridad"] = None
+
+    with transaction() as conn:
+        imported_count, errors = import_matrix_rows(conn.cursor(), chunk)
+
+    assert imported_count == 1
+    assert errors == ["Fila 3: Contenidos está vacío", "Fila 4: Gerencia está vacía"]
@@ -0,0 +1,56 @@
+import threading
+import pytest
+from src.data import linkedin_cache
+from src.data.linkedin_cache import clear_search_cache, get_cached_search, make_query_key, store_search
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "linkedin_cache.db")
+    yield path
+    conn = linkedin_cache._connections.pop(path, None)
+    if conn is not None:
+        conn.close()
+
+
+def key(keywords):
+    return make_query_key(keywords, "COURSE", 100, True, "ALL", [("ALL", "Todos")])
+
+
+def test_keys_ignore_case_and_spacing():
+    assert key("  Excel   Avanzado ") == key("excel avanzado")
+    assert key("excel") != key("python")
+
+
+def test_stored_search_is_served_until_it_expires(path):
+    store_search(key("excel"), [{"Title": "Excel"}], 1, path=path)
+    assert get_cached_search(key("excel"), path=path) == ([{"Title": "Excel"}], 1)
+    assert get_cached_search(key("excel"), ttl=0, path=path) is None
+    assert get_cached_search(key("python"), path=path) is None
+
+
+def test_least_recently_used_searches_are_evicted(path):
+    store_search(key("a"), [], 0, path=path)
+    store_search(key("b"), [], 0, path=path)
+    # A hit makes "a" the most recently used one
+    assert get_cached_search(key("a"), path=path) is not None
+    store_search(key("c"), [], 0, max_entries=2, path=path)
+    assert get_cached_search(key("b"), path=path) is None
+    assert get_cached_search(key("a"), path=path) is not None
+
+
+def test_clear_search_cache(path):
+    store_search(key("excel"), [], 0, path=path)
+    clear_search_cache(path=path)
+    assert get_cached_search(key("excel"), path=path) is None
+
+
+def test_lookups_share_one_connection(path):
+    store_search(key("excel"), [], 0, path=path)
+    conn = linkedin_cache._connections[path]
+
+    thread = threading.Thread(target=get_cached_search, args=(key("excel"),), kwargs={"path": path})
+    thread.start()
+    thread.join()
+    get_cached_search(key("excel"), path=path)
+    assert linkedin_cache._connections[path] is conn
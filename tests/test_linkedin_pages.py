@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+import requests
+from src.services import linkedin_api
+
+TOTAL = 1234
+PAGE_SIZE = 100
+LATENCY = 0.1      # seconds per response
+
+
+class FakeLearningAssets(BaseHTTPRequestHandler):
+    """learningAssets stand-in: TOTAL numbered courses, optional failing page."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        start, count = int(query["start"]), int(query["count"])
+        self.server.starts.append(start)
+        time.sleep(LATENCY)
+
+        total = self.server.total
+        if start == self.server.failing_start:
+            status, body = 400, {"message": "bad page"}
+        else:
+            elements = [
+                {"urn": f"urn:li:lyndaCourse:{i}", "title": {"value": f"Curso {i}"}, "details": {}}
+                for i in range(start, min(start + count, total))
+            ]
+            status, body = 200, {"paging": {"total": total}, "elements": elements}
+
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLearningAssets)
+    server.starts, server.total, server.failing_start = [], TOTAL, None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(linkedin_api, "LEARNING_ASSETS_URL", f"http://127.0.0.1:{server.server_port}/learningAssets")
+    monkeypatch.setattr(linkedin_api, "get_access_token", lambda: "token")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(params=None):
+    return linkedin_api.fetch_all_pages({"q": "criteria", "count": PAGE_SIZE, **(params or {})}, PAGE_SIZE)
+
+
+def test_pages_come_back_in_order_and_first_page_is_reused(server):
+    pages, total = fetch()
+
+    assert total == TOTAL
+    urns = [element["urn"] for page in pages for element in page["elements"]]
+    assert urns == [f"urn:li:lyndaCourse:{i}" for i in range(TOTAL)]
+    # 13 pages, the first one requested only once
+    assert sorted(server.starts) == list(range(0, TOTAL, PAGE_SIZE))
+
+
+def test_no_results_stops_after_first_page(server):
+    server.total = 0
+    assert fetch() == ([], 0)
+    assert server.starts == [0]
+
+
+def test_concurrent_pages_beat_sequential_latency(server):
+    started = time.perf_counter()
+    fetch()
+    elapsed = time.perf_counter() - started
+
+    sequential = len(range(0, TOTAL, PAGE_SIZE)) * LATENCY
+    # First page, then 12 pages over PAGE_WORKERS threads: about 3 round trips
+    assert elapsed < sequential / 2, f"{elapsed:.2f}s vs {sequential:.2f}s sequential"
+
+
+def test_failing_page_raises_and_cancels_queued_pages(server, monkeypatch):
+    monkeypatch.setattr(linkedin_api, "PAGE_WORKERS", 2)
+    server.failing_start = PAGE_SIZE
+
+    with pytest.raises(requests.HTTPError):
+        fetch()
+    # map() cancels the pages still queued when the error surfaces
+    assert len(server.starts) < len(range(0, TOTAL, PAGE_SIZE))
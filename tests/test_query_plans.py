@@ -0,0 +1,92 @@
+import sqlite3
+import pytest
+from src.data.migrations import run_migrations
+from src.data.matrix_queries import MATRIX_FILTER_COLUMNS, build_matrix_filter, build_matrix_page_query
+
+# EXPLAIN QUERY PLAN guards: the hot matrix and lookup queries must search an
+# index, so a schema or query change that regresses them to full scans fails here.
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("plans") / "database.db")
+    run_migrations(db_path, force=True)
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def query_plan(conn, sql, params=()):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def assert_searches(plan, table):
+    """The plan reads `table` through an index lookup and never scans it."""
+    assert any(step.startswith(f"SEARCH {table} USING") for step in plan), plan
+    assert not any(step.startswith(f"SCAN {table}") for step in plan), plan
+
+
+@pytest.mark.parametrize("label", list(MATRIX_FILTER_COLUMNS))
+def test_matrix_filter_uses_index(conn, label):
+    where_sql, params = build_matrix_filter({label: ["x"]})
+    plan = query_plan(conn, f"SELECT COUNT(*) FROM matrix_wide fm WHERE {where_sql}", params)
+    assert_searches(plan, "fm")
+
+
+@pytest.mark.parametrize("label", list(MATRIX_FILTER_COLUMNS))
+def test_matrix_filter_page_uses_index(conn, label):
+    sql, params = build_matrix_page_query({label: ["x"]})
+    assert_searches(query_plan(conn, sql, params), "fm")
+
+
+def test_keyset_page_seeks_sort_index(conn):
+    sql, params = build_matrix_page_query(after=("Gerencia", 100))
+    plan = query_plan(conn, sql, params)
+    assert_searches(plan, "fm")
+    assert any("idx_matrix_wide_gerencia_sort" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_first_page_reads_in_index_order(conn):
+    sql, params = build_matrix_page_query()
+    plan = query_plan(conn, sql, params)
+    assert any("idx_matrix_wide_gerencia_sort" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("table", [table for _, table in MATRIX_FILTER_COLUMNS.values()])
+def test_lookup_by_name_uses_index(conn, table):
+    # get_or_create_id() and resolve_lookup_ids()
+    assert_searches(query_plan(conn, f"SELECT id FROM {table} WHERE name = ?", ("x",)), table)
+    assert_searches(query_plan(conn, f"SELECT name, id FROM {table} WHERE name IN (?, ?)", ("x", "y")), table)
+
+
+@pytest.mark.parametrize("column", [column for column, _ in MATRIX_FILTER_COLUMNS.values() if column != "origin_id"])
+def test_final_matrix_foreign_keys_are_indexed(conn, column):
+    # Deleting a lookup value checks final_matrix for references
+    assert_searches(query_plan(conn, f"SELECT 1 FROM final_matrix WHERE {column} = ?", (1,)), "final_matrix")
+
+
+def test_course_links_use_index(conn):
+    plan = query_plan(conn, "SELECT matrix_id FROM matrix_linkedin_courses WHERE course_id = ?", (1,))
+    assert_searches(plan, "matrix_linkedin_courses")
+
+
+def test_submission_answers_read_in_created_order(conn):
+    plan = query_plan(conn, "SELECT * FROM raw_data_forms WHERE submission_id = ? ORDER BY created_at", (1,))
+    assert_searches(plan, "raw_data_forms")
+    assert any("idx_raw_data_forms_submission_created" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_raw_data_forms_by_origin_uses_index(conn):
+    plan = query_plan(conn, "SELECT * FROM raw_data_forms WHERE origin_id = ?", (1,))
+    assert_searches(plan, "raw_data_forms")
+    assert any("idx_raw_data_forms_origin_created" in step for step in plan), plan
+
+
+def test_final_matrix_by_origin_uses_index(conn):
+    # Also the foreign key check when an origin is deleted
+    plan = query_plan(conn, "SELECT * FROM final_matrix WHERE origin_id = ?", (1,))
+    assert_searches(plan, "final_matrix")
+    assert any("idx_final_matrix_origin_gerencia" in step for step in plan), plan
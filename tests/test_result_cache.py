@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from src.data import connection
+from src.data.connection import ConnectionPool
+from src.data.result_cache import cached_read, clear_result_cache
+
+
+@pytest.fixture(autouse=True)
+def pool(tmp_path, monkeypatch):
+    pool = ConnectionPool(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(connection, "_pool", pool)
+    clear_result_cache()
+    yield pool
+    clear_result_cache()
+    pool.close_all()
+
+
+def test_callers_cannot_modify_cached_rows():
+    calls = []
+
+    @cached_read
+    def read_rows():
+        calls.append(1)
+        return [{"Gerencia": "Finanzas", "Actividades": 3}]
+
+    rows = read_rows()
+    rows[0]["Gerencia"] = "Cambiada"
+    rows.append({"Gerencia": "Extra"})
+
+    assert read_rows() == [{"Gerencia": "Finanzas", "Actividades": 3}]
+    assert len(calls) == 1
+
+
+def test_callers_cannot_modify_cached_frames():
+    @cached_read
+    def read_frame():
+        return {"df": pd.DataFrame({"n": [1, 2]}), "total": 2}
+
+    result = read_frame()
+    result["df"].loc[0, "n"] = 99
+    result["total"] = 0
+
+    again = read_frame()
+    assert again["df"]["n"].tolist() == [1, 2]
+    assert again["total"] == 2
+
+
+def test_clear_result_cache_forces_a_new_read():
+    calls = []
+
+    @cached_read
+    def read_count():
+        calls.append(1)
+        return len(calls)
+
+    assert read_count() == 1
+    assert read_count() == 1
+    clear_result_cache()
+    assert read_count() == 2